@@ -1,8 +1,16 @@
 import metadrive.register
-from metadrive.envs import MetaDriveEnv, TopDownMetaDrive, TopDownSingleFrameMetaDriveEnv, TopDownMetaDriveEnvV2, \
-    SafeMetaDriveEnv, MultiAgentRoundaboutEnv, MultiAgentIntersectionEnv, MultiAgentParkingLotEnv, \
-    MultiAgentTollgateEnv, MultiAgentBottleneckEnv, MultiAgentMetaDrive
+from metadrive.envs import MetaDriveEnv, SafeMetaDriveEnv, MultiAgentRoundaboutEnv, MultiAgentIntersectionEnv, \
+    MultiAgentParkingLotEnv, MultiAgentTollgateEnv, MultiAgentBottleneckEnv, MultiAgentMetaDrive
 from metadrive.utils.registry import get_metadrive_class
 import os
 
 MetaDrive_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def __getattr__(name):
+    # top-down envs are loaded lazily, see metadrive/envs/__init__.py
+    from metadrive.envs import _LAZY_ENVS
+    if name in _LAZY_ENVS:
+        import metadrive.envs
+        return getattr(metadrive.envs, name)
+    raise AttributeError("module {} has no attribute {}".format(__name__, name))
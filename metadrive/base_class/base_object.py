@@ -4,12 +4,11 @@ import math
 from typing import Dict
 
 import numpy as np
-import seaborn as sns
 from panda3d.bullet import BulletWorld, BulletBodyNode
 from panda3d.core import LVector3, NodePath, PandaNode
 
 from metadrive.base_class.base_runnable import BaseRunnable
-from metadrive.constants import ObjectState
+from metadrive.constants import ObjectState, COLORBLIND_PALETTE
 from metadrive.engine.asset_loader import AssetLoader
 from metadrive.engine.core.physics_world import PhysicsWorld
 from metadrive.engine.physics_node import BaseRigidBodyNode, BaseGhostBodyNode
@@ -114,6 +113,9 @@ class BaseObject(BaseRunnable):
     MASS = None  # if object has a body, the mass will be set automatically
     COLLISION_MASK = None
 
+    # colors for visualization, shared by all objects
+    _color_palette = None
+
     def __init__(self, name=None, random_seed=None, config=None, escape_random_seed_assertion=False):
         """
         Config is a static conception, which specified the parameters of one element.
@@ -136,8 +138,8 @@ class BaseObject(BaseRunnable):
         # Nodes in this tuple didn't interact with other nodes! they only used to do rayTest or sweepTest
         self.static_nodes = PhysicsNodeList()
 
-        # render or not
-        self.render = False if AssetLoader.loader is None else True
+        # render or not. Nothing will be loaded for visualization in physics only mode
+        self.render = False if AssetLoader.loader is None or self._physics_only else True
         if self.render:
             self.loader = AssetLoader.get_loader()
 
@@ -145,12 +147,8 @@ class BaseObject(BaseRunnable):
                 # It is closed before!
                 self.loader.__init__()
 
-        # add color setting for visualization
-        color = sns.color_palette("colorblind")
-        color.remove(color[2])  # Remove the green and leave it for special vehicle
-        idx = get_np_random().randint(len(color))
-        rand_c = color[idx]
-        self._panda_color = rand_c
+        # color for visualization, it is sampled when being accessed for the first time
+        self._panda_color = None
 
         # store all NodePath reparented to this node
         self._node_path_list = []
@@ -168,8 +166,19 @@ class BaseObject(BaseRunnable):
 
     @property
     def panda_color(self):
+        if self._panda_color is None:
+            if BaseObject._color_palette is None:
+                color = list(COLORBLIND_PALETTE)
+                color.remove(color[2])  # Remove the green and leave it for special vehicle
+                BaseObject._color_palette = color
+            idx = get_np_random().randint(len(BaseObject._color_palette))
+            self._panda_color = BaseObject._color_palette[idx]
         return self._panda_color
 
+    @property
+    def _physics_only(self):
+        return self.engine is not None and self.engine.physics_only
+
     def add_body(self, physics_body, add_to_static_world=False):
         if self._body is None:
             # add it to physics world, in which this object will interact with other object (like collision)
@@ -2,11 +2,11 @@ import logging
 import math
 from typing import List, Dict
 
-from panda3d.bullet import BulletBoxShape, BulletGhostNode
+from panda3d.bullet import BulletBoxShape, BulletGhostNode, BulletRigidBodyNode
 from panda3d.core import Vec3, LQuaternionf, Vec4, TextureStage, RigidBodyCombiner, \
-    SamplerState, NodePath, Texture, Material
+    SamplerState, NodePath, Texture, Material, PandaNode
 
-from metadrive.base_class.base_object import BaseObject
+from metadrive.base_class.base_object import BaseObject, clear_node_list
 from metadrive.component.lane.abs_lane import AbstractLane
 from metadrive.component.lane.point_lane import PointLane
 from metadrive.component.road_network.node_road_network import NodeRoadNetwork
@@ -14,11 +14,18 @@ from metadrive.component.road_network.road import Road
 from metadrive.constants import MetaDriveType, CamMask, PGLineType, PGLineColor, DrivableAreaProperty
 from metadrive.engine.asset_loader import AssetLoader
 from metadrive.engine.core.physics_world import PhysicsWorld
+from metadrive.engine.physics_node import BaseRigidBodyNode, BaseGhostBodyNode
 from metadrive.utils.coordinates_shift import panda_vector, panda_heading
 from metadrive.utils.math import norm
 
 logger = logging.getLogger(__name__)
 
+# classes of bullet nodes that can be baked by BaseBlock.bake_in_world()
+_BAKED_BODY_CLASSES = {
+    cls.__name__: cls
+    for cls in [BaseRigidBodyNode, BaseGhostBodyNode, BulletRigidBodyNode, BulletGhostNode]
+}
+
 
 class BaseBlock(BaseObject, DrivableAreaProperty):
     """
@@ -27,6 +34,8 @@ class BaseBlock(BaseObject, DrivableAreaProperty):
     Call Block.construct_block() to add it to world
     """
     ID = "B"
+    # a tag marking bullet nodes in the bam stream of a baked block
+    BAKED_BODY_TAG = "baked_body_index"
 
     def __init__(
         self, block_index: int, global_network: NodeRoadNetwork, random_seed, ignore_intersection_checking=False
@@ -50,6 +59,9 @@ class BaseBlock(BaseObject, DrivableAreaProperty):
         self._respawn_roads = []
         self._block_objects = None
 
+        # bodies holding the merged collision shapes, see get_merged_body()
+        self._merged_bodies = {}
+
         if self.render and not self.use_render_pipeline:
             self.ts_color = TextureStage("color")
             self.ts_normal = TextureStage("normal")
@@ -110,10 +122,12 @@ class BaseBlock(BaseObject, DrivableAreaProperty):
         physics_world: PhysicsWorld,
         extra_config: Dict = None,
         no_same_node=True,
-        attach_to_world=True
+        attach_to_world=True,
+        create_in_world=True
     ) -> bool:
         """
-        Randomly Construct a block, if overlap return False
+        Randomly Construct a block, if overlap return False. If create_in_world is False, only the topology is built.
+        NodePaths and bullet bodies can be created later by calling _create_in_world()
         """
         self.sample_parameters()
 
@@ -133,11 +147,14 @@ class BaseBlock(BaseObject, DrivableAreaProperty):
         success = self._sample_topology()
         self._global_network.add(self.block_network, no_same_node)
 
-        self._create_in_world()
-        self.attach_to_world(root_render_np, physics_world)
-
-        if not attach_to_world:
-            self.detach_from_world(physics_world)
+        if create_in_world:
+            self._create_in_world()
+        else:
+            # the bounding box is required to decide when to create the block
+            self._update_bounding_box()
+        # attaching and detaching bodies immediately is expensive, as bullet removes bodies by linear search
+        if attach_to_world:
+            self.attach_to_world(root_render_np, physics_world)
 
         return success
 
@@ -154,8 +171,130 @@ class BaseBlock(BaseObject, DrivableAreaProperty):
             obj.destroy()
         self._block_objects = None
 
-    def construct_from_config(self, config: Dict, root_render_np: NodePath, physics_world: PhysicsWorld):
-        success = self.construct_block(root_render_np, physics_world, config)
+    def clear_in_world(self, physics_world: PhysicsWorld):
+        """
+        Destroy NodePaths and bullet bodies created by _create_in_world() but keep the topology, so that they can be
+        created again. It is used to release the memory of map parts far from agents
+        """
+        self.detach_from_world(physics_world)
+        for lane in self.block_network.get_all_lanes():
+            clear_node_list(lane._node_path_list)
+            lane._node_path_list.clear()
+        clear_node_list(self._node_path_list)
+        self._node_path_list.clear()
+        self.dynamic_nodes.clear()
+        self.static_nodes.clear()
+        self._merged_bodies = {}
+        self.origin.removeNode()
+        self.origin = NodePath(self.name)
+
+    def bake_in_world(self):
+        """
+        Serialize NodePaths and bullet bodies created by _create_in_world(), so that they can be restored by
+        restore_in_world() instead of being built again. Bullet nodes are written to a bam stream with the visual
+        nodes, while their python wrappers, like BaseRigidBodyNode, are recorded separately and created when restoring
+
+        :return: a picklable dict, or None if the block can not be baked, e.g. it has block objects like buildings
+        """
+        if self._block_objects or not isinstance(self.origin, NodePath):
+            return None
+        nodes = [(node, False) for node in self.static_nodes] + [(node, True) for node in self.dynamic_nodes]
+        if any(type(node).__name__ not in _BAKED_BODY_CLASSES for node, _ in nodes) or \
+                len(self.origin.findAllMatches("**/+BulletBodyNode")) != len(nodes):
+            # bodies not managed by this block can not be restored
+            return None
+        bodies = []
+        for index, (node, dynamic) in enumerate(nodes):
+            # node lists may hold the bullet node instead of its python wrapper, which is stored as the python tag
+            wrapper = node.getPythonTag(node.getName())
+            if not isinstance(wrapper, (BaseRigidBodyNode, BaseGhostBodyNode)):
+                wrapper = node
+            bodies.append(
+                dict(
+                    node_class=type(wrapper).__name__,
+                    dynamic=dynamic,
+                    base_object_name=getattr(wrapper, "base_object_name", None),
+                    type_name=getattr(wrapper, "type_name", None),
+                    sub_object_names=getattr(wrapper, "sub_object_names", None)
+                )
+            )
+            node.setTag(self.BAKED_BODY_TAG, str(index))
+        try:
+            bam = bytes(self.origin.node().encodeToBamStream())
+        finally:
+            for node, _ in nodes:
+                node.clearTag(self.BAKED_BODY_TAG)
+        return dict(bam=bam, bodies=bodies, lane_indices=[lane.index for lane in self.block_network.get_all_lanes()])
+
+    def restore_in_world(self, baked):
+        """
+        Restore NodePaths and bullet bodies baked by bake_in_world(). It replaces _create_in_world(), so the block
+        should be constructed by construct_block(create_in_world=False) at first
+        """
+        # lane indices are set when lanes are built
+        for lane, index in zip(self.block_network.get_all_lanes(), baked["lane_indices"]):
+            lane.index = index
+        origin = NodePath(PandaNode.decodeFromBamStream(baked["bam"]))
+        baked_nodes = {
+            int(node_path.getTag(self.BAKED_BODY_TAG)): node_path
+            for node_path in origin.findAllMatches("**/=" + self.BAKED_BODY_TAG)
+        }
+        for index, body in enumerate(baked["bodies"]):
+            old_np = baked_nodes[index]
+            old_node = old_np.node()
+            node_class = _BAKED_BODY_CLASSES[body["node_class"]]
+            if node_class is BaseRigidBodyNode or node_class is BaseGhostBodyNode:
+                node = node_class(body["base_object_name"], body["type_name"])
+            else:
+                node = node_class(old_node.getName())
+            # transform, render state, tags and the draw mask. Python tags are replaced, so the wrapper is set again
+            node.copyAllProperties(old_node)
+            node.clearTag(self.BAKED_BODY_TAG)
+            if node_class is BaseRigidBodyNode or node_class is BaseGhostBodyNode:
+                node.setPythonTag(node.getName(), node)
+            if body["sub_object_names"] is not None:
+                node.sub_object_names = list(body["sub_object_names"])
+            for shape_index in range(old_node.getNumShapes()):
+                node.addShape(old_node.getShape(shape_index), old_node.getShapeTransform(shape_index))
+            node.setIntoCollideMask(old_node.getIntoCollideMask())
+            node.setStatic(old_node.isStatic())
+            node.setKinematic(old_node.isKinematic())
+            node.setFriction(old_node.getFriction())
+            node.setRestitution(old_node.getRestitution())
+            if isinstance(node, BulletRigidBodyNode) and old_node.getMass() > 0:
+                node.setMass(old_node.getMass())
+            node.setActive(old_node.isActive(), True)
+
+            new_np = old_np.getParent().attachNewNode(node)
+            old_np.getChildren().reparentTo(new_np)
+            old_np.removeNode()
+            (self.dynamic_nodes if body["dynamic"] else self.static_nodes).append(node)
+            self._node_path_list.append(new_np)
+            self._node_path_list.append(node)
+
+        self.origin = origin
+        self.sidewalk_node_path = origin.find(self.name + "_sidewalk")
+        self.lane_line_node_path = origin.find(self.name + "_lane_line")
+        self.lane_node_path = origin.find(self.name + "_lane")
+        self.lane_vis_node_path = origin.find(self.name + "_lane_vis")
+        self._merged_bodies = {}
+        self._update_bounding_box()
+        self._node_path_list.append(self.sidewalk_node_path)
+        self._node_path_list.append(self.lane_line_node_path)
+        self._node_path_list.append(self.lane_node_path)
+        self._node_path_list.append(self.lane_vis_node_path)
+
+    def construct_from_config(
+        self,
+        config: Dict,
+        root_render_np: NodePath,
+        physics_world: PhysicsWorld,
+        attach_to_world=True,
+        create_in_world=True
+    ):
+        success = self.construct_block(
+            root_render_np, physics_world, config, attach_to_world=attach_to_world, create_in_world=create_in_world
+        )
         return success
 
     def get_respawn_roads(self):
@@ -187,6 +326,14 @@ class BaseBlock(BaseObject, DrivableAreaProperty):
         self.ROAD_IDX = 0
         self._respawn_roads.clear()
 
+    def _update_bounding_box(self):
+        try:
+            self._bounding_box = self.block_network.get_bounding_box()
+        except:
+            if len(self.block_network.graph) > 0:
+                logging.warning("Can not find bounding box for it")
+            self._bounding_box = None, None, None, None
+
     """------------------------------------- For Render and Physics Calculation ---------------------------------- """
 
     def _create_in_world(self, skip=False):
@@ -200,6 +347,7 @@ class BaseBlock(BaseObject, DrivableAreaProperty):
         self.sidewalk_node_path = NodePath(RigidBodyCombiner(self.name + "_sidewalk"))
         self.lane_node_path = NodePath(RigidBodyCombiner(self.name + "_lane"))
         self.lane_vis_node_path = NodePath(RigidBodyCombiner(self.name + "_lane_vis"))
+        self._merged_bodies = {}
 
         if skip:  # for debug
             pass
@@ -227,12 +375,7 @@ class BaseBlock(BaseObject, DrivableAreaProperty):
         self.lane_line_node_path.reparentTo(self.origin)
         self.lane_node_path.reparentTo(self.origin)
         self.lane_vis_node_path.reparentTo(self.origin)
-        try:
-            self._bounding_box = self.block_network.get_bounding_box()
-        except:
-            if len(self.block_network.graph) > 0:
-                logging.warning("Can not find bounding box for it")
-            self._bounding_box = None, None, None, None
+        self._update_bounding_box()
 
         self._node_path_list.append(self.sidewalk_node_path)
         self._node_path_list.append(self.lane_line_node_path)
@@ -321,6 +464,47 @@ class BaseBlock(BaseObject, DrivableAreaProperty):
         """
         raise NotImplementedError
 
+    @property
+    def merge_collision(self):
+        """
+        If True, collision shapes of lanes, lane lines and sidewalks are merged into one body per type in this block
+        """
+        return self.engine is not None and self.engine.global_config.get("merge_block_collision", False)
+
+    def get_merged_body(self, node_class, node_type, parent_node_path, collide_mask=None, dynamic=False):
+        """
+        Get the body holding all collision shapes of one type in this block. It is created when it is requested for
+        the first time. Use body.addShape(shape, transform) to merge a shape. For BaseRigidBodyNode, use
+        body.add_sub_shape(shape, transform, object_name) instead, so that the object can be found by ray test
+
+        :param node_class: BaseRigidBodyNode, BulletRigidBodyNode or BulletGhostNode
+        :param node_type: MetaDriveType, which is also the node name
+        :param parent_node_path: the body will be reparented to this NodePath
+        :param collide_mask: into collide mask
+        :param dynamic: whether to add the body to dynamic_nodes
+        :return: body node
+        """
+        key = (node_class, node_type, collide_mask, dynamic)
+        if key not in self._merged_bodies:
+            if node_class is BaseRigidBodyNode:
+                body_node = BaseRigidBodyNode(self.name, node_type)
+            else:
+                body_node = node_class(node_type)
+            body_node.set_active(False)
+            body_node.setKinematic(False)
+            body_node.setStatic(True)
+            if collide_mask is not None:
+                body_node.setIntoCollideMask(collide_mask)
+            body_np = parent_node_path.attachNewNode(body_node)
+            self._node_path_list.append(body_np)
+            self._node_path_list.append(body_node)
+            if dynamic:
+                self.dynamic_nodes.append(body_node)
+            else:
+                self.static_nodes.append(body_node)
+            self._merged_bodies[key] = body_node
+        return self._merged_bodies[key]
+
     def destroy(self):
         if self.block_network is not None:
             self.block_network.destroy()
@@ -7,7 +7,7 @@ from panda3d.bullet import BulletBoxShape
 from panda3d.bullet import BulletConvexHullShape
 from panda3d.bullet import BulletGhostNode
 from panda3d.core import LPoint3f
-from panda3d.core import Vec3, LQuaternionf, CardMaker, NodePath
+from panda3d.core import Vec3, LQuaternionf, CardMaker, NodePath, TransformState
 from panda3d.core import Vec4
 
 from metadrive.constants import DrivableAreaProperty
@@ -220,24 +220,29 @@ class AbstractLane:
         if lane_index is not None:
             lane.index = lane_index
 
-        n = BaseRigidBodyNode(lane.index, MetaDriveType.LANE_SURFACE_STREET)
-        segment_np = NodePath(n)
-
-        self._node_path_list.append(segment_np)
-        self._node_path_list.append(n)
-
-        segment_node = segment_np.node()
-        segment_node.set_active(False)
-        segment_node.setKinematic(False)
-        segment_node.setStatic(True)
         shape = BulletBoxShape(Vec3(length / 2, 0.1, width / 2))
-        segment_node.addShape(shape)
-        block.static_nodes.append(segment_node)
-        segment_np.setPos(panda_vector(position, -0.1))
-
-        segment_np.setH(theta / np.pi * 180)
-        segment_np.setP(-90)
-        segment_np.reparentTo(block.lane_node_path)
+        if block.merge_collision:
+            body = block.get_merged_body(BaseRigidBodyNode, MetaDriveType.LANE_SURFACE_STREET, block.lane_node_path)
+            transform = TransformState.makePosHpr(panda_vector(position, -0.1), Vec3(theta / np.pi * 180, -90, 0))
+            body.add_sub_shape(shape, transform, lane.index)
+        else:
+            n = BaseRigidBodyNode(lane.index, MetaDriveType.LANE_SURFACE_STREET)
+            segment_np = NodePath(n)
+
+            self._node_path_list.append(segment_np)
+            self._node_path_list.append(n)
+
+            segment_node = segment_np.node()
+            segment_node.set_active(False)
+            segment_node.setKinematic(False)
+            segment_node.setStatic(True)
+            segment_node.addShape(shape)
+            block.static_nodes.append(segment_node)
+            segment_np.setPos(panda_vector(position, -0.1))
+
+            segment_np.setH(theta / np.pi * 180)
+            segment_np.setP(-90)
+            segment_np.reparentTo(block.lane_node_path)
         if block.render and not block.use_render_pipeline:
             cm = CardMaker('card')
             cm.setFrame(-length / 2, length / 2, -width / 2, width / 2)
@@ -276,29 +281,35 @@ class AbstractLane:
             # node_name = MetaDriveType.LINE_SOLID_SINGLE_WHITE if line_color == PGLineColor.GREY else MetaDriveType.LINE_SOLID_SINGLE_YELLOW
             node_name = MetaDriveType.LINE_BROKEN_SINGLE_WHITE if line_color == PGLineColor.GREY else MetaDriveType.LINE_BROKEN_SINGLE_YELLOW
 
-        # add bullet body for it
-        body_node = BulletGhostNode(node_name)
-        body_node.set_active(False)
-        body_node.setKinematic(False)
-        body_node.setStatic(True)
-        body_np = parent_np.attachNewNode(body_node)
-        node_path_list.append(body_np)
-        node_path_list.append(body_node)
-
         # its scale will change by setScale
         body_height = DrivableAreaProperty.LANE_LINE_GHOST_HEIGHT
         shape = BulletBoxShape(Vec3(length / 2, DrivableAreaProperty.LANE_LINE_WIDTH / 4, body_height))
-        body_np.node().addShape(shape)
         mask = DrivableAreaProperty.CONTINUOUS_COLLISION_MASK if line_type != PGLineType.BROKEN else DrivableAreaProperty.BROKEN_COLLISION_MASK
-        body_np.node().setIntoCollideMask(mask)
-        block.static_nodes.append(body_np.node())
 
         # position and heading
-        body_np.setPos(panda_vector(middle, DrivableAreaProperty.LANE_LINE_GHOST_HEIGHT / 2))
+        pos = panda_vector(middle, DrivableAreaProperty.LANE_LINE_GHOST_HEIGHT / 2)
         direction_v = end_point - start_point
         # theta = -numpy.arctan2(direction_v[1], direction_v[0])
         theta = panda_heading(math.atan2(direction_v[1], direction_v[0]))
-        body_np.setQuat(LQuaternionf(math.cos(theta / 2), 0, 0, math.sin(theta / 2)))
+        quat = LQuaternionf(math.cos(theta / 2), 0, 0, math.sin(theta / 2))
+
+        # add bullet body for it
+        if block.merge_collision:
+            body_node = block.get_merged_body(BulletGhostNode, node_name, parent_np, mask)
+            body_node.addShape(shape, TransformState.makePosQuatScale(pos, quat, Vec3(1, 1, 1)))
+        else:
+            body_node = BulletGhostNode(node_name)
+            body_node.set_active(False)
+            body_node.setKinematic(False)
+            body_node.setStatic(True)
+            body_np = parent_np.attachNewNode(body_node)
+            node_path_list.append(body_np)
+            node_path_list.append(body_node)
+            body_node.addShape(shape)
+            body_node.setIntoCollideMask(mask)
+            block.static_nodes.append(body_node)
+            body_np.setPos(pos)
+            body_np.setQuat(quat)
 
         if block.render and not block.use_render_pipeline:
             # For visualization
@@ -325,29 +336,46 @@ class AbstractLane:
         width = width or block.SIDEWALK_WIDTH
         middle = (lane_start + lane_end) / 2
         length = norm(lane_end[0] - lane_start[0], lane_end[1] - lane_start[1])
-        body_node = BulletRigidBodyNode(MetaDriveType.BOUNDARY_LINE)
-        body_node.setKinematic(False)
-        body_node.setStatic(True)
-        side_np = block.sidewalk_node_path.attachNewNode(body_node)
-        node_path_list.append(side_np)
+        if extra_thrust != 0:
+            vertical_v = Vector((direction_v[1], -direction_v[0])) / norm(*direction_v)
+            middle += vertical_v * extra_thrust
+        theta = math.atan2(direction_v[1], direction_v[0])
+        quat = LQuaternionf(math.cos(theta / 2), 0, 0, math.sin(theta / 2))
+        scale = Vec3(length * length_multiply, width, block.SIDEWALK_THICKNESS * (1 + 0.1 * np.random.rand()))
 
-        shape = BulletBoxShape(Vec3(1 / 2, 1 / 2, 1 / 2))
-        body_node.addShape(shape)
-        body_node.setIntoCollideMask(block.SIDEWALK_COLLISION_MASK)
-        if block.render:
+        if block.merge_collision:
             # a trick to acc off-rendering training
-            block.dynamic_nodes.append(body_node)
+            body_node = block.get_merged_body(
+                BulletRigidBodyNode,
+                MetaDriveType.BOUNDARY_LINE,
+                block.sidewalk_node_path,
+                block.SIDEWALK_COLLISION_MASK,
+                dynamic=block.render
+            )
+            body_node.addShape(
+                BulletBoxShape(scale / 2),
+                TransformState.makePosQuatScale(panda_vector(middle, 0), quat, Vec3(1, 1, 1))
+            )
+            side_np = block.sidewalk_node_path.attachNewNode(MetaDriveType.BOUNDARY_LINE)
         else:
-            block.static_nodes.append(body_node)
+            body_node = BulletRigidBodyNode(MetaDriveType.BOUNDARY_LINE)
+            body_node.setKinematic(False)
+            body_node.setStatic(True)
+            side_np = block.sidewalk_node_path.attachNewNode(body_node)
+
+            shape = BulletBoxShape(Vec3(1 / 2, 1 / 2, 1 / 2))
+            body_node.addShape(shape)
+            body_node.setIntoCollideMask(block.SIDEWALK_COLLISION_MASK)
+            if block.render:
+                # a trick to acc off-rendering training
+                block.dynamic_nodes.append(body_node)
+            else:
+                block.static_nodes.append(body_node)
+        node_path_list.append(side_np)
 
-        direction_v = lane_end - lane_start
-        if extra_thrust != 0:
-            vertical_v = Vector((direction_v[1], -direction_v[0])) / norm(*direction_v)
-            middle += vertical_v * extra_thrust
         side_np.setPos(panda_vector(middle, 0))
-        theta = math.atan2(direction_v[1], direction_v[0])
-        side_np.setQuat(LQuaternionf(math.cos(theta / 2), 0, 0, math.sin(theta / 2)))
-        side_np.setScale(length * length_multiply, width, block.SIDEWALK_THICKNESS * (1 + 0.1 * np.random.rand()))
+        side_np.setQuat(quat)
+        side_np.setScale(scale)
         if block.render and not block.use_render_pipeline:
             block.sidewalk.instanceTo(side_np)
 
@@ -358,6 +386,18 @@ class AbstractLane:
         This usually used with _construct_lane_only_vis_segment
         """
         lane = self
+        shape = BulletConvexHullShape()
+        for point in polygon:
+            # Panda coordinate is different from metadrive coordinate
+            point_up = LPoint3f(*point, 0.0)
+            shape.addPoint(LPoint3f(*point_up))
+            point_down = LPoint3f(*point, -0.1)
+            shape.addPoint(LPoint3f(*point_down))
+        if block.merge_collision:
+            body = block.get_merged_body(BaseRigidBodyNode, MetaDriveType.LANE_SURFACE_STREET, block.lane_node_path)
+            body.add_sub_shape(shape, TransformState.makeIdentity(), lane.id)
+            return
+
         n = BaseRigidBodyNode(lane.id, MetaDriveType.LANE_SURFACE_STREET)
         segment_np = NodePath(n)
 
@@ -368,13 +408,6 @@ class AbstractLane:
         segment_node.set_active(False)
         segment_node.setKinematic(False)
         segment_node.setStatic(True)
-        shape = BulletConvexHullShape()
-        for point in polygon:
-            # Panda coordinate is different from metadrive coordinate
-            point_up = LPoint3f(*point, 0.0)
-            shape.addPoint(LPoint3f(*point_up))
-            point_down = LPoint3f(*point, -0.1)
-            shape.addPoint(LPoint3f(*point_down))
         segment_node.addShape(shape)
         block.static_nodes.append(segment_node)
         segment_np.reparentTo(block.lane_node_path)
@@ -30,17 +30,23 @@ class PointLane(AbstractLane, InterpolatingLine):
         speed_limit: float = 1000,
         priority: int = 0,
         need_lane_localization=True,
-        auto_generate_polygon=True
+        auto_generate_polygon=True,
+        segments=None,
+        bounding_box=None
     ):
-        center_line_points = np.array(center_line_points)[..., :2]
+        """
+        :param segments: segment arrays of the center line computed in advance, see InterpolatingLine.get_segments()
+        :param bounding_box: bounding box of the center line computed in advance
+        """
+        center_line_points = np.asarray(center_line_points)[..., :2]
         AbstractLane.__init__(self)
-        InterpolatingLine.__init__(self, center_line_points)
-        self._bounding_box = get_points_bounding_box(center_line_points)
+        InterpolatingLine.__init__(self, center_line_points, segments)
+        self._bounding_box = get_points_bounding_box(center_line_points) if bounding_box is None else bounding_box
         self._polygon = polygon
         self.width = width if width else self.VIS_LANE_WIDTH
         if self._polygon is None and auto_generate_polygon:
             self._polygon = self.auto_generate_polygon()
-        self.shapely_polygon = geometry.Polygon(geometry.LineString(self._polygon))
+        self._shapely_polygon = None
         self.need_lane_localization = need_lane_localization
         self.set_speed_limit(speed_limit)
         self.forbidden = forbidden
@@ -56,55 +62,24 @@ class PointLane(AbstractLane, InterpolatingLine):
 
     def auto_generate_polygon(self):
         start_heading = self.heading_theta_at(0)
-        start_dir = [math.cos(start_heading), math.sin(start_heading)]
+        start_extension = np.array([math.cos(start_heading), math.sin(start_heading)]) * self.POLYGON_SAMPLE_RATE
 
         end_heading = self.heading_theta_at(self.length)
-        end_dir = [math.cos(end_heading), math.sin(end_heading)]
-        polygon = []
+        end_extension = np.array([math.cos(end_heading), math.sin(end_heading)]) * self.POLYGON_SAMPLE_RATE
+
         longs = np.arange(0, self.length + self.POLYGON_SAMPLE_RATE, self.POLYGON_SAMPLE_RATE)
-        for k in range(2):
-            if k == 1:
-                longs = longs[::-1]
-            for t, longitude, in enumerate(longs):
-                lateral = self.width_at(longitude) / 2
-                lateral *= -1 if k == 0 else 1
-                point = self.position(longitude, lateral)
-                if (t == 0 and k == 0) or (t == len(longs) - 1 and k == 1):
-                    # control the adding sequence
-                    if k == 1:
-                        # last point
-                        polygon.append([point[0], point[1]])
-
-                    # extend
-                    polygon.append(
-                        [
-                            point[0] - start_dir[0] * self.POLYGON_SAMPLE_RATE,
-                            point[1] - start_dir[1] * self.POLYGON_SAMPLE_RATE
-                        ]
-                    )
-
-                    if k == 0:
-                        # first point
-                        polygon.append([point[0], point[1]])
-                elif (t == 0 and k == 1) or (t == len(longs) - 1 and k == 0):
-
-                    if k == 0:
-                        # second point
-                        polygon.append([point[0], point[1]])
-
-                    polygon.append(
-                        [
-                            point[0] + end_dir[0] * self.POLYGON_SAMPLE_RATE,
-                            point[1] + end_dir[1] * self.POLYGON_SAMPLE_RATE
-                        ]
-                    )
-
-                    if k == 1:
-                        # third point
-                        polygon.append([point[0], point[1]])
-                else:
-                    polygon.append([point[0], point[1]])
-        return np.asarray(polygon)
+        laterals = np.array([self.width_at(longitude) / 2 for longitude in longs])
+        # one side from the start to the end, and the other side from the end to the start
+        right = self.get_points(longs, -laterals)
+        left = self.get_points(longs[::-1], laterals[::-1])
+        if len(longs) == 1:
+            return np.array([right[0] - start_extension, right[0], left[0], left[0] - start_extension])
+        return np.concatenate(
+            [
+                [right[0] - start_extension], right, [right[-1] + end_extension, left[0] + end_extension], left,
+                [left[-1] - start_extension]
+            ]
+        )
 
     def width_at(self, longitudinal: float) -> float:
         return self.width
@@ -149,6 +124,7 @@ class PointLane(AbstractLane, InterpolatingLine):
         self.start = None
         self.end = None
         self._polygon = None
+        self._shapely_polygon = None
         InterpolatingLine.destroy(self)
         super(PointLane, self).destroy()
 
@@ -183,6 +159,12 @@ class PointLane(AbstractLane, InterpolatingLine):
     def polygon(self):
         return self._polygon
 
+    @property
+    def shapely_polygon(self):
+        if self._shapely_polygon is None:
+            self._shapely_polygon = geometry.Polygon(geometry.LineString(self._polygon))
+        return self._shapely_polygon
+
     def point_on_lane(self, point):
         s_point = geometry.Point(point[0], point[1])
         return self.shapely_polygon.contains(s_point)
@@ -23,15 +23,28 @@ class ScenarioLane(PointLane):
     VIS_LANE_WIDTH = 6
     MAX_SPEED_LIMIT = 100
 
-    def __init__(self, lane_id: int, map_data: dict, need_lane_localization):
+    def __init__(self, lane_id: int, map_data: dict, need_lane_localization, lane_table=None):
         """
         Extract the lane information of one lane, and do coordinate shift if required
+
+        :param lane_table: a ScenarioLaneTable of this map. If provided, the geometry of this lane is read from it
         """
-        center_line_points = np.asarray(map_data[lane_id][ScenarioDescription.POLYLINE])
-        if ScenarioDescription.POLYGON in map_data[lane_id] and len(map_data[lane_id][ScenarioDescription.POLYGON]) > 3:
-            polygon = np.asarray(map_data[lane_id][ScenarioDescription.POLYGON])
+        if lane_table is not None and lane_id in lane_table:
+            center_line_points = lane_table.get_center_line(lane_id)
+            polygon = lane_table.get_polygon(lane_id)
+            width = lane_table.get_width(lane_id)
+            segments = lane_table.get_segments(lane_id)
+            bounding_box = lane_table.get_bounding_box(lane_id)
         else:
-            polygon = None
+            lane_table = None
+            center_line_points = np.asarray(map_data[lane_id][ScenarioDescription.POLYLINE])
+            if ScenarioDescription.POLYGON in map_data[lane_id] and len(map_data[lane_id][ScenarioDescription.POLYGON]
+                                                                        ) > 3:
+                polygon = np.asarray(map_data[lane_id][ScenarioDescription.POLYGON])
+            else:
+                polygon = None
+            width = self.get_lane_width(lane_id, map_data)
+            segments = bounding_box = None
         if "speed_limit_kmh" in map_data[lane_id] or "speed_limit_mph" in map_data[lane_id]:
             speed_limit_kmh = map_data[lane_id].get("speed_limit_kmh", None)
             if speed_limit_kmh is None:
@@ -40,11 +53,15 @@ class ScenarioLane(PointLane):
             speed_limit_kmh = self.MAX_SPEED_LIMIT
         super(ScenarioLane, self).__init__(
             center_line_points=center_line_points,
-            width=self.get_lane_width(lane_id, map_data),
+            width=width,
             polygon=polygon,
             speed_limit=speed_limit_kmh,
-            need_lane_localization=need_lane_localization
+            need_lane_localization=need_lane_localization,
+            segments=segments,
+            bounding_box=bounding_box
         )
+        if lane_table is not None and polygon is None:
+            lane_table.set_polygon(lane_id, self._polygon)
         self.index = lane_id
         self.lane_type = map_data[lane_id]["type"]
         self.entry_lanes = map_data[lane_id].get(ScenarioDescription.ENTRY, None)
@@ -93,17 +110,18 @@ class ScenarioLane(PointLane):
             polygon = np.concatenate([left_boundary_points, right_boundary_points], axis=0)[..., :2]
             return np.asarray(polygon)
 
-    def get_lane_width(self, lane_id, map_data):
+    @classmethod
+    def get_lane_width(cls, lane_id, map_data):
         """
         We use this function to get possible lane width from raw data
         """
         if not (ScenarioDescription.RIGHT_NEIGHBORS in map_data[lane_id]
                 and ScenarioDescription.LEFT_NEIGHBORS in map_data[lane_id]):
-            return self.VIS_LANE_WIDTH
+            return cls.VIS_LANE_WIDTH
         right_lanes = map_data[lane_id][ScenarioDescription.RIGHT_NEIGHBORS]
         left_lanes = map_data[lane_id][ScenarioDescription.LEFT_NEIGHBORS]
         if len(right_lanes) + len(left_lanes) == 0:
-            return max(sum(map_data[lane_id]["width"][0]), self.VIS_LANE_WIDTH)
+            return max(sum(map_data[lane_id]["width"][0]), cls.VIS_LANE_WIDTH)
         dist_to_left_lane = 0
         dist_to_right_lane = 0
         if len(right_lanes) > 0 and "feature_id" in right_lanes[0]:
@@ -120,7 +138,7 @@ class ScenarioLane(PointLane):
             n_point = left_lane[ScenarioDescription.POLYLINE][neighbor_start]
             self_point = map_data[lane_id][ScenarioDescription.POLYLINE][self_start]
             dist_to_left_lane = norm(n_point[0] - self_point[0], n_point[1] - self_point[1])
-        return max(dist_to_left_lane, dist_to_right_lane, self.VIS_LANE_WIDTH)
+        return max(dist_to_left_lane, dist_to_right_lane, cls.VIS_LANE_WIDTH)
 
     def __del__(self):
         logging.debug("ScenarioLane is released")
@@ -0,0 +1,94 @@
+import numpy as np
+
+from metadrive.scenario.scenario_description import ScenarioDescription
+from metadrive.type import MetaDriveType
+from metadrive.utils.interpolating_line import InterpolatingLine
+
+
+class ScenarioLaneTable:
+    """
+    Geometry of all lanes in a scenario map packed into concatenated arrays: center lines, segments with their lengths,
+    directions and headings, widths, bounding boxes and polygons. It is built once for a map and cached by the
+    ScenarioDataManager, so that ScenarioLanes created from it only hold views of these arrays
+    """
+    def __init__(self, map_features):
+        from metadrive.component.lane.scenario_lane import ScenarioLane
+
+        self.lane_ids = []
+        points = []
+        start_points = []
+        end_points = []
+        static_segments = []
+        polygons = []
+        for lane_id, data in map_features.items():
+            if not MetaDriveType.is_lane(data.get("type", False)) or len(data[ScenarioDescription.POLYLINE]) <= 1:
+                continue
+            center_line = np.asarray(data[ScenarioDescription.POLYLINE], dtype=float)[..., :2]
+            start_indices, end_indices = InterpolatingLine.get_segment_indices(center_line)
+            if len(start_indices) == 0:
+                static_segments.append(len(start_points))
+                static_start, static_end = InterpolatingLine.get_static_segments(center_line[0])[:2]
+                start_points.append(static_start)
+                end_points.append(static_end)
+            else:
+                start_points.append(center_line[start_indices])
+                end_points.append(center_line[end_indices])
+            points.append(center_line)
+            polygon = data.get(ScenarioDescription.POLYGON, None)
+            polygons.append(np.asarray(polygon) if polygon is not None and len(polygon) > 3 else None)
+            self.lane_ids.append(lane_id)
+
+        self._rows = {lane_id: row for row, lane_id in enumerate(self.lane_ids)}
+        self.point_offsets = np.cumsum([0] + [len(p) for p in points])
+        self.segment_offsets = np.cumsum([0] + [len(p) for p in start_points])
+        self.points = np.concatenate(points) if len(points) > 0 else np.zeros((0, 2))
+        if len(start_points) > 0:
+            self.segments = InterpolatingLine.compute_segments(np.concatenate(start_points), np.concatenate(end_points))
+        else:
+            self.segments = InterpolatingLine.get_static_segments(np.zeros(2))
+        for row in static_segments:
+            # segments of static lanes have fixed properties
+            idx = self.segment_offsets[row]
+            for array, value in zip(self.segments[2:], InterpolatingLine.get_static_segments(np.zeros(2))[2:]):
+                array[idx] = value[0]
+
+        self.widths = np.array([ScenarioLane.get_lane_width(lane_id, map_features) for lane_id in self.lane_ids])
+        if len(points) > 0:
+            starts = self.point_offsets[:-1]
+            x_max = np.maximum.reduceat(self.points[:, 0], starts)
+            x_min = np.minimum.reduceat(self.points[:, 0], starts)
+            y_max = np.maximum.reduceat(self.points[:, 1], starts)
+            y_min = np.minimum.reduceat(self.points[:, 1], starts)
+            # the same order as get_points_bounding_box()
+            self.bounding_boxes = np.stack([x_max, x_min, y_max, y_min], axis=1)
+        else:
+            self.bounding_boxes = np.zeros((0, 4))
+        # polygons not provided by data are generated by lanes, and they are stored here when generated
+        self.polygons = polygons
+
+    def __contains__(self, lane_id):
+        return lane_id in self._rows
+
+    def __len__(self):
+        return len(self.lane_ids)
+
+    def get_center_line(self, lane_id):
+        row = self._rows[lane_id]
+        return self.points[self.point_offsets[row]:self.point_offsets[row + 1]]
+
+    def get_segments(self, lane_id):
+        row = self._rows[lane_id]
+        start, end = self.segment_offsets[row], self.segment_offsets[row + 1]
+        return tuple(array[start:end] for array in self.segments)
+
+    def get_width(self, lane_id):
+        return float(self.widths[self._rows[lane_id]])
+
+    def get_bounding_box(self, lane_id):
+        return tuple(self.bounding_boxes[self._rows[lane_id]])
+
+    def get_polygon(self, lane_id):
+        return self.polygons[self._rows[lane_id]]
+
+    def set_polygon(self, lane_id, polygon):
+        self.polygons[self._rows[lane_id]] = polygon
@@ -1,8 +1,12 @@
+import hashlib
+import json
 import logging
 import math
+import os
 
 import cv2
 import numpy as np
+import shapely
 from metadrive.base_class.base_runnable import BaseRunnable
 from metadrive.constants import MapTerrainSemanticColor, MetaDriveType, DrivableAreaProperty
 from metadrive.engine.engine_utils import get_global_config
@@ -10,6 +14,9 @@ from shapely.geometry import Polygon, MultiPolygon
 
 logger = logging.getLogger(__name__)
 
+# vectorized geometry functions are only available in shapely 2
+_SHAPELY_2 = int(shapely.__version__.split(".")[0]) >= 2
+
 
 class BaseMap(BaseRunnable):
     """
@@ -161,52 +168,61 @@ class BaseMap(BaseRunnable):
         """
         if self._semantic_map is None:
             all_lanes = self.get_map_features(interval=line_sample_interval)
-            polygons = []
-            polylines = []
-
-            points_to_skip = math.floor(DrivableAreaProperty.STRIPE_LENGTH * 2 / line_sample_interval)
-            for obj in all_lanes.values():
-                if MetaDriveType.is_lane(obj["type"]) and "lane" in layer:
-                    polygons.append((obj["polygon"], MapTerrainSemanticColor.get_color(obj["type"])))
-                elif "lane_line" in layer and (MetaDriveType.is_road_line(obj["type"])
-                                               or MetaDriveType.is_sidewalk(obj["type"])):
-                    if MetaDriveType.is_broken_line(obj["type"]):
-                        for index in range(0, len(obj["polyline"]) - 1, points_to_skip * 2):
-                            if index + points_to_skip < len(obj["polyline"]):
-                                polylines.append(
-                                    (
-                                        [obj["polyline"][index], obj["polyline"][index + points_to_skip]],
-                                        MapTerrainSemanticColor.get_color(obj["type"])
-                                    )
-                                )
-                    else:
-                        polylines.append((obj["polyline"], MapTerrainSemanticColor.get_color(obj["type"])))
-
-            size = int(size * pixels_per_meter)
-            mask = np.zeros([size, size, 4], dtype=np.float32)
-            mask[..., 0:] = color_setting.get_color(MetaDriveType.GROUND)
-            # create an example bounding box polygon
-            # for idx in range(len(polygons)):
-            center_p = self.get_center_point()
-            for polygon, color in polygons:
-                points = [
-                    [
-                        int((x - center_p[0]) * pixels_per_meter + size / 2),
-                        int((y - center_p[1]) * pixels_per_meter) + size / 2
-                    ] for x, y in polygon
-                ]
-                cv2.fillPoly(mask, np.array([points]).astype(np.int32), color=color)
-            for line, color in polylines:
-                points = [
-                    [
-                        int((p[0] - center_p[0]) * pixels_per_meter + size / 2),
-                        int((p[1] - center_p[1]) * pixels_per_meter) + size / 2
-                    ] for p in line
-                ]
-                cv2.polylines(mask, np.array([points]).astype(np.int32), False, color, polyline_thickness)
-            self._semantic_map = mask
+            self._semantic_map = self._get_cached_map_image(
+                "semantic",
+                all_lanes,
+                self._draw_semantic_map,
+                size=size,
+                pixels_per_meter=pixels_per_meter,
+                ground_color=color_setting.get_color(MetaDriveType.GROUND),
+                line_sample_interval=line_sample_interval,
+                polyline_thickness=polyline_thickness,
+                layer=sorted(layer)
+            )
         return self._semantic_map
 
+    def _draw_semantic_map(
+        self, all_lanes, center_p, size, pixels_per_meter, ground_color, line_sample_interval, polyline_thickness, layer
+    ):
+        # (color, points) of polygons and polylines in the order of map features, which is the paint order
+        polygons = []
+        polylines = []
+
+        points_to_skip = math.floor(DrivableAreaProperty.STRIPE_LENGTH * 2 / line_sample_interval)
+        for obj in all_lanes.values():
+            if MetaDriveType.is_lane(obj["type"]) and "lane" in layer:
+                color = MapTerrainSemanticColor.get_color(obj["type"])
+                polygons.append((color, np.asarray(obj["polygon"])[..., :2]))
+            elif "lane_line" in layer and (MetaDriveType.is_road_line(obj["type"])
+                                           or MetaDriveType.is_sidewalk(obj["type"])):
+                color = MapTerrainSemanticColor.get_color(obj["type"])
+                polyline = np.asarray(obj["polyline"])[..., :2]
+                if MetaDriveType.is_broken_line(obj["type"]):
+                    # one stripe from every 2 * points_to_skip points
+                    start = np.arange(0, len(polyline) - 1, points_to_skip * 2)
+                    start = start[start + points_to_skip < len(polyline)]
+                    for stripe in np.stack([polyline[start], polyline[start + points_to_skip]], axis=1):
+                        polylines.append((color, stripe))
+                else:
+                    polylines.append((color, polyline))
+
+        size = int(size * pixels_per_meter)
+        mask = np.zeros([size, size, 4], dtype=np.float32)
+        mask[..., 0:] = ground_color
+        # Polygons are painted before polylines. In each layer, consecutive shapes with the same color are painted
+        # together, which keeps the paint order of overlapped shapes with different colors
+        for color, color_polygons in _group_by_color(polygons):
+            # overlapped polygons can not be filled in one cv2.fillPoly call, which makes holes with the even-odd rule
+            filled = np.zeros([size, size], dtype=np.uint8)
+            for points in _to_pixel_coordinates(color_polygons, center_p, pixels_per_meter, size):
+                cv2.fillPoly(filled, [points], color=1)
+            mask[filled > 0] = color
+        for color, lines in _group_by_color(polylines):
+            cv2.polylines(
+                mask, _to_pixel_coordinates(lines, center_p, pixels_per_meter, size), False, color, polyline_thickness
+            )
+        return mask
+
     def get_height_map(
         self,
         size=2048,
@@ -223,44 +239,114 @@ class BaseMap(BaseRunnable):
         :return: heightfield image in uint 16 nparray
         """
         if self._height_map is None:
-            extension = max(1, extension)
             all_lanes = self.get_map_features()
-            polygons = []
-
-            for obj in all_lanes.values():
-                if MetaDriveType.is_lane(obj["type"]):
-                    polygons.append(obj["polygon"])
-
-            size = int(size * pixels_per_meter)
-            mask = np.zeros([size, size, 1])
-
-            center_p = self.get_center_point()
-            need_scale = abs(extension - 1) > 1e-1
-            for polygon in polygons:
-                if need_scale:
-                    scaled_polygon = Polygon(polygon).buffer(extension, join_style=2)
-                    if isinstance(scaled_polygon, MultiPolygon):
-                        scaled_polygons = scaled_polygon.geoms
-                    else:
-                        scaled_polygons = [scaled_polygon]
-                    for scaled_polygon in scaled_polygons:
-                        points = [
-                            [
-                                int(
-                                    (scaled_polygon.exterior.coords.xy[0][index] - center_p[0]) * pixels_per_meter +
-                                    size / 2
-                                ),
-                                int((scaled_polygon.exterior.coords.xy[1][index] - center_p[1]) * pixels_per_meter) +
-                                size / 2
-                            ] for index in range(len(scaled_polygon.exterior.coords.xy[0]))
-                        ]
-                else:
-                    points = [
-                        [
-                            int((x - center_p[0]) * pixels_per_meter + size / 2),
-                            int((y - center_p[1]) * pixels_per_meter) + size / 2
-                        ] for x, y in polygon
-                    ]
-                cv2.fillPoly(mask, np.asarray([points]).astype(np.int32), color=[height])
-            self._height_map = mask
+            self._height_map = self._get_cached_map_image(
+                "height",
+                all_lanes,
+                self._draw_height_map,
+                size=size,
+                pixels_per_meter=pixels_per_meter,
+                extension=max(1, extension),
+                height=height
+            )
         return self._height_map
+
+    def _draw_height_map(self, all_lanes, center_p, size, pixels_per_meter, extension, height):
+        polygons = []
+
+        for obj in all_lanes.values():
+            if MetaDriveType.is_lane(obj["type"]):
+                polygons.append(np.asarray(obj["polygon"])[..., :2])
+
+        size = int(size * pixels_per_meter)
+        need_scale = abs(extension - 1) > 1e-1
+        if need_scale and len(polygons) > 0:
+            polygons = _buffer_polygons(polygons, extension)
+
+        filled = np.zeros([size, size], dtype=np.uint8)
+        for points in _to_pixel_coordinates(polygons, center_p, pixels_per_meter, size):
+            cv2.fillPoly(filled, [points], color=1)
+        mask = np.zeros([size, size, 1])
+        mask[filled > 0] = height
+        return mask
+
+    def _get_cached_map_image(self, name, all_lanes, draw_func, **kwargs):
+        """
+        Call draw_func(all_lanes, center_point, **kwargs) to rasterize the map. If map_image_cache_dir is set, the
+        image is saved to the cache directory and identified by the content of map features and kwargs, so the same map
+        is only rasterized once, even across processes
+        """
+        center_p = self.get_center_point()
+        cache_dir = self.engine.global_config["map_image_cache_dir"] if self.engine is not None else None
+        if cache_dir is None:
+            return draw_func(all_lanes, center_p, **kwargs)
+
+        # the center point and parameters may be numpy scalars or arrays, which are converted to python numbers
+        key = dict(center=[float(value) for value in center_p], **kwargs)
+        key = hashlib.sha1(
+            json.dumps(key, sort_keys=True, default=lambda value: np.asarray(value).tolist()).encode("utf-8")
+        )
+        for lane_id in sorted(all_lanes.keys(), key=str):
+            obj = all_lanes[lane_id]
+            key.update("{}:{}".format(lane_id, obj["type"]).encode("utf-8"))
+            for attr in ["polygon", "polyline"]:
+                if attr in obj:
+                    key.update(np.ascontiguousarray(obj[attr], dtype=np.float64).tobytes())
+        cache_file = os.path.join(cache_dir, "{}_{}.npy".format(name, key.hexdigest()[:16]))
+        if os.path.exists(cache_file):
+            return np.load(cache_file)
+
+        ret = draw_func(all_lanes, center_p, **kwargs)
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_file = "{}.{}.tmp".format(cache_file, os.getpid())
+        with open(tmp_file, "wb+") as file:
+            np.save(file, ret)
+        os.replace(tmp_file, cache_file)
+        return ret
+
+
+def _buffer_polygons(polygons, distance):
+    """
+    Enlarge polygons by distance with mitre joins, and return exterior points of them. Multi-polygons are split into
+    parts
+    """
+    if _SHAPELY_2:
+        # buffer all polygons in one call
+        scaled_polygons = shapely.get_parts(
+            shapely.buffer([Polygon(polygon) for polygon in polygons], distance, join_style="mitre")
+        )
+        coords, index = shapely.get_coordinates(shapely.get_exterior_ring(scaled_polygons), return_index=True)
+        return np.split(coords, np.flatnonzero(np.diff(index)) + 1) if len(coords) > 0 else []
+    ret = []
+    for polygon in polygons:
+        scaled_polygon = Polygon(polygon).buffer(distance, join_style=2)
+        scaled_polygons = scaled_polygon.geoms if isinstance(scaled_polygon, MultiPolygon) else [scaled_polygon]
+        ret += [np.asarray(p.exterior.coords)[..., :2] for p in scaled_polygons if not p.is_empty]
+    return ret
+
+
+def _group_by_color(shapes):
+    """
+    Group consecutive (color, points) pairs with the same color into (color, [points, ...]) pairs
+    """
+    ret = []
+    for color, points in shapes:
+        if len(ret) > 0 and ret[-1][0] == color:
+            ret[-1][1].append(points)
+        else:
+            ret.append((color, [points]))
+    return ret
+
+
+def _to_pixel_coordinates(polylines, center_p, pixels_per_meter, size):
+    """
+    Convert a list of polylines/polygons in meters to pixel coordinates of a (size, size) image centered at center_p.
+    All points are transformed in one batch
+    """
+    if len(polylines) == 0:
+        return []
+    points = np.concatenate(polylines, axis=0)
+    x = (points[:, 0] - center_p[0]) * pixels_per_meter + size / 2
+    y = np.trunc((points[:, 1] - center_p[1]) * pixels_per_meter) + size / 2
+    pixels = np.stack([x, y], axis=1).astype(np.int32)
+    return np.split(pixels, np.cumsum([len(polyline) for polyline in polylines])[:-1])
@@ -34,6 +34,8 @@ class NuPlanMap(BaseMap):
         self._center = np.array(nuplan_center)
         self._nuplan_map_api = self.engine.data_manager.current_scenario.map_api
         self.attached_blocks = []
+        # NodePaths and bullet bodies of a block are created when it is attached for the first time
+        self._created_blocks = set()
         self.boundary_block = None  # it won't be detached
         self._radius = radius
         self.cull_dist = get_global_config()["scenario_radius"]
@@ -51,6 +53,9 @@ class NuPlanMap(BaseMap):
             if not SceneCull.out_of_bounding_box(block.bounding_box, np.array(center_point) - self.nuplan_center,
                                                  self.cull_dist):
                 self.road_network.add(block.block_network)
+                if block.name not in self._created_blocks:
+                    block._create_in_world()
+                    self._created_blocks.add(block.name)
                 block.attach_to_world(parent_node_path, physics_world)
                 self.attached_blocks.append(block)
         if not self.engine.global_config["load_city_map"]:
@@ -61,6 +66,7 @@ class NuPlanMap(BaseMap):
             self.boundary_block.detach_from_world(self.engine.physics_world or physics_world)
         for block in self.attached_blocks:
             block.detach_from_world(self.engine.physics_world or physics_world)
+        self.attached_blocks = []
 
     def _generate(self):
         logger.info("\n \n ############### Start Building Map: {} ############### \n".format(self.map_name))
@@ -121,7 +127,9 @@ class NuPlanMap(BaseMap):
                     block_polygons.append(block.polygon)
                 block_index += 1
                 setattr(road_block, "_sample_topology", _sample_topology)
-                road_block.construct_block(self.engine.worldNP, self.engine.physics_world, attach_to_world=False)
+                road_block.construct_block(
+                    self.engine.worldNP, self.engine.physics_world, attach_to_world=False, create_in_world=False
+                )
                 self.blocks.append(road_block)
                 # intersection road connector
 
@@ -44,6 +44,15 @@ class MapGenerateMethod:
 
 
 class PGMap(BaseMap):
+    def __init__(self, map_config: dict = None, random_seed=None, baked_blocks=None):
+        """
+        :param baked_blocks: geometry of blocks baked by bake_blocks(), which is restored instead of being built again.
+        It is only used when the map is generated from a block sequence
+        """
+        self._baked_blocks = baked_blocks
+        super(PGMap, self).__init__(map_config=map_config, random_seed=random_seed)
+        self._baked_blocks = None
+
     def _generate(self):
         """
         We can override this function to introduce other methods!
@@ -99,14 +108,23 @@ class PGMap(BaseMap):
                 random_seed=self.engine.global_random_seed,
                 ignore_intersection_checking=True
             )
-            last_block.construct_from_config(b, parent_node_path, physics_world)
+            baked = self._baked_blocks[block_index] if self._baked_blocks is not None else None
+            # the map is detached after generation, so don't attach blocks here
+            last_block.construct_from_config(
+                b, parent_node_path, physics_world, attach_to_world=False, create_in_world=baked is None
+            )
+            if baked is not None:
+                last_block.restore_in_world(baked)
             self.blocks.append(last_block)
 
     @property
     def road_network_type(self):
         return NodeRoadNetwork
 
-    def get_meta_data(self):
+    def get_block_sequence(self):
+        """
+        Return the parameters of all blocks and the map config, with which the map can be rebuilt without searching
+        """
         assert self.blocks is not None and len(self.blocks) > 0, "Please generate Map before saving it"
         map_config = []
         for b in self.blocks:
@@ -115,8 +133,17 @@ class PGMap(BaseMap):
             json_config[self.BLOCK_ID] = b.ID
             json_config[self.PRE_BLOCK_SOCKET_INDEX] = b.pre_block_socket_index
             map_config.append(json_config)
+        return copy.deepcopy({self.BLOCK_SEQUENCE: map_config, "map_config": self.config.copy()})
 
-        saved_data = copy.deepcopy({self.BLOCK_SEQUENCE: map_config, "map_config": self.config.copy()})
+    def bake_blocks(self):
+        """
+        Return the built geometry of all blocks, see BaseBlock.bake_in_world(). The first block is always built, as it
+        is created with the map
+        """
+        return [None] + [block.bake_in_world() for block in self.blocks[1:]]
+
+    def get_meta_data(self):
+        saved_data = self.get_block_sequence()
         saved_data.update(super(PGMap, self).get_meta_data())
         return saved_data
 
@@ -2,10 +2,12 @@ import logging
 
 import numpy as np
 
+from metadrive.component.lane.scenario_lane import ScenarioLane
 from metadrive.component.map.base_map import BaseMap
 from metadrive.component.road_network.edge_road_network import EdgeRoadNetwork
 from metadrive.component.scenario_block.scenario_block import ScenarioBlock
 from metadrive.engine.asset_loader import AssetLoader
+from metadrive.engine.scene_cull import SceneCull
 from metadrive.type import MetaDriveType
 from metadrive.scenario.scenario_description import ScenarioDescription
 from metadrive.utils.math import resample_polyline, get_polyline_length
@@ -15,6 +17,17 @@ class ScenarioMap(BaseMap):
     def __init__(self, map_index, random_seed=None):
         self.map_index = map_index
         self.need_lane_localization = self.engine.global_config["need_lane_localization"]
+
+        # map tiles. If tile size is set, each block is a square tile, which is built and attached when agents approach
+        self.tile_size = self.engine.global_config["map_tile_size"]
+        self.tile_radius = self.engine.global_config["map_tile_radius"]
+        self.max_tiles = self.engine.global_config["max_map_tiles"]
+        self._tile_bounding_boxes = []
+        self._created_tiles = set()
+        # lanes are built lazily when agents approach, if this radius is set and map tiles are not used
+        self.lane_construction_radius = None
+        if self.tile_size is None:
+            self.lane_construction_radius = self.engine.global_config["lane_construction_radius"]
         super(ScenarioMap, self).__init__(dict(id=self.map_index), random_seed=random_seed)
 
     def show_coordinates(self):
@@ -22,16 +35,142 @@ class ScenarioMap(BaseMap):
         self.engine.show_lane_coordinates(lanes)
 
     def _generate(self):
+        if self.tile_size is not None:
+            self._generate_tiles()
+            return
         block = ScenarioBlock(
             block_index=0,
             global_network=self.road_network,
             random_seed=0,
             map_index=self.map_index,
-            need_lane_localization=self.need_lane_localization
+            need_lane_localization=self.need_lane_localization,
+            construction_radius=self.lane_construction_radius
         )
         block.construct_block(self.engine.worldNP, self.engine.physics_world, attach_to_world=True)
         self.blocks.append(block)
 
+    def _generate_tiles(self):
+        """
+        Only the topology of tiles is built here. NodePaths and bullet bodies are created in update_tiles()
+        """
+        for index, (tile, map_features) in enumerate(sorted(self._split_map_features().items())):
+            block = ScenarioBlock(
+                block_index=index,
+                global_network=self.road_network,
+                random_seed=0,
+                map_index=self.map_index,
+                need_lane_localization=self.need_lane_localization,
+                map_features=map_features
+            )
+            block.construct_block(
+                self.engine.worldNP, self.engine.physics_world, attach_to_world=False, create_in_world=False
+            )
+            self.blocks.append(block)
+            x, y = tile
+            self._tile_bounding_boxes.append(
+                (x * self.tile_size, (x + 1) * self.tile_size, y * self.tile_size, (y + 1) * self.tile_size)
+            )
+
+    def _split_map_features(self):
+        """
+        Partition map features into square tiles. A lane is put in every tile its bounding box overlaps, so that it is
+        built wherever agents drive on it, while lane lines and road edges are cut into pieces at tile borders
+        :return: a dict mapping tile (x, y) index to map features in it
+        """
+        tiles = {}
+        map_data = self.engine.data_manager.get_scenario(self.map_index, should_copy=False)["map_features"]
+        for feature_id, data in map_data.items():
+            type = data.get("type", None)
+            if ScenarioDescription.POLYLINE not in data or len(data[ScenarioDescription.POLYLINE]) <= 1:
+                continue
+            polyline = np.asarray(data[ScenarioDescription.POLYLINE])
+            tile_index = np.floor(polyline[..., :2] / self.tile_size).astype(int)
+            if MetaDriveType.is_lane(type):
+                if len(data.get(ScenarioDescription.POLYGON, [])) > 3:
+                    points = np.asarray(data[ScenarioDescription.POLYGON])[..., :2]
+                else:
+                    # the polygon is generated from the center line and lane width, when the lane is created
+                    points = polyline[..., :2]
+                    half_width = ScenarioLane.get_lane_width(feature_id, map_data) / 2
+                    points = np.concatenate([points - half_width, points + half_width])
+                x_min, y_min = np.floor(np.min(points, axis=0) / self.tile_size).astype(int)
+                x_max, y_max = np.floor(np.max(points, axis=0) / self.tile_size).astype(int)
+                for x in range(x_min, x_max + 1):
+                    for y in range(y_min, y_max + 1):
+                        tiles.setdefault((x, y), {})[feature_id] = data
+            elif MetaDriveType.is_road_line(type) or MetaDriveType.is_road_edge(type):
+                # each piece shares its last point with the next piece, so that lines are continuous across tiles
+                starts = np.flatnonzero(np.any(tile_index[1:] != tile_index[:-1], axis=1)) + 1
+                for piece_index, (start, end) in enumerate(zip([0, *starts], [*starts, len(polyline)])):
+                    piece = polyline[start:end + 1]
+                    if len(piece) <= 1:
+                        continue
+                    piece_data = dict(data)
+                    piece_data[ScenarioDescription.POLYLINE] = piece
+                    tiles.setdefault(tuple(tile_index[start]), {})["{}_{}".format(feature_id, piece_index)] = piece_data
+        return tiles
+
+    def attach_to_world(self, parent_np=None, physics_world=None):
+        if self.tile_size is None:
+            return super(ScenarioMap, self).attach_to_world(parent_np, physics_world)
+        # all tiles around the ego car are loaded at once
+        self.update_tiles([self.blocks[0].sdc_start_point], max_new_tiles=None)
+
+    def update_tiles(self, positions, max_new_tiles=None):
+        """
+        Load tiles within tile radius of agents and unload distant tiles. When the number of tiles with bodies exceeds
+        max_map_tiles, the farthest detached tiles are destroyed to save memory
+        :param positions: positions of agents
+        :param max_new_tiles: the maximum number of tiles to build in this call. Tiles are built from the nearest one.
+        The tile where an agent is located is always built. None: no limit
+        """
+        if len(positions) == 0 or len(self.blocks) == 0:
+            return
+        distances = SceneCull.distances_to_bounding_boxes(self._tile_bounding_boxes, positions)
+        parent_node_path, physics_world = self.engine.worldNP, self.engine.physics_world
+        num_new_tiles = 0
+        for index in np.argsort(distances, kind="stable"):
+            if distances[index] > self.tile_radius:
+                break
+            block = self.blocks[index]
+            if index not in self._created_tiles:
+                if max_new_tiles is not None and num_new_tiles >= max_new_tiles and distances[index] > 0:
+                    continue
+                block._create_in_world()
+                self._created_tiles.add(index)
+                num_new_tiles += 1
+            block.attach_to_world(parent_node_path, physics_world)
+
+        # tiles are detached when they are farther than the tile radius plus a band, to avoid attaching and detaching
+        # them repeatedly
+        detached = []
+        for index in self._created_tiles:
+            block = self.blocks[index]
+            if distances[index] > self.tile_radius + SceneCull.LOD_HYSTERESIS:
+                block.detach_from_world(physics_world)
+            if not block.static_nodes.attached:
+                detached.append(index)
+        num_evicted = len(self._created_tiles) - self.max_tiles
+        if num_evicted > 0:
+            for index in sorted(detached, key=lambda i: -distances[i])[:num_evicted]:
+                self.blocks[index].clear_in_world(physics_world)
+                self._created_tiles.remove(index)
+
+    def update_lanes(self, positions):
+        """
+        Build lanes and lane lines within the lane construction radius of agents. Built ones are kept until the map is
+        destroyed
+        :param positions: positions of agents
+        :return: number of lanes and line pieces built in this call
+        """
+        if self.lane_construction_radius is None or len(self.blocks) == 0:
+            return 0
+        return self.blocks[0].create_nearby_in_world(positions, self.engine.physics_world)
+
+    @property
+    def num_created_tiles(self):
+        return len(self._created_tiles)
+
     def play(self):
         # For debug
         for b in self.blocks:
@@ -45,6 +184,7 @@ class ScenarioMap(BaseMap):
 
     def destroy(self):
         self.map_index = None
+        self._created_tiles = set()
         super(ScenarioMap, self).destroy()
 
     def __del__(self):
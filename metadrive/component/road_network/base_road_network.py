@@ -1,3 +1,5 @@
+import heapq
+import itertools
 import logging
 import numpy as np
 from typing import List, Tuple, Union
@@ -14,9 +16,12 @@ class BaseRoadNetwork:
         self.graph = None
         self.bounding_box = None
         self._lines_np = []
+        # start node -> shortest path tree, which maps each reachable node to its previous node
+        self._shortest_path_trees = {}
 
     def clear(self):
         self.graph.clear()
+        self.clear_route_cache()
 
     def get_bounding_box(self):
         if self.bounding_box is None:
@@ -43,7 +48,7 @@ class BaseRoadNetwork:
 
     def shortest_path(self, start: str, goal: str) -> List[str]:
         """
-        Breadth-first search of shortest checkpoints from start to goal.
+        Search the shortest checkpoints from start to goal.
 
         :param start: starting node
         :param goal: goal node
@@ -51,6 +56,59 @@ class BaseRoadNetwork:
         """
         raise NotImplementedError
 
+    def get_successors(self, node):
+        """
+        Return (next_node, cost) pairs of nodes connected to this node, where the cost is the length of the road
+        """
+        raise NotImplementedError
+
+    def get_shortest_path_tree(self, start):
+        """
+        Dijkstra search from start weighted by road length. The result maps each reachable node to its previous node
+        on the shortest path, and is cached until the road network is modified
+        """
+        if start in self._shortest_path_trees:
+            return self._shortest_path_trees[start]
+        previous = {start: None}
+        distances = {start: 0}
+        # the counter breaks ties, so that nodes are never compared
+        counter = itertools.count()
+        queue = [(0, next(counter), start)]
+        while queue:
+            distance, _, node = heapq.heappop(queue)
+            if distance > distances[node]:
+                continue
+            for next_node, cost in self.get_successors(node):
+                new_distance = distance + cost
+                if next_node not in distances or new_distance < distances[next_node]:
+                    distances[next_node] = new_distance
+                    previous[next_node] = node
+                    heapq.heappush(queue, (new_distance, next(counter), next_node))
+        self._shortest_path_trees[start] = previous
+        return previous
+
+    def search_path(self, start, goal) -> List:
+        """
+        Return the shortest path from start to goal including both of them, or an empty list if there is no route
+        """
+        previous = self.get_shortest_path_tree(start)
+        if goal == start or goal not in previous:
+            return []
+        path = [goal]
+        while path[-1] != start:
+            path.append(previous[path[-1]])
+        path.reverse()
+        return path
+
+    def has_route(self, start, goal) -> bool:
+        return goal != start and goal in self.get_shortest_path_tree(start)
+
+    def clear_route_cache(self):
+        """
+        Called when the road network is modified
+        """
+        self._shortest_path_trees = {}
+
     def __isub__(self, other):
         raise NotImplementedError
 
@@ -87,6 +145,7 @@ class BaseRoadNetwork:
 
     def destroy(self):
         self.bounding_box = None
+        self.clear_route_cache()
 
     def has_connection(self, lane_index_1, lane_index_2):
         """
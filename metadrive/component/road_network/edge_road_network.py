@@ -1,4 +1,5 @@
 import logging
+from collections import deque
 from metadrive.scenario.scenario_description import ScenarioDescription as SD
 from collections import namedtuple
 from typing import List
@@ -29,6 +30,7 @@ class EdgeRoadNetwork(BaseRoadNetwork):
             left_lanes=lane.left_lanes,
             right_lanes=lane.right_lanes
         )
+        self.clear_route_cache()
 
     def get_lane(self, index: LaneIndex):
         return self.graph[index].lane
@@ -36,6 +38,7 @@ class EdgeRoadNetwork(BaseRoadNetwork):
     def __isub__(self, other):
         for id, lane_info in other.graph.items():
             self.graph.pop(id)
+        self.clear_route_cache()
         return self
 
     def add(self, other, no_intersect=True):
@@ -43,6 +46,7 @@ class EdgeRoadNetwork(BaseRoadNetwork):
             if no_intersect:
                 assert id not in self.graph.keys(), "Intersect: {} exists in two network".format(id)
             self.graph[id] = other.graph[id]
+        self.clear_route_cache()
         return self
 
     def _get_bounding_box(self):
@@ -58,7 +62,20 @@ class EdgeRoadNetwork(BaseRoadNetwork):
         return res_x_min, res_x_max, res_y_min, res_y_max
 
     def shortest_path(self, start: str, goal: str):
-        return next(self.bfs_paths(start, goal), [])
+        return self.search_path(start, goal)
+
+    def get_successors(self, node):
+        """
+        The cost of moving to the next lane is the length of this lane
+        """
+        if node not in self.graph or self.graph[node].exit_lanes is None:
+            return
+        length = self.graph[node].lane.length
+        for _next in self.graph[node].exit_lanes:
+            # converted datasets may store connected lanes as int ids, while lanes are indexed by str ids
+            if _next not in self.graph and str(_next) in self.graph:
+                _next = str(_next)
+            yield _next, length
 
     def bfs_paths(self, start: str, goal: str) -> List[List[str]]:
         """
@@ -68,9 +85,9 @@ class EdgeRoadNetwork(BaseRoadNetwork):
         :param goal: goal node
         :return: list of paths from start to goal.
         """
-        queue = [(start, [start])]
+        queue = deque([(start, [start])])
         while queue:
-            (node, path) = queue.pop(0)
+            (node, path) = queue.popleft()
             if node not in self.graph:
                 yield []
             for _next in set(self.graph[node].exit_lanes) - set(path):
@@ -129,3 +146,4 @@ class OpenDriveRoadNetwork(EdgeRoadNetwork):
         self.graph[lane.index] = lane_info(
             lane=lane, entry_lanes=None, exit_lanes=None, left_lanes=None, right_lanes=None
         )
+        self.clear_route_cache()
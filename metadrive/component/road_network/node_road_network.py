@@ -1,4 +1,5 @@
 import copy
+from collections import deque
 from metadrive.scenario.scenario_description import ScenarioDescription as SD
 import logging
 from typing import List, Tuple, Dict
@@ -84,6 +85,7 @@ class NodeRoadNetwork(BaseRoadNetwork):
         assert not self.is_initialized
         self._update_indices()
         self._init_graph_helper()
+        self.clear_route_cache()
         self.is_initialized = True
 
     def add(self, other, no_intersect=True):
@@ -101,6 +103,7 @@ class NodeRoadNetwork(BaseRoadNetwork):
         self.graph.update(copy.copy(other.graph))
 
         self.update_decoration_lanes(dec_lanes)
+        self.clear_route_cache()
         return self
 
     def __isub__(self, other):
@@ -112,6 +115,7 @@ class NodeRoadNetwork(BaseRoadNetwork):
             for lane in other.graph[Decoration.start][Decoration.end]:
                 if lane in self.graph[Decoration.start][Decoration.end]:
                     self.graph[Decoration.start][Decoration.end].remove(lane)
+        self.clear_route_cache()
         return self
 
     def get_all_decoration_lanes(self) -> List:
@@ -129,6 +133,7 @@ class NodeRoadNetwork(BaseRoadNetwork):
 
     def clear(self):
         self.graph.clear()
+        self.clear_route_cache()
 
     def get_positive_lanes(self):
         """
@@ -189,6 +194,7 @@ class NodeRoadNetwork(BaseRoadNetwork):
         ret = self.graph[road.start_node].pop(road.end_node)
         if len(self.graph[road.start_node]) == 0:
             self.graph.pop(road.start_node)
+        self.clear_route_cache()
         return ret
 
     def add_road(self, road, lanes: List):
@@ -198,6 +204,7 @@ class NodeRoadNetwork(BaseRoadNetwork):
         if road.end_node not in self.graph[road.start_node]:
             self.graph[road.start_node][road.end_node] = []
         self.graph[road.start_node][road.end_node] += lanes
+        self.clear_route_cache()
 
     def add_lane(self, _from: str, _to: str, lane: AbstractLane) -> None:
         """
@@ -212,6 +219,7 @@ class NodeRoadNetwork(BaseRoadNetwork):
         if _to not in self.graph[_from]:
             self.graph[_from][_to] = []
         self.graph[_from][_to].append(lane)
+        self.clear_route_cache()
 
     def _init_graph_helper(self):
         self._graph_helper = GraphLookupTable(self.graph, self.debug)
@@ -247,9 +255,9 @@ class NodeRoadNetwork(BaseRoadNetwork):
         :param goal: goal node
         :return: list of paths from start to goal.
         """
-        queue = [(start, [start])]
+        queue = deque([(start, [start])])
         while queue:
-            (node, path) = queue.pop(0)
+            (node, path) = queue.popleft()
             if node not in self.graph:
                 yield []
             for _next in set(self.graph[node].keys()) - set(path):
@@ -260,15 +268,19 @@ class NodeRoadNetwork(BaseRoadNetwork):
 
     def shortest_path(self, start: str, goal: str) -> List[str]:
         """
-        Breadth-first search of shortest checkpoints from start to goal.
+        Search the shortest checkpoints from start to goal, weighted by the road length.
 
-        :param start: starting node
+        :param start: starting lane index
         :param goal: goal node
         :return: shortest checkpoints from start to goal.
         """
         start_road_node = start[0]
         assert start != goal
-        return next(self.bfs_paths(start_road_node, goal), [])
+        return self.search_path(start_road_node, goal)
+
+    def get_successors(self, node):
+        for _next, lanes in self.graph.get(node, {}).items():
+            yield _next, lanes[0].length if len(lanes) > 0 else 0
 
     def get_map_features(self, interval=2):
         from metadrive.type import MetaDriveType
@@ -8,6 +8,7 @@ from metadrive.component.road_network.edge_road_network import EdgeRoadNetwork
 from metadrive.constants import DrivableAreaProperty
 from metadrive.constants import PGLineType, PGLineColor
 from metadrive.engine.engine_utils import get_engine
+from metadrive.engine.scene_cull import SceneCull
 from metadrive.scenario.scenario_description import ScenarioDescription
 from metadrive.type import MetaDriveType
 from metadrive.utils.coordinates_shift import panda_heading
@@ -17,11 +18,35 @@ from metadrive.utils.math import norm
 
 class ScenarioBlock(BaseBlock):
     LINE_CULL_DIST = 500
+    # lane lines are cut into pieces with this number of segments when they are built lazily
+    LAZY_LINE_PIECE_SEGMENTS = 32
 
-    def __init__(self, block_index: int, global_network, random_seed, map_index, need_lane_localization):
+    def __init__(
+        self,
+        block_index: int,
+        global_network,
+        random_seed,
+        map_index,
+        need_lane_localization,
+        map_features=None,
+        construction_radius=None
+    ):
+        """
+        :param map_features: the map features to build in this block. Build all map features of the scenario if None
+        :param construction_radius: if set, lanes and lane lines are built only when agents are within this distance,
+        see create_nearby_in_world(). Otherwise, all of them are built in create_in_world()
+        """
         # self.map_data = map_data
         self.need_lane_localization = need_lane_localization
         self.map_index = map_index
+        self._map_features = map_features
+        self.construction_radius = construction_radius
+        # lanes and line pieces not built yet, and their bounding boxes (x_min, x_max, y_min, y_max)
+        self._pending_items = None
+        self._pending_bounding_boxes = None
+        self._items_to_build = None
+        # lanes spanning several map tiles are added to the road network by the first tile, and built in every tile
+        self._shared_lane_ids = []
         data = self.engine.data_manager.current_scenario
         sdc_track = data.get_sdc_track()
         self.sdc_start_point = sdc_track["state"]["position"][0]
@@ -32,12 +57,21 @@ class ScenarioBlock(BaseBlock):
         e = get_engine()
         return e.data_manager.get_scenario(self.map_index, should_copy=False)["map_features"]
 
+    @property
+    def block_map_features(self):
+        return self.map_data if self._map_features is None else self._map_features
+
     def _sample_topology(self) -> bool:
-        for lane_id, data in self.map_data.items():
+        lane_table = self.engine.data_manager.get_lane_table(self.map_index)
+        self._shared_lane_ids = []
+        for lane_id, data in self.block_map_features.items():
             if MetaDriveType.is_lane(data.get("type", False)):
                 if len(data[ScenarioDescription.POLYLINE]) <= 1:
                     continue
-                lane = ScenarioLane(lane_id, self.map_data, self.need_lane_localization)
+                if lane_id in self._global_network.graph:
+                    self._shared_lane_ids.append(lane_id)
+                    continue
+                lane = ScenarioLane(lane_id, self.map_data, self.need_lane_localization, lane_table)
                 self.block_network.add_lane(lane)
         return True
 
@@ -45,78 +79,169 @@ class ScenarioBlock(BaseBlock):
         """
         The lane line should be created separately
         """
-        graph = self.block_network.graph
-        for id, lane_info in graph.items():
-            lane = lane_info.lane
+        if self.construction_radius is None:
+            lane_ids = list(self.block_network.graph.keys()) + self._shared_lane_ids
+            lines = self._get_lines()
+        else:
+            if self._pending_items is None:
+                # the first call from construct_block() builds lanes and lines around the ego car
+                self._init_pending_items()
+                self._select_items_to_build([self.sdc_start_point])
+            lane_ids = [key for kind, key in self._items_to_build if kind == "lane"]
+            lines = [key for kind, key in self._items_to_build if kind == "line"]
+            self._items_to_build = []
+
+        graph = self._global_network.graph
+        for id in lane_ids:
+            lane = graph[id].lane
+            num_lane_nodes = len(lane._node_path_list)
             lane.construct_lane_in_block(self, lane_index=id)
+            # nodes are owned by the block, as a lane spanning several map tiles is built and cleared in each of them
+            self._node_path_list.extend(lane._node_path_list[num_lane_nodes:])
+            del lane._node_path_list[num_lane_nodes:]
             # lane.construct_lane_line_in_block(self, [True if len(lane.left_lanes) == 0 else False,
             #                                          True if len(lane.right_lanes) == 0 else False, ])
         # draw
-        for lane_id, data in self.map_data.items():
+        for color, line_type, segments in lines:
+            self._construct_line_segments(segments, color, line_type)
+
+    def _get_lines(self):
+        """
+        Lane lines and road edges to draw in this block
+        :return: a list of (color, line type, segments), where segments are (start, end) points of line segments
+        """
+        ret = []
+        for data in self.block_map_features.values():
             type = data.get("type", None)
-            if ScenarioDescription.POLYLINE in data and len(data[ScenarioDescription.POLYLINE]) <= 1:
+            if ScenarioDescription.POLYLINE not in data or len(data[ScenarioDescription.POLYLINE]) <= 1:
                 continue
+            polyline = np.asarray(data[ScenarioDescription.POLYLINE])
             if MetaDriveType.is_road_line(type):
-                if MetaDriveType.is_broken_line(type):
-                    self.construct_broken_line(
-                        np.asarray(data[ScenarioDescription.POLYLINE]),
-                        PGLineColor.YELLOW if MetaDriveType.is_yellow_line(type) else PGLineColor.GREY
-                    )
-                else:
-                    self.construct_continuous_line(
-                        np.asarray(data[ScenarioDescription.POLYLINE]),
-                        PGLineColor.YELLOW if MetaDriveType.is_yellow_line(type) else PGLineColor.GREY
-                    )
-            # elif MetaDriveType.is_road_edge(type) and MetaDriveType.is_sidewalk(type):
-            #     self.construct_sidewalk(
-            #         convert_polyline_to_metadrive(
-            #             data[ScenarioDescription.POLYLINE], coordinate_transform=self.coordinate_transform
-            #         )
-            #     )
-            # elif MetaDriveType.is_road_edge(type) and not MetaDriveType.is_sidewalk(type):
-            #     self.construct_continuous_line(
-            #         convert_polyline_to_metadrive(
-            #             data[ScenarioDescription.POLYLINE], coordinate_transform=self.coordinate_transform
-            #         ), PGLineColor.GREY
-            #     )
-            # else:
-            #     raise ValueError("Can not build lane line type: {}".format(type))
-            # TODO LQY: DO we need sidewalk?
+                color = PGLineColor.YELLOW if MetaDriveType.is_yellow_line(type) else PGLineColor.GREY
+                line_type = PGLineType.BROKEN if MetaDriveType.is_broken_line(type) else PGLineType.CONTINUOUS
             elif MetaDriveType.is_road_edge(type):
-                self.construct_continuous_line(np.asarray(data[ScenarioDescription.POLYLINE]), color=PGLineColor.GREY)
-
-    def construct_continuous_line(self, polyline, color):
-        line = InterpolatingLine(polyline)
-        segment_num = int(line.length / DrivableAreaProperty.STRIPE_LENGTH)
-        for segment in range(segment_num):
-            start = line.get_point(DrivableAreaProperty.STRIPE_LENGTH * segment)
-            # trick for optimizing
-            dist = norm(start[0] - self.sdc_start_point[0], start[1] - self.sdc_start_point[1])
-            if dist > self.LINE_CULL_DIST:
+                # TODO LQY: DO we need sidewalk?
+                color, line_type = PGLineColor.GREY, PGLineType.CONTINUOUS
+            else:
                 continue
+            ret.append((color, line_type, self._get_line_segments(polyline, line_type)))
+        return ret
 
-            if segment == segment_num - 1:
-                end = line.get_point(line.length)
-            else:
-                end = line.get_point((segment + 1) * DrivableAreaProperty.STRIPE_LENGTH)
-            node_path_list = ScenarioLane.construct_lane_line_segment(self, start, end, color, PGLineType.CONTINUOUS)
-            self._node_path_list.extend(node_path_list)
+    def _init_pending_items(self):
+        """
+        Collect lanes and line pieces to build lazily. Lines are cut into pieces, as a road edge can be hundreds of meters
+        long, while only the part close to agents is needed
+        """
+        items = []
+        bounding_boxes = []
+        for id, lane_info in self.block_network.graph.items():
+            x_max, x_min, y_max, y_min = lane_info.lane.get_bounding_box()
+            items.append(("lane", id))
+            bounding_boxes.append((x_min, x_max, y_min, y_max))
+        for color, line_type, segments in self._get_lines():
+            # segments are grouped into pieces, so that lines are the same as those built at once
+            for start in range(0, len(segments), self.LAZY_LINE_PIECE_SEGMENTS):
+                piece = segments[start:start + self.LAZY_LINE_PIECE_SEGMENTS]
+                points = np.asarray(piece).reshape(-1, 2)
+                items.append(("line", (color, line_type, piece)))
+                bounding_boxes.append(
+                    (np.min(points[:, 0]), np.max(points[:, 0]), np.min(points[:, 1]), np.max(points[:, 1]))
+                )
+        self._pending_items = items
+        self._pending_bounding_boxes = np.asarray(bounding_boxes, dtype=float).reshape(-1, 4)
+
+    def _select_items_to_build(self, positions):
+        """
+        Move pending items within the construction radius of positions to self._items_to_build
+        :return: number of items to build
+        """
+        if len(self._pending_items) == 0:
+            self._items_to_build = []
+            return 0
+        distances = SceneCull.distances_to_bounding_boxes(self._pending_bounding_boxes, positions)
+        nearby = distances <= self.construction_radius
+        self._items_to_build = [item for item, build in zip(self._pending_items, nearby) if build]
+        self._pending_items = [item for item, build in zip(self._pending_items, nearby) if not build]
+        self._pending_bounding_boxes = self._pending_bounding_boxes[~nearby]
+        return len(self._items_to_build)
+
+    def create_nearby_in_world(self, positions, physics_world):
+        """
+        Build pending lanes and lines within the construction radius of agents. They are built with new NodePaths, and
+        their bodies are attached to the physics world immediately if the block is attached
+        :param positions: positions of agents
+        :param physics_world: PhysicsWorld
+        :return: number of lanes and line pieces built in this call
+        """
+        if self._pending_items is None or len(positions) == 0 or self._select_items_to_build(positions) == 0:
+            return 0
+        num_items = len(self._items_to_build)
+        num_static_nodes, num_dynamic_nodes = len(self.static_nodes), len(self.dynamic_nodes)
+        self._create_in_world()
+        if self.static_nodes.attached:
+            for node in self.static_nodes[num_static_nodes:]:
+                physics_world.static_world.attach(node)
+        if self.dynamic_nodes.attached:
+            for node in self.dynamic_nodes[num_dynamic_nodes:]:
+                physics_world.dynamic_world.attach(node)
+        return num_items
+
+    @property
+    def num_pending_items(self):
+        return 0 if self._pending_items is None else len(self._pending_items)
+
+    def construct_continuous_line(self, polyline, color):
+        self._construct_line_segments(
+            self._get_line_segments(polyline, PGLineType.CONTINUOUS), color, PGLineType.CONTINUOUS
+        )
 
     def construct_broken_line(self, polyline, color):
+        self._construct_line_segments(self._get_line_segments(polyline, PGLineType.BROKEN), color, PGLineType.BROKEN)
+
+    @staticmethod
+    def _get_line_segments(polyline, line_type):
+        """
+        Split a line into segments with the stripe length. Broken lines have a gap after each segment
+        :return: a list of (start, end) points
+        """
         line = InterpolatingLine(polyline)
-        segment_num = int(line.length / (2 * DrivableAreaProperty.STRIPE_LENGTH))
-        for segment in range(segment_num):
-            start = line.get_point(segment * DrivableAreaProperty.STRIPE_LENGTH * 2)
-            # trick for optimizing
-            dist = norm(start[0] - self.sdc_start_point[0], start[1] - self.sdc_start_point[1])
-            if dist > self.LINE_CULL_DIST:
+        segments = []
+        if line_type == PGLineType.BROKEN:
+            segment_num = int(line.length / (2 * DrivableAreaProperty.STRIPE_LENGTH))
+            for segment in range(segment_num):
+                start = line.get_point(segment * DrivableAreaProperty.STRIPE_LENGTH * 2)
+                end = line.get_point(
+                    segment * DrivableAreaProperty.STRIPE_LENGTH * 2 + DrivableAreaProperty.STRIPE_LENGTH
+                )
+                if segment == segment_num - 1:
+                    end = line.get_point(line.length - DrivableAreaProperty.STRIPE_LENGTH)
+                segments.append((start, end))
+        else:
+            segment_num = int(line.length / DrivableAreaProperty.STRIPE_LENGTH)
+            for segment in range(segment_num):
+                start = line.get_point(DrivableAreaProperty.STRIPE_LENGTH * segment)
+                if segment == segment_num - 1:
+                    end = line.get_point(line.length)
+                else:
+                    end = line.get_point((segment + 1) * DrivableAreaProperty.STRIPE_LENGTH)
+                segments.append((start, end))
+        return segments
+
+    def _construct_line_segments(self, segments, color, line_type):
+        for start, end in segments:
+            if self._cull_line_segment(start):
                 continue
-            end = line.get_point(segment * DrivableAreaProperty.STRIPE_LENGTH * 2 + DrivableAreaProperty.STRIPE_LENGTH)
-            if segment == segment_num - 1:
-                end = line.get_point(line.length - DrivableAreaProperty.STRIPE_LENGTH)
-            node_path_list = ScenarioLane.construct_lane_line_segment(self, start, end, color, PGLineType.BROKEN)
+            node_path_list = ScenarioLane.construct_lane_line_segment(self, start, end, color, line_type)
             self._node_path_list.extend(node_path_list)
 
+    def _cull_line_segment(self, point):
+        # trick for optimizing. Lines in map tiles or built lazily are always built, as they are close to agents
+        eager = self._map_features is None and self.construction_radius is None
+        return eager and self._far_from_sdc_start_point(point)
+
+    def _far_from_sdc_start_point(self, point):
+        return norm(point[0] - self.sdc_start_point[0], point[1] - self.sdc_start_point[1]) > self.LINE_CULL_DIST
+
     def construct_sidewalk(self, polyline):
         line = InterpolatingLine(polyline)
         seg_len = DrivableAreaProperty.LANE_SEGMENT_LENGTH
@@ -155,6 +280,10 @@ class ScenarioBlock(BaseBlock):
 
     def destroy(self):
         self.map_index = None
+        self._pending_items = None
+        self._pending_bounding_boxes = None
+        self._items_to_build = None
+        self._shared_lane_ids = []
         # self.map_data = None
         super(ScenarioBlock, self).destroy()
 
@@ -32,11 +32,20 @@ class TrafficObject(BaseStaticObject):
         assert self.CLASS_NAME is not None, "Assign a name for this class for finding it easily"
         super(TrafficObject, self).__init__(position, heading_theta, lane, random_seed, name=name)
         self.crashed = False
+        # the instance of the model shared by objects of this class
+        self._instance = None
 
     def reset(self, position, heading_theta, lane=None, random_seed=None, name=None, *args, **kwargs):
         self.crashed = False
         super(TrafficObject, self).reset(position, heading_theta, lane, random_seed, name, *args, **kwargs)
 
+    def destroy(self):
+        # the origin keeps its children until this object is released, so the shared model is detached first
+        if self._instance is not None:
+            self._instance.detachNode()
+            self._instance = None
+        super(TrafficObject, self).destroy()
+
 
 class TrafficCone(TrafficObject):
     """Placed near the construction section to indicate that traffic is prohibited"""
@@ -46,6 +55,8 @@ class TrafficCone(TrafficObject):
     MASS = 2
     CLASS_NAME = MetaDriveType.TRAFFIC_CONE
 
+    MODEL = None
+
     def __init__(self, position, heading_theta, lane=None, static: bool = False, random_seed=None, name=None):
         super(TrafficCone, self).__init__(position, heading_theta, lane, random_seed, name)
 
@@ -55,10 +66,12 @@ class TrafficCone(TrafficObject):
         self.body.addShape(BulletCylinderShape(self.RADIUS, self.HEIGHT))
         self.set_static(static)
         if self.render:
-            model = self.loader.loadModel(AssetLoader.file_path("models", "traffic_cone", "scene.gltf"))
-            model.setScale(0.02, 0.02, 0.025)
-            model.setPos(0, 0, -self.HEIGHT / 2 + 0.05)
-            model.reparentTo(self.origin)
+            if TrafficCone.MODEL is None:
+                model = self.loader.loadModel(AssetLoader.file_path("models", "traffic_cone", "scene.gltf"))
+                model.setScale(0.02, 0.02, 0.025)
+                model.setPos(0, 0, -self.HEIGHT / 2 + 0.05)
+                TrafficCone.MODEL = model
+            self._instance = TrafficCone.MODEL.instanceTo(self.origin)
 
     @property
     def top_down_length(self):
@@ -88,6 +101,8 @@ class TrafficWarning(TrafficObject):
     MASS = 1
     RADIUS = 0.5
 
+    MODEL = None
+
     def __init__(self, position, heading_theta, lane=None, static: bool = False, random_seed=None, name=None):
         super(TrafficWarning, self).__init__(position, heading_theta, lane, random_seed, name)
 
@@ -97,11 +112,13 @@ class TrafficWarning(TrafficObject):
         self.body.addShape(BulletCylinderShape(self.RADIUS, self.HEIGHT))
         self.set_static(static)
         if self.render:
-            model = self.loader.loadModel(AssetLoader.file_path("models", "warning", "warning.gltf"))
-            model.setScale(0.02)
-            model.setH(-90)
-            model.setPos(0, 0, -self.HEIGHT / 2 - 0.1)
-            model.reparentTo(self.origin)
+            if TrafficWarning.MODEL is None:
+                model = self.loader.loadModel(AssetLoader.file_path("models", "warning", "warning.gltf"))
+                model.setScale(0.02)
+                model.setH(-90)
+                model.setPos(0, 0, -self.HEIGHT / 2 - 0.1)
+                TrafficWarning.MODEL = model
+            self._instance = TrafficWarning.MODEL.instanceTo(self.origin)
 
     @property
     def top_down_length(self):
@@ -127,6 +144,8 @@ class TrafficBarrier(TrafficObject):
     MASS = 10
     CLASS_NAME = MetaDriveType.TRAFFIC_BARRIER
 
+    MODEL = None
+
     def __init__(self, position, heading_theta, lane=None, static: bool = False, random_seed=None, name=None):
         super(TrafficBarrier, self).__init__(position, heading_theta, lane, random_seed, name)
         n = BaseRigidBodyNode(self.name, self.CLASS_NAME)
@@ -135,11 +154,13 @@ class TrafficBarrier(TrafficObject):
         self.body.addShape(BulletBoxShape((self.WIDTH / 2, self.LENGTH / 2, self.height / 2)))
         self.set_static(static)
         if self.render:
-            model = self.loader.loadModel(AssetLoader.file_path("models", "barrier", "scene.gltf"))
-            model.setH(-90)
-            model.setPos(0, 0, -0.93)
-            model.setScale(0.7)
-            model.reparentTo(self.origin)
+            if TrafficBarrier.MODEL is None:
+                model = self.loader.loadModel(AssetLoader.file_path("models", "barrier", "scene.gltf"))
+                model.setH(-90)
+                model.setPos(0, 0, -0.93)
+                model.setScale(0.7)
+                TrafficBarrier.MODEL = model
+            self._instance = TrafficBarrier.MODEL.instanceTo(self.origin)
 
     @property
     def LENGTH(self):
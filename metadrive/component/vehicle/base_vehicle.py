@@ -4,7 +4,6 @@ from collections import deque
 from typing import Union, Optional
 
 import numpy as np
-import seaborn as sns
 from panda3d._rplight import RPSpotLight
 from panda3d.bullet import BulletVehicle, BulletBoxShape, ZUp
 from panda3d.core import Material, Vec3, TransformState
@@ -24,7 +23,7 @@ from metadrive.component.vehicle_module.mini_map import MiniMap
 from metadrive.component.vehicle_module.rgb_camera import RGBCamera
 from metadrive.component.vehicle_navigation_module.edge_network_navigation import EdgeNetworkNavigation
 from metadrive.component.vehicle_navigation_module.node_network_navigation import NodeNetworkNavigation
-from metadrive.constants import MetaDriveType, CollisionGroup
+from metadrive.constants import MetaDriveType, CollisionGroup, COLORBLIND_PALETTE
 from metadrive.engine.asset_loader import AssetLoader
 from metadrive.engine.core.image_buffer import ImageBuffer
 from metadrive.engine.engine_utils import get_engine, engine_initialized
@@ -34,6 +33,7 @@ from metadrive.utils.math import get_vertical_vector, norm, clip
 from metadrive.utils.math import wrap_to_pi
 from metadrive.utils.pg.utils import rect_region_detection
 from metadrive.utils.utils import get_object_from_node
+from metadrive.utils.step_info import InfoLevel
 
 
 class BaseVehicleState:
@@ -144,6 +144,7 @@ class BaseVehicle(BaseObject, BaseVehicleState):
         self.add_body(vehicle_chassis.getChassis())
         self.system = vehicle_chassis
         self.chassis = self.origin
+        self._wheel_models = []
         self.wheels = self._create_wheel()
 
         # light experimental!
@@ -323,6 +324,9 @@ class BaseVehicle(BaseObject, BaseVehicleState):
         step_energy, episode_energy = self._update_energy_consumption()
         self.out_of_route = self._out_of_route()
         step_info = self._update_overtake_stat()
+        if self.engine.global_config["info_level"] != InfoLevel.FULL:
+            # the info will be dropped by the env
+            return step_info
         my_policy = self.engine.get_policy(self.name)
         step_info.update(
             {
@@ -541,10 +545,12 @@ class BaseVehicle(BaseObject, BaseVehicleState):
 
     def _apply_throttle_brake(self, throttle_brake):
         max_engine_force = self.config["max_engine_force"]
-        max_brake_force = self.config["max_brake_force"]
+        # brakes are impulses applied in each physics step, so they are scaled with the step size
+        brake_scale = self.engine.physics_step_size / self.engine.global_config["physics_world_step_size"]
+        max_brake_force = self.config["max_brake_force"] * brake_scale
         for wheel_index in range(4):
             if throttle_brake >= 0:
-                self.system.setBrake(2.0, wheel_index)
+                self.system.setBrake(2.0 * brake_scale, wheel_index)
                 if self.speed_km_h > self.max_speed_km_h:
                     self.system.applyEngineForce(0.0, wheel_index)
                 else:
@@ -668,7 +674,13 @@ class BaseVehicle(BaseObject, BaseVehicleState):
         physics_world = get_engine().physics_world
         vehicle_chassis = BulletVehicle(physics_world.dynamic_world, chassis)
         vehicle_chassis.setCoordinateSystem(ZUp)
-        self.dynamic_nodes.append(vehicle_chassis)
+        if self.config["dynamics_model"] == "bullet":
+            self.dynamic_nodes.append(vehicle_chassis)
+        else:
+            # moved by VehicleDynamicsManager, and the raycast vehicle is not added to the physics world
+            assert self.config["dynamics_model"] == "kinematic_bicycle", \
+                "Unknown dynamics model: {}".format(self.config["dynamics_model"])
+            chassis.setKinematic(True)
         return vehicle_chassis
 
     def _add_visualization(self):
@@ -723,10 +735,15 @@ class BaseVehicle(BaseObject, BaseVehicleState):
         if self.render:
             model = 'right_tire_front.gltf' if front else 'right_tire_back.gltf'
             model_path = AssetLoader.file_path("models", os.path.dirname(self.path[0]), model)
-            wheel_model = self.loader.loadModel(model_path)
-            wheel_model.setTwoSided(self.TIRE_TWO_SIDED)
-            wheel_model.reparentTo(wheel_np)
-            wheel_model.set_scale(1 * self.TIRE_MODEL_CORRECT if left else -1 * self.TIRE_MODEL_CORRECT)
+            scale = 1 * self.TIRE_MODEL_CORRECT if left else -1 * self.TIRE_MODEL_CORRECT
+            # wheels sharing the same model and transform are instances of one node
+            key = (model_path, self.TIRE_TWO_SIDED, scale)
+            if key not in BaseVehicle.model_collection:
+                wheel_model = self.loader.loadModel(model_path)
+                wheel_model.setTwoSided(self.TIRE_TWO_SIDED)
+                wheel_model.set_scale(scale)
+                BaseVehicle.model_collection[key] = wheel_model
+            self._wheel_models.append(BaseVehicle.model_collection[key].instanceTo(wheel_np))
         wheel = self.system.create_wheel()
         wheel.setNode(wheel_np.node())
         wheel.setChassisConnectionPointCs(pos)
@@ -856,6 +873,10 @@ class BaseVehicle(BaseObject, BaseVehicleState):
         self.contact_results.update(contacts)
 
     def destroy(self):
+        # wheel nodes are cleaned recursively, so shared wheel models are detached first
+        for wheel_model in self._wheel_models:
+            wheel_model.detachNode()
+        self._wheel_models = []
         super(BaseVehicle, self).destroy()
         if self.navigation is not None:
             self.navigation.destroy()
@@ -1060,8 +1081,7 @@ class BaseVehicle(BaseObject, BaseVehicleState):
     def panda_color(self):
         c = super(BaseVehicle, self).panda_color
         if self._use_special_color:
-            color = sns.color_palette("colorblind")
-            rand_c = color[2]  # A pretty green
+            rand_c = COLORBLIND_PALETTE[2]  # A pretty green
             c = rand_c
         return c
 
@@ -49,3 +49,35 @@ class BicycleModel:
         new_state = dict(x=new_x, y=new_y, speed=new_v, heading_theta=new_phi, velocity_dir=new_beta)
         self.state = new_state
         return new_state
+
+
+class KinematicBicycleModel:
+    """
+    Vectorized kinematic bicycle model. It advances the states of a batch of vehicles together, so all arguments
+    except dt are arrays with one entry for each vehicle. Angles are in radian and the speed is signed, which is
+    negative when reversing
+    """
+    @staticmethod
+    def slip_angle(steering, front_wheelbase, rear_wheelbase):
+        """
+        Angle between the velocity at the center of mass and the heading
+        """
+        return np.arctan(rear_wheelbase / (front_wheelbase + rear_wheelbase) * np.tan(steering))
+
+    @staticmethod
+    def step(x, y, heading, speed, steering, drive, resistance, max_speed, front_wheelbase, rear_wheelbase, dt):
+        """
+        Advance the states for dt
+        :param drive: acceleration from the engine, which is ignored when driving forward faster than max_speed
+        :param resistance: non-negative deceleration from brakes and rolling, which can not reverse the motion
+        :return: new x, y, heading, speed
+        """
+        beta = KinematicBicycleModel.slip_angle(steering, front_wheelbase, rear_wheelbase)
+        new_x = x + speed * np.cos(heading + beta) * dt
+        new_y = y + speed * np.sin(heading + beta) * dt
+        new_heading = heading + speed / rear_wheelbase * np.sin(beta) * dt
+
+        drive = np.where((speed > max_speed) & (drive > 0), 0., drive)
+        new_speed = speed + drive * dt
+        new_speed = np.sign(new_speed) * np.maximum(np.abs(new_speed) - resistance * dt, 0.)
+        return new_x, new_y, new_heading, new_speed
@@ -1,18 +1,8 @@
 import numpy as np
 import logging
 
-from metadrive.utils.cuda import check_cudart_err
-
-_cuda_enable = True
-try:
-    import cupy as cp
-    from OpenGL.GL import GL_TEXTURE_2D  # noqa F403
-    from cuda import cudart
-    from cuda.cudart import cudaGraphicsRegisterFlags
-    from panda3d.core import GraphicsOutput, Texture, GraphicsStateGuardianBase, DisplayRegionDrawCallbackData
-except ImportError:
-    _cuda_enable = False
-from panda3d.core import Vec3
+from metadrive.utils.cuda import check_cudart_err, cuda_available, cp, cudart, GL
+from panda3d.core import Vec3, GraphicsOutput, Texture, GraphicsStateGuardianBase, DisplayRegionDrawCallbackData
 
 from metadrive.engine.core.image_buffer import ImageBuffer
 
@@ -56,7 +46,7 @@ class BaseCamera(ImageBuffer):
                 )
             self.cuda_graphics_resource = None
             if self.enable_cuda:
-                assert _cuda_enable, "Can not enable cuda rendering pipeline"
+                assert cuda_available(), "Can not enable cuda rendering pipeline"
 
                 # returned tensor property
                 self.cuda_dtype = np.uint8
@@ -211,8 +201,8 @@ class BaseCamera(ImageBuffer):
             return type(self)._singleton.cuda_graphics_resource
         type(self)._singleton.cuda_graphics_resource = check_cudart_err(
             cudart.cudaGraphicsGLRegisterImage(
-                type(self)._singleton.cuda_texture_identifier, GL_TEXTURE_2D,
-                cudaGraphicsRegisterFlags.cudaGraphicsRegisterFlagsReadOnly
+                type(self)._singleton.cuda_texture_identifier, GL.GL_TEXTURE_2D,
+                cudart.cudaGraphicsRegisterFlags.cudaGraphicsRegisterFlagsReadOnly
             )
         )
         return type(self)._singleton.cuda_graphics_resource
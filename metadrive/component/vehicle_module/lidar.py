@@ -108,13 +108,13 @@ class Lidar(DistanceDetector):
 
         return res
 
-    def _get_lidar_mask(self, vehicle):
+    def _get_lidar_mask(self, vehicle, objs=None):
         pos1 = vehicle.position
         head1 = vehicle.heading_theta
 
         mask = np.zeros((self.num_lasers, ), dtype=bool)
         mask.fill(False)
-        objs = self.get_surrounding_objects(vehicle)
+        objs = self.get_surrounding_objects(vehicle) if objs is None else objs
         for obj in objs:
             pos2 = obj.position
             length = obj.LENGTH if hasattr(obj, "LENGTH") else vehicle.LENGTH
@@ -138,7 +138,87 @@ class Lidar(DistanceDetector):
 
         return mask, objs
 
-    def get_surrounding_objects(self, vehicle):
+    @classmethod
+    def perceive_batch(cls, vehicles, detector_mask=True):
+        """
+        Perceive for a batch of vehicles. The detected objects are resolved once for all vehicles and the detector masks
+        are computed in one vectorized pass, while the results are the same as calling perceive() for each vehicle
+        :param vehicles: a list of vehicles with lidar available
+        :param detector_mask: whether to use the detector mask
+        :return: a list of (cloud_points, detected_objects)
+        """
+        object_cache = {}
+        surrounding_objects = [v.lidar.get_surrounding_objects(v, object_cache) for v in vehicles]
+        num_lasers = set([v.lidar.num_lasers for v in vehicles])
+        if len(num_lasers) == 1:
+            masks = cls._get_lidar_masks(vehicles, surrounding_objects, num_lasers.pop())
+        else:
+            masks = [v.lidar._get_lidar_mask(v, objs)[0] for v, objs in zip(vehicles, surrounding_objects)]
+        ret = []
+        for v, mask, objs in zip(vehicles, masks, surrounding_objects):
+            lidar_mask = mask if detector_mask and v.lidar.enable_mask else None
+            cloud_points = DistanceDetector.perceive(v.lidar, v, v.engine.physics_world.dynamic_world, lidar_mask)[0]
+            ret.append((cloud_points, objs))
+        return ret
+
+    @staticmethod
+    def _get_lidar_masks(vehicles, surrounding_objects, num_lasers):
+        """
+        Vectorized version of _get_lidar_mask() for vehicles whose lidars have the same number of lasers
+        """
+        angle_delta = 360 / num_lasers
+        positions = {}
+        ego_index, pos1, head1, pos2, half_max_span_square = [], [], [], [], []
+        for i, (vehicle, objs) in enumerate(zip(vehicles, surrounding_objects)):
+            vehicle_pos = vehicle.position
+            vehicle_head = vehicle.heading_theta
+            for obj in objs:
+                if obj not in positions:
+                    positions[obj] = obj.position
+                length = obj.LENGTH if hasattr(obj, "LENGTH") else vehicle.LENGTH
+                width = obj.WIDTH if hasattr(obj, "WIDTH") else vehicle.WIDTH
+                ego_index.append(i)
+                pos1.append(vehicle_pos)
+                head1.append(vehicle_head)
+                pos2.append(positions[obj])
+                half_max_span_square.append(((length + width) / 2)**2)
+
+        # count how many objects cover each laser with a difference array, a laser is masked if it is covered
+        diff = np.zeros((len(vehicles), num_lasers + 1), dtype=int)
+        if len(ego_index) > 0:
+            np_err = np.seterr(divide="ignore", invalid="ignore")
+            ego_index = np.array(ego_index)
+            diff_pos = np.array(pos2, dtype=float) - np.array(pos1, dtype=float)
+            half_max_span_square = np.array(half_max_span_square)
+            dist_square = diff_pos[:, 0]**2 + diff_pos[:, 1]**2
+            inside = dist_square < half_max_span_square
+            span = np.arcsin(np.sqrt(half_max_span_square / dist_square))
+            head_in_1 = np.arctan2(diff_pos[:, 1], diff_pos[:, 0]) - np.array(head1)
+            small_angle = np.rad2deg(head_in_1 - span) % 360
+            large_angle = np.rad2deg(head_in_1 + span) % 360
+            small_index = np.floor(small_angle / angle_delta).astype(int)
+            large_index = np.minimum(np.ceil(large_angle / angle_delta).astype(int) + 1, num_lasers)
+            wrap = large_angle < small_angle
+
+            # the whole range is masked if the object is too close
+            start = np.where(inside, 0, small_index)
+            end = np.where(inside | wrap, num_lasers, large_index)
+            np.add.at(diff, (ego_index, start), 1)
+            np.add.at(diff, (ego_index, end), -1)
+            # for ranges like 355 deg to 5 deg, the part from 0 deg is added here
+            wrap = wrap & ~inside
+            np.add.at(diff, (ego_index[wrap], 0), 1)
+            np.add.at(diff, (ego_index[wrap], large_index[wrap]), -1)
+            np.seterr(**np_err)
+        return np.cumsum(diff, axis=1)[:, :num_lasers] > 0
+
+    def get_surrounding_objects(self, vehicle, object_cache=None):
+        """
+        Get objects around the vehicle with a broad phase contact test
+        :param vehicle: the ego vehicle
+        :param object_cache: a dict mapping node to object, which can be shared when querying for multiple vehicles
+        :return: a set of objects
+        """
         self.broad_detector.setPos(panda_vector(vehicle.position))
         physics_world = vehicle.engine.physics_world.dynamic_world
         contact_results = physics_world.contactTest(self.broad_detector.node(), True).getContacts()
@@ -148,7 +228,12 @@ class Lidar(DistanceDetector):
             node1 = contact.getNode1()
             nodes = [node0, node1]
             nodes.remove(self.broad_detector.node())
-            obj = get_object_from_node(nodes[0])
+            if object_cache is None:
+                obj = get_object_from_node(nodes[0])
+            else:
+                if nodes[0] not in object_cache:
+                    object_cache[nodes[0]] = get_object_from_node(nodes[0])
+                obj = object_cache[nodes[0]]
             if not isinstance(obj, AbstractLane) and obj is not None:
                 objs.add(obj)
         if vehicle in objs:
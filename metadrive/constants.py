@@ -254,6 +254,20 @@ OBJECT_TO_AGENT = "object_to_agent"
 AGENT_TO_OBJECT = "agent_to_object"
 BKG_COLOR = Vec3(1, 1, 1)
 
+# The "colorblind" palette of seaborn. It is hard-coded here, as importing seaborn is slow
+COLORBLIND_PALETTE = [
+    (0.00392156862745098, 0.45098039215686275, 0.6980392156862745),
+    (0.8705882352941177, 0.5607843137254902, 0.0196078431372549),
+    (0.00784313725490196, 0.6196078431372549, 0.45098039215686275),
+    (0.8352941176470589, 0.3686274509803922, 0.0),
+    (0.8, 0.47058823529411764, 0.7372549019607844),
+    (0.792156862745098, 0.5686274509803921, 0.3803921568627451),
+    (0.984313725490196, 0.6862745098039216, 0.8941176470588236),
+    (0.5803921568627451, 0.5803921568627451, 0.5803921568627451),
+    (0.9254901960784314, 0.8823529411764706, 0.2),
+    (0.33725490196078434, 0.7058823529411765, 0.9137254901960784),
+]
+
 
 class PGLineType:
     """A lane side line type."""
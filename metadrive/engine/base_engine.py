@@ -10,9 +10,12 @@ from panda3d.core import NodePath, Vec3
 from metadrive.base_class.randomizable import Randomizable
 from metadrive.engine.core.engine_core import EngineCore
 from metadrive.engine.interface import Interface
+from metadrive.engine.object_pool import ObjectPool
+from metadrive.engine.physics_step_scheduler import PhysicsStepScheduler
 from metadrive.manager.base_manager import BaseManager
 from metadrive.utils import concat_step_infos
 from metadrive.utils.utils import is_map_related_class
+from metadrive.utils.step_info import InfoLevel
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +49,10 @@ class BaseEngine(EngineCore, Randomizable):
         # cull scene
         self.cull_scene = self.global_config["cull_scene"]
 
+        # physics steps of the current env step, which are chosen in before_step()
+        self.physics_step_size = self.global_config["physics_world_step_size"]
+        self._num_physics_steps = None
+
         # add camera or not
         self.main_camera = self.setup_main_camera()
 
@@ -54,7 +61,10 @@ class BaseEngine(EngineCore, Randomizable):
         self._object_tasks = dict()
 
         # the clear function is a fake clear, objects cleared is stored for future use
-        self._dying_objects = dict()
+        self._object_pool = ObjectPool(
+            self.global_config["num_buffering_objects"], self.global_config["object_pool_trim_window"]
+        )
+        self._object_pool_prefilled = False
 
         # store external actions
         self.external_actions = None
@@ -127,7 +137,7 @@ class BaseEngine(EngineCore, Randomizable):
         Call this func to spawn one object
         :param object_class: object class
         :param pbr_model: if the visualization model is pbr model
-        :param force_spawn: spawn a new object instead of fetching from _dying_objects list
+        :param force_spawn: spawn a new object instead of fetching from the object pool
         :param auto_fill_random_seed: whether to set random seed using purely random integer
         :param record: record the spawn information
         :param kwargs: class init parameters
@@ -135,11 +145,10 @@ class BaseEngine(EngineCore, Randomizable):
         """
         if ("random_seed" not in kwargs) and auto_fill_random_seed:
             kwargs["random_seed"] = self.generate_seed()
-        if force_spawn or object_class.__name__ not in self._dying_objects or len(
-                self._dying_objects[object_class.__name__]) == 0:
+        obj = None if force_spawn else self._object_pool.get(object_class.__name__)
+        if obj is None:
             obj = object_class(**kwargs)
         else:
-            obj = self._dying_objects[object_class.__name__].pop()
             obj.reset(**kwargs)
             if not is_map_related_class(object_class) and ("name" not in kwargs or kwargs["name"] is None):
                 obj.random_rename()
@@ -152,9 +161,48 @@ class BaseEngine(EngineCore, Randomizable):
         if self.global_config["record_episode"] and not self.replay_episode and record:
             self.record_manager.add_spawn_info(obj, object_class, kwargs)
         self._spawned_objects[obj.id] = obj
+        self._object_pool.on_spawn(obj.class_name)
         obj.attach_to_world(self.pbr_worldNP if pbr_model else self.worldNP, self.physics_world)
         return obj
 
+    def get_object_pool_statistics(self):
+        """
+        Return a dict mapping each class name to statistics of its object pool
+        """
+        return self._object_pool.get_statistics()
+
+    def _prefill_object_pool(self):
+        """
+        Create objects in config["object_pool_prefill"] in advance and store them in the object pool, so that they are
+        not created for the first time when resetting or stepping the env. It is done after the first reset, as vehicles
+        can only be created on a map
+        """
+        self._object_pool_prefilled = True
+        prefill = self.global_config["object_pool_prefill"]
+        if not prefill:
+            return
+        from metadrive.base_class.base_object import BaseObject
+        from metadrive.component.vehicle.base_vehicle import BaseVehicle
+        classes = {}
+        subclasses = [BaseObject]
+        while subclasses:
+            object_class = subclasses.pop()
+            classes.setdefault(object_class.__name__, object_class)
+            subclasses += object_class.__subclasses__()
+        for class_name, number in prefill:
+            assert class_name in classes, "Can not find object class: {}".format(class_name)
+            object_class = classes[class_name]
+            self._object_pool.set_prefill_size(class_name, number)
+            number = min(number, self.global_config["num_buffering_objects"]) - \
+                     self._object_pool.num_stored(class_name) - self._object_pool.num_alive(class_name)
+            if issubclass(object_class, BaseVehicle):
+                lane = self.current_map.road_network.get_all_lanes()[0]
+                kwargs = dict(vehicle_config=dict(spawn_lane_index=lane.index))
+            else:
+                kwargs = dict(position=[0, 0], heading_theta=0)
+            objs = [self.spawn_object(object_class, force_spawn=True, record=False, **kwargs) for _ in range(number)]
+            self.clear_objects([obj.id for obj in objs], record=False)
+
     def get_objects(self, filter: Optional[Union[Callable, List]] = None):
         """
         Return objects spawned, default all objects. Filter_func will be applied on all objects.
@@ -212,6 +260,7 @@ class BaseEngine(EngineCore, Randomizable):
                 policy = self._object_policies.pop(id)
                 policy.destroy()
             if force_destroy_this_obj:
+                self._object_pool.on_destroy(obj.class_name)
                 obj.destroy()
             else:
                 obj.detach_from_world(self.physics_world)
@@ -220,12 +269,8 @@ class BaseEngine(EngineCore, Randomizable):
                 if hasattr(obj, "before_reset"):
                     obj.before_reset()
 
-                if obj.class_name not in self._dying_objects:
-                    self._dying_objects[obj.class_name] = []
                 # We have a limit for buffering objects
-                if len(self._dying_objects[obj.class_name]) < self.global_config["num_buffering_objects"]:
-                    self._dying_objects[obj.class_name].append(obj)
-                else:
+                if not self._object_pool.release(obj):
                     obj.destroy()
             if self.global_config["record_episode"] and not self.replay_episode and record:
                 self.record_manager.add_clear_info(obj)
@@ -236,10 +281,7 @@ class BaseEngine(EngineCore, Randomizable):
             return
         if obj in self._spawned_objects:
             self.clear_objects([obj], force_destroy=force_destroy)
-        if force_destroy and \
-                obj.class_name in self._dying_objects and \
-                obj in self._dying_objects[obj.class_name]:
-            self._dying_objects[obj.class_name].remove(obj)
+        if force_destroy and self._object_pool.remove(obj):
             if hasattr(obj, "destroy"):
                 obj.destroy()
         del obj
@@ -284,6 +326,9 @@ class BaseEngine(EngineCore, Randomizable):
                 cm = lm
 
         self._object_clean_check()
+        # objects exceeding the capacity decided by recent episodes are destroyed to bound the memory
+        for obj in self._object_pool.end_episode():
+            obj.destroy()
 
         for manager_name, manager in self.managers.items():
             if self.replay_episode and self.only_reset_when_replay and manager is not self.replay_manager:
@@ -306,6 +351,9 @@ class BaseEngine(EngineCore, Randomizable):
                     print("{}: After Reset! Mem Change {:.3f}MB".format(manager_name, (lm - cm) / 1e6))
                 cm = lm
 
+        if not self._object_pool_prefilled:
+            self._prefill_object_pool()
+
         # reset cam
         if self.main_camera is not None:
             self.main_camera.reset()
@@ -340,9 +388,15 @@ class BaseEngine(EngineCore, Randomizable):
         self.episode_step += 1
         step_infos = {}
         self.external_actions = external_actions
+        # it is decided before actions are applied, as brakes of vehicles depend on the physics step size
+        self._num_physics_steps, self.physics_step_size = PhysicsStepScheduler.schedule(
+            self, self.global_config["decision_repeat"]
+        )
+        full_info = self.global_config["info_level"] == InfoLevel.FULL
         for manager in self.managers.values():
             new_step_infos = manager.before_step()
-            step_infos = concat_step_infos([step_infos, new_step_infos])
+            if full_info:
+                step_infos = concat_step_infos([step_infos, new_step_infos])
         return step_infos
 
     def step(self, step_num: int = 1) -> None:
@@ -350,12 +404,15 @@ class BaseEngine(EngineCore, Randomizable):
         Step the dynamics of each entity on the road.
         :param step_num: Decision of all entities will repeat *step_num* times
         """
+        if step_num != self.global_config["decision_repeat"] or self._num_physics_steps is None:
+            self._num_physics_steps, self.physics_step_size = step_num, self.global_config["physics_world_step_size"]
+        step_num = self._num_physics_steps
         for i in range(step_num):
             # simulate or replay
             for name, manager in self.managers.items():
                 if name != "record_manager":
                     manager.step()
-            self.step_physics_world()
+            self.step_physics_world(self.physics_step_size)
             # the recording should happen after step physics world
             if "record_manager" in self.managers and i < step_num - 1:
                 # last recording should be finished in after_step(), as some objects may be created in after_step.
@@ -370,6 +427,7 @@ class BaseEngine(EngineCore, Randomizable):
 
             if self.force_fps.real_time_simulation and i < step_num - 1:
                 self.task_manager.step()
+        self._num_physics_steps, self.physics_step_size = None, self.global_config["physics_world_step_size"]
         #  panda3d render and garbage collecting loop
         self.task_manager.step()
         if self.on_screen_message is not None:
@@ -384,9 +442,11 @@ class BaseEngine(EngineCore, Randomizable):
         step_infos = {}
         if self.record_episode:
             assert list(self.managers.keys())[-1] == "record_manager", "Record Manager should have lowest priority"
+        full_info = self.global_config["info_level"] == InfoLevel.FULL
         for manager in self.managers.values():
             new_step_info = manager.after_step(*args, **kwargs)
-            step_infos = concat_step_infos([step_infos, new_step_info])
+            if full_info:
+                step_infos = concat_step_infos([step_infos, new_step_info])
         self.interface.after_step()
 
         # === Option 1: Set episode_step to "num of calls to env.step"
@@ -437,9 +497,9 @@ class BaseEngine(EngineCore, Randomizable):
             if id in self._object_tasks:
                 self._object_tasks.pop(id).destroy()
             obj.destroy()
-        for cls, pending_obj in self._dying_objects.items():
-            for obj in pending_obj:
-                obj.destroy()
+        for obj in self._object_pool.clear():
+            obj.destroy()
+        self._clear_shared_models()
         if self.main_camera is not None:
             self.main_camera.destroy()
         self.interface.destroy()
@@ -450,6 +510,21 @@ class BaseEngine(EngineCore, Randomizable):
             del self._top_down_renderer
             self._top_down_renderer = None
 
+    @staticmethod
+    def _clear_shared_models():
+        """
+        Objects of the same class instance one model loaded by the loader of this engine. Release these models with the
+        engine, so that the next engine loads them again
+        """
+        from metadrive.component.vehicle.base_vehicle import BaseVehicle
+        from metadrive.component.static_object.traffic_object import TrafficCone, TrafficWarning, TrafficBarrier
+        from metadrive.component.traffic_participants.cyclist import Cyclist
+        from metadrive.component.traffic_participants.pedestrian import Pedestrian
+        BaseVehicle.model_collection.clear()
+        Pedestrian._MODEL.clear()
+        for object_class in [TrafficCone, TrafficWarning, TrafficBarrier, Cyclist]:
+            object_class.MODEL = None
+
     def __del__(self):
         logging.debug("{} is destroyed".format(self.__class__.__name__))
 
@@ -662,9 +737,9 @@ class BaseEngine(EngineCore, Randomizable):
     def warmup(self):
         """
         This function automatically initialize models/objects. It can prevent the lagging when creating some objects
-        for the first time.
+        for the first time. No model will be loaded in physics only mode, and thus nothing to warm up.
         """
-        if self.global_config["preload_models"]:
+        if self.global_config["preload_models"] and not self.physics_only:
             from metadrive.component.traffic_participants.pedestrian import Pedestrian
             from metadrive.component.traffic_light.base_traffic_light import BaseTrafficLight
             from metadrive.component.static_object.traffic_object import TrafficBarrier
@@ -3,7 +3,6 @@ import sys
 import time
 from typing import Optional, Union, Tuple
 
-import gltf
 from direct.gui.OnscreenImage import OnscreenImage
 from direct.showbase import ShowBase
 from panda3d.bullet import BulletDebugNode
@@ -19,7 +18,6 @@ from metadrive.engine.core.onscreen_message import ScreenMessage
 from metadrive.engine.core.physics_world import PhysicsWorld
 from metadrive.engine.core.sky_box import SkyBox
 from metadrive.engine.core.terrain import Terrain
-from metadrive.render_pipeline.rpcore import RenderPipeline
 from metadrive.utils.utils import is_mac, setup_logger
 
 
@@ -128,9 +126,17 @@ class EngineCore(ShowBase.ShowBase):
         if is_mac() and (self.mode == RENDER_MODE_OFFSCREEN):  # Mac don't support offscreen rendering
             self.mode = RENDER_MODE_ONSCREEN
 
+        # physics only mode, no model, texture, sky box or visual terrain will be loaded
+        if self.global_config["physics_only"] is None:
+            self.global_config["physics_only"] = self.mode == RENDER_MODE_NONE
+        elif self.global_config["physics_only"] and self.mode != RENDER_MODE_NONE:
+            raise ValueError("physics_only can not be used with use_render=True or image_observation=True")
+
         loadPrcFileData("", "win-size {} {}".format(*self.global_config["window_size"]))
 
         if self.use_render_pipeline:
+            # the render pipeline and gltf loader are only imported when needed, as importing them is slow
+            from metadrive.render_pipeline.rpcore import RenderPipeline
             self.render_pipeline = RenderPipeline()
             self.render_pipeline.pre_showbase_init()
             # disable it, as some model errors happen!
@@ -201,6 +207,7 @@ class EngineCore(ShowBase.ShowBase):
         if not self.global_config["debug_physics_world"] \
                 and (self.mode in [RENDER_MODE_ONSCREEN, RENDER_MODE_OFFSCREEN]):
             initialize_asset_loader(self)
+            import gltf
             gltf.patch_loader(self.loader)
             if not self.use_render_pipeline:
                 # Display logo
@@ -333,8 +340,8 @@ class EngineCore(ShowBase.ShowBase):
         if self.mode != RENDER_MODE_NONE and self.sky_box is not None:
             self.sky_box.step()
 
-    def step_physics_world(self):
-        dt = self.global_config["physics_world_step_size"]
+    def step_physics_world(self, dt=None):
+        dt = dt or self.global_config["physics_world_step_size"]
         self.physics_world.dynamic_world.doPhysics(dt, 1, dt)
 
     def _debug_mode(self):
@@ -468,6 +475,10 @@ class EngineCore(ShowBase.ShowBase):
         for line in self.coordinate_line:
             line.setPos(pos[0], pos[1], 0)
 
+    @property
+    def physics_only(self):
+        return self.global_config["physics_only"]
+
     @property
     def use_render_pipeline(self):
         return self.global_config["render_pipeline"] and not self.mode == RENDER_MODE_NONE
@@ -6,22 +6,12 @@ from typing import Tuple
 import numpy as np
 from direct.controls.InputState import InputState
 from panda3d.core import Vec3, Point3, PNMImage
-from panda3d.core import WindowProperties
+from panda3d.core import WindowProperties, GraphicsOutput, Texture, GraphicsStateGuardianBase, DisplayRegionDrawCallbackData
 
 from metadrive.constants import CollisionGroup
 from metadrive.engine.engine_utils import get_engine
 from metadrive.utils.coordinates_shift import panda_heading, panda_vector
-from metadrive.utils.cuda import check_cudart_err
-
-_cuda_enable = True
-try:
-    import cupy as cp
-    from OpenGL.GL import GL_TEXTURE_2D  # noqa F403
-    from cuda import cudart
-    from cuda.cudart import cudaGraphicsRegisterFlags
-    from panda3d.core import GraphicsOutput, Texture, GraphicsStateGuardianBase, DisplayRegionDrawCallbackData
-except ImportError:
-    _cuda_enable = False
+from metadrive.utils.cuda import check_cudart_err, cuda_available, cp, cudart, GL
 
 
 class MainCamera:
@@ -105,7 +95,7 @@ class MainCamera:
 
         self.cuda_graphics_resource = None
         if self.enable_cuda:
-            assert _cuda_enable, "Can not enable cuda rendering pipeline"
+            assert cuda_available(), "Can not enable cuda rendering pipeline"
 
             # returned tensor property
             self.cuda_dtype = np.uint8
@@ -480,7 +470,8 @@ class MainCamera:
             return self.cuda_graphics_resource
         self.cuda_graphics_resource = check_cudart_err(
             cudart.cudaGraphicsGLRegisterImage(
-                self.cuda_texture_identifier, GL_TEXTURE_2D, cudaGraphicsRegisterFlags.cudaGraphicsRegisterFlagsReadOnly
+                self.cuda_texture_identifier, GL.GL_TEXTURE_2D,
+                cudart.cudaGraphicsRegisterFlags.cudaGraphicsRegisterFlagsReadOnly
             )
         )
         return self.cuda_graphics_resource
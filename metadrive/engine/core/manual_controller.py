@@ -12,8 +12,10 @@ if (not is_win()) and (not is_mac()):
         pass
 
 from metadrive.utils import import_pygame
+from metadrive.utils.utils import LazyModule
 
-pygame = import_pygame()
+# pygame is only needed when the manual control is turned on
+pygame = LazyModule("pygame", import_pygame)
 
 
 class Controller:
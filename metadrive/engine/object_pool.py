@@ -0,0 +1,131 @@
+import logging
+from collections import deque, defaultdict
+
+logger = logging.getLogger(__name__)
+
+
+class ObjectPool:
+    """
+    Objects cleared by the engine are stored here by class and reused by the next spawn_object() of the same class.
+    The capacity of each class adapts to usage: it is the peak number of objects of that class alive at the same time
+    in recent episodes, bounded by max_size. Pools are trimmed to their capacity when a new episode starts.
+    """
+    def __init__(self, max_size: int, trim_window=None):
+        """
+        :param max_size: at most this number of objects are stored for each class
+        :param trim_window: capacity is decided by the peak usage of the last trim_window episodes. If it is None,
+        pools are never trimmed and each can store max_size objects
+        """
+        self.max_size = max_size
+        self.trim_window = trim_window
+        self._pools = defaultdict(list)
+        self._num_alive = defaultdict(int)
+        self._episode_peaks = defaultdict(int)
+        self._peak_history = defaultdict(lambda: deque(maxlen=trim_window))
+        self._prefill_sizes = {}
+        self._statistics = defaultdict(lambda: dict(hits=0, misses=0, released=0, destroyed=0))
+
+    def get(self, class_name: str):
+        """
+        Pop a stored object of this class, or return None if there is no one
+        """
+        pool = self._pools.get(class_name, None)
+        if pool:
+            self._statistics[class_name]["hits"] += 1
+            return pool.pop()
+        self._statistics[class_name]["misses"] += 1
+        return None
+
+    def on_spawn(self, class_name: str):
+        self._num_alive[class_name] += 1
+        self._episode_peaks[class_name] = max(self._episode_peaks[class_name], self._num_alive[class_name])
+
+    def on_destroy(self, class_name: str):
+        self._num_alive[class_name] = max(self._num_alive[class_name] - 1, 0)
+
+    def release(self, obj) -> bool:
+        """
+        Store an object cleared from the scene. Return False if the pool is full and the object should be destroyed
+        """
+        class_name = obj.class_name
+        self.on_destroy(class_name)
+        if len(self._pools[class_name]) < self.capacity(class_name):
+            self._pools[class_name].append(obj)
+            self._statistics[class_name]["released"] += 1
+            return True
+        self._statistics[class_name]["destroyed"] += 1
+        return False
+
+    def remove(self, obj) -> bool:
+        """
+        Remove a stored object without destroying it. Return False if it is not in the pool
+        """
+        pool = self._pools.get(obj.class_name, None)
+        if pool is None or obj not in pool:
+            return False
+        pool.remove(obj)
+        return True
+
+    def set_prefill_size(self, class_name: str, size: int):
+        """
+        Keep at least this number of objects of this class when trimming
+        """
+        self._prefill_sizes[class_name] = min(size, self.max_size)
+
+    def capacity(self, class_name: str) -> int:
+        if self.trim_window is None:
+            return self.max_size
+        history = self._peak_history.get(class_name, ())
+        peak = max(max(history, default=0), self._episode_peaks.get(class_name, 0))
+        return min(max(peak, self._prefill_sizes.get(class_name, 0)), self.max_size)
+
+    def end_episode(self):
+        """
+        Record peak usage of the last episode and return objects exceeding the new capacity, which should be destroyed
+        """
+        to_destroy = []
+        for class_name in set(self._episode_peaks) | set(self._pools):
+            self._peak_history[class_name].append(self._episode_peaks.get(class_name, 0))
+            # objects kept alive across episodes, like maps, are counted in the new episode as well
+            self._episode_peaks[class_name] = self._num_alive[class_name]
+            pool = self._pools[class_name]
+            capacity = self.capacity(class_name)
+            if len(pool) > capacity:
+                to_destroy += pool[capacity:]
+                self._statistics[class_name]["destroyed"] += len(pool) - capacity
+                del pool[capacity:]
+        if len(to_destroy) > 0:
+            logger.debug("Trim {} objects from the object pool".format(len(to_destroy)))
+        return to_destroy
+
+    def num_stored(self, class_name: str) -> int:
+        return len(self._pools.get(class_name, ()))
+
+    def num_alive(self, class_name: str) -> int:
+        return self._num_alive.get(class_name, 0)
+
+    def all_objects(self):
+        return [obj for pool in self._pools.values() for obj in pool]
+
+    def clear(self):
+        """
+        Return all stored objects and empty the pools
+        """
+        ret = self.all_objects()
+        self._pools.clear()
+        return ret
+
+    def get_statistics(self):
+        """
+        Return a dict mapping each class name to its pool statistics. hits and misses count spawns served by the pool
+        or by creating new objects, released and destroyed count cleared objects stored in or destroyed by the pool
+        """
+        ret = {}
+        for class_name in set(self._statistics) | set(self._pools):
+            ret[class_name] = dict(
+                self._statistics[class_name],
+                stored=self.num_stored(class_name),
+                alive=self._num_alive.get(class_name, 0),
+                capacity=self.capacity(class_name)
+            )
+        return ret
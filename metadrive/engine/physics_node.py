@@ -16,13 +16,34 @@ class BaseRigidBodyNode(BulletRigidBodyNode):
         self.setPythonTag(node_name, self)
         self.base_object_name = base_object_name
         self._clear_python_tag = False
+        # object name of each sub-shape, when shapes of several objects are merged into this node
+        self.sub_object_names = None
 
     def rename(self, new_name):
         self.base_object_name = new_name
 
+    def add_sub_shape(self, shape, transform, object_name):
+        """
+        Merge the shape of an object into this node. The object can be found with the index of the shape, which is
+        the triangle index of ray test results
+        """
+        if self.sub_object_names is None:
+            self.sub_object_names = []
+        self.addShape(shape, transform)
+        self.sub_object_names.append(object_name)
+
+    def get_object_name(self, shape_index=None):
+        """
+        Return None, if shapes are merged but which shape is hit is unknown
+        """
+        if self.sub_object_names is None:
+            return self.base_object_name
+        return self.sub_object_names[shape_index] if shape_index is not None else None
+
     def destroy(self):
         # This sentence is extremely important!
         self.base_object_name = None
+        self.sub_object_names = None
         self.clearPythonTag(self.getName())
         self._clear_python_tag = True
 
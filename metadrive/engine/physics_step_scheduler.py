@@ -0,0 +1,112 @@
+import math
+
+import numpy as np
+from panda3d.bullet import BulletBoxShape, BulletGhostNode
+from panda3d.core import Point3, TransformState, Vec3
+
+from metadrive.constants import CollisionGroup
+from metadrive.utils.math import rotated_rectangles_overlap
+from metadrive.utils.utils import is_map_related_instance
+
+
+class PhysicsStepScheduler:
+    """
+    Used to choose the number and the size of physics steps for each env step. When objects are far from each other
+    and from map bodies like sidewalks, the env step is simulated with fewer and larger physics steps. Otherwise, the
+    fixed physics_world_step_size is used
+    """
+    # map bodies that objects can collide with
+    MAP_BODY_MASK = CollisionGroup.Sidewalk | CollisionGroup.InvisibleWall
+    # map bodies are on the ground, so the boxes tested against them span this height (meters) above and below it
+    MAP_BODY_TEST_HALF_HEIGHT = 1.0
+
+    @classmethod
+    def schedule(cls, engine, step_num: int):
+        """
+        Return the number of physics steps and the step size used to simulate step_num fixed physics steps
+        """
+        config = engine.global_config
+        dt = config["physics_world_step_size"]
+        max_dt = config["max_physics_world_step_size"]
+        num_steps = math.ceil(step_num * dt / max_dt - 1e-6)
+        if not config["adaptive_physics_step"] or num_steps >= step_num:
+            return step_num, dt
+        # the recorder and the replayer work with fixed steps
+        if engine.record_episode or engine.replay_episode:
+            return step_num, dt
+        states = cls.get_object_states(engine)
+        margin = config["adaptive_physics_step_margin"]
+        if not cls.is_sparse(*states, step_num * dt, margin):
+            return step_num, dt
+        if cls.is_near_map_bodies(engine.physics_world, *states, step_num * dt, margin):
+            return step_num, dt
+        return num_steps, step_num * dt / num_steps
+
+    @staticmethod
+    def get_object_states(engine):
+        """
+        Return the positions, headings, half lengths and widths, and velocities of objects in the physics world
+        """
+        positions = []
+        headings = []
+        half_sizes = []
+        velocities = []
+        for obj in engine.get_objects().values():
+            if is_map_related_instance(obj) or len(obj.dynamic_nodes) == 0 or not obj.dynamic_nodes.attached:
+                continue
+            positions.append(obj.position)
+            headings.append(obj.heading_theta)
+            half_sizes.append((obj.LENGTH / 2, obj.WIDTH / 2))
+            velocities.append(obj.velocity)
+        return np.array(positions).reshape(-1, 2), np.array(headings), np.array(half_sizes).reshape(-1, 2), \
+            np.array(velocities).reshape(-1, 2)
+
+    @staticmethod
+    def get_swept_boxes(positions, headings, half_sizes, velocities, duration, margin):
+        """
+        Return the centers and half sizes of boxes covering the objects moving at their velocities within the duration.
+        Boxes keep the headings of objects, and are enlarged by half of the margin
+        """
+        travel = velocities * duration
+        directions = np.stack([np.cos(headings), np.sin(headings)], axis=-1)
+        centers = positions + travel / 2
+        half_sizes = half_sizes + margin / 2
+        # the travel along and perpendicular to the heading, which can be negative when objects move backward
+        half_sizes[:, 0] += np.abs(np.sum(travel * directions, axis=-1)) / 2
+        half_sizes[:, 1] += np.abs(travel[:, 1] * directions[:, 0] - travel[:, 0] * directions[:, 1]) / 2
+        return centers, half_sizes
+
+    @classmethod
+    def is_sparse(cls, positions, headings, half_sizes, velocities, duration, margin):
+        """
+        Return True if no two objects get closer than the margin within the duration
+        """
+        if len(positions) < 2:
+            return True
+        centers, half_sizes = cls.get_swept_boxes(positions, headings, half_sizes, velocities, duration, margin)
+        overlap = rotated_rectangles_overlap(centers, headings, half_sizes, centers, headings, half_sizes)
+        # each box overlaps itself
+        return int(np.sum(overlap)) == len(positions)
+
+    @classmethod
+    def is_near_map_bodies(cls, physics_world, positions, headings, half_sizes, velocities, duration, margin):
+        """
+        Return True if any object gets closer than the margin to map bodies like sidewalks within the duration. Both
+        bullet worlds are tested, as sidewalks are in the static world when rendering is off
+        """
+        if len(positions) == 0:
+            return False
+        centers, half_sizes = cls.get_swept_boxes(positions, headings, half_sizes, velocities, duration, margin)
+        node = BulletGhostNode("physics_step_scheduler")
+        for (x, y), heading, (half_length, half_width) in zip(centers, headings, half_sizes):
+            node.addShape(
+                BulletBoxShape(Vec3(half_length, half_width, cls.MAP_BODY_TEST_HALF_HEIGHT)),
+                TransformState.makePosHpr(Point3(x, y, 0), Vec3(np.rad2deg(heading), 0, 0))
+            )
+        for world in (physics_world.dynamic_world, physics_world.static_world):
+            for contact in world.contactTest(node, False).getContacts():
+                # lane surfaces collide with everything, so bodies only in map body groups are counted
+                mask = contact.getNode1().getIntoCollideMask()
+                if not mask.isZero() and (mask & ~cls.MAP_BODY_MASK).isZero():
+                    return True
+        return False
@@ -1,6 +1,8 @@
 import logging
 from typing import List
 
+import numpy as np
+
 from metadrive.utils.math import norm
 
 logger = logging.getLogger(__name__)
@@ -21,20 +23,23 @@ class SceneCull:
     LOD_VEHICLE_PHYSICS_DIST = 100000
     LOD_OBJECT_PHYSICS_DIST = 100000
 
+    # Objects are attached when they are closer than the LOD distance, but detached only when they are farther than the
+    # LOD distance plus this band, so that objects around the boundary are not attached and detached every step
+    LOD_HYSTERESIS = 20
+    # At most this number of objects are detached from the scene graph or physics world in one call. The farthest ones
+    # are detached first and the others are left to the next calls. Attaching is not limited, as objects close to agents
+    # should always be visible and collidable
+    MAX_DETACH_PER_STEP = 10
+
     @classmethod
     def cull_distant_blocks(cls, engine, blocks: list, poses: List[tuple], max_distance=None):
         # A distance based LOD rendering
-        for block in blocks:
-            if not cls.all_out_of_bounding_box(block.bounding_box, poses, cls.LOD_MAP_VIS_DIST):
-                if not block.origin.hasParent():
-                    block.origin.reparentTo(engine.worldNP)
-            else:
-                if block.origin.hasParent():
-                    block.origin.detachNode()
-            if not cls.all_out_of_bounding_box(block.bounding_box, poses, max_distance or cls.LOD_MAP_PHYSICS_DIST):
-                block.dynamic_nodes.attach_to_physics_world(engine.physics_world.dynamic_world)
-            else:
-                block.dynamic_nodes.detach_from_physics_world(engine.physics_world.dynamic_world)
+        if len(blocks) == 0 or len(poses) == 0:
+            return
+        distances = cls.distances_to_bounding_boxes([block.bounding_box for block in blocks], poses)
+        cls._cull(
+            engine, blocks, distances, engine.worldNP, cls.LOD_MAP_VIS_DIST, max_distance or cls.LOD_MAP_PHYSICS_DIST
+        )
 
     @classmethod
     def cull_distant_traffic_vehicles(cls, engine, vehicles: list, poses: List[tuple], max_distance=None):
@@ -48,25 +53,75 @@ class SceneCull:
 
     @classmethod
     def _cull_elements(cls, engine, elements: list, poses: List[tuple], vis_distance: float, physics_distance: float):
-        for obj in elements:
-            v_p = obj.position
-            if not cls.all_distance_greater_than(vis_distance, poses, v_p):
-                if not obj.origin.hasParent():
-                    obj.origin.reparentTo(engine.pbr_worldNP)
-            else:
-                if obj.origin.hasParent():
-                    obj.origin.detachNode()
-
-            if not cls.all_distance_greater_than(physics_distance, poses, v_p):
-                obj.dynamic_nodes.attach_to_physics_world(engine.physics_world.dynamic_world)
-            else:
-                obj.dynamic_nodes.detach_from_physics_world(engine.physics_world.dynamic_world)
+        if len(elements) == 0 or len(poses) == 0:
+            return
+        distances = cls.distances_to_points([obj.position for obj in elements], poses)
+        cls._cull(engine, elements, distances, engine.pbr_worldNP, vis_distance, physics_distance)
+
+    @classmethod
+    def _cull(cls, engine, elements, distances, parent_np, vis_distance, physics_distance):
+        """
+        Attach or detach elements according to the distances to their closest agents
+        """
+        shown = [obj.origin.hasParent() for obj in elements]
+        to_show, to_hide = cls.get_state_changes(distances, shown, vis_distance)
+        for index in to_show:
+            elements[index].origin.reparentTo(parent_np)
+        for index in to_hide:
+            elements[index].origin.detachNode()
+
+        attached = [obj.dynamic_nodes.attached for obj in elements]
+        to_attach, to_detach = cls.get_state_changes(distances, attached, physics_distance)
+        for index in to_attach:
+            elements[index].dynamic_nodes.attach_to_physics_world(engine.physics_world.dynamic_world)
+        for index in to_detach:
+            elements[index].dynamic_nodes.detach_from_physics_world(engine.physics_world.dynamic_world)
+
+    @classmethod
+    def get_state_changes(cls, distances, attached, distance):
+        """
+        Decide which elements should be attached or detached with hysteresis and the detach rate limit
+        :param distances: distance from each element to its closest agent
+        :param attached: whether each element is attached now
+        :param distance: the LOD distance
+        :return: indices of elements to attach, indices of elements to detach
+        """
+        distances = np.asarray(distances, dtype=float)
+        attached = np.asarray(attached, dtype=bool)
+        to_attach = np.flatnonzero(~attached & (distances < distance))
+        to_detach = np.flatnonzero(attached & (distances > distance + cls.LOD_HYSTERESIS))
+        if len(to_detach) > cls.MAX_DETACH_PER_STEP:
+            to_detach = to_detach[np.argsort(-distances[to_detach], kind="stable")[:cls.MAX_DETACH_PER_STEP]]
+        return to_attach, to_detach
+
+    @staticmethod
+    def distances_to_points(positions, poses):
+        """
+        Distance from each position to its closest pose, computed from the (num_positions, num_poses) distance matrix
+        """
+        positions = np.asarray(positions, dtype=float)[:, None, :2]
+        poses = np.asarray(poses, dtype=float)[None, :, :2]
+        return np.min(np.linalg.norm(positions - poses, axis=-1), axis=1)
+
+    @staticmethod
+    def distances_to_bounding_boxes(bounding_boxes, poses):
+        """
+        Chebyshev distance from each bounding box (x_min, x_max, y_min, y_max) to its closest pose. It is 0 if the pose
+        is in the box. A box with None is never close to any pose
+        """
+        boxes = np.asarray(bounding_boxes, dtype=float)[:, None, :]
+        poses = np.asarray(poses, dtype=float)[None, :, :2]
+        dx = np.maximum(np.maximum(boxes[..., 0] - poses[..., 0], poses[..., 0] - boxes[..., 1]), 0)
+        dy = np.maximum(np.maximum(boxes[..., 2] - poses[..., 1], poses[..., 1] - boxes[..., 3]), 0)
+        distances = np.min(np.maximum(dx, dy), axis=1)
+        distances[np.isnan(distances)] = np.inf
+        return distances
 
     @staticmethod
     def all_distance_greater_than(distance, poses, target_pos):
         v_p = target_pos
         for pos in poses:
-            if norm(v_p[0] - pos[0], v_p[1] - v_p[1]) < distance:
+            if norm(v_p[0] - pos[0], v_p[1] - pos[1]) < distance:
                 return False
         return True
 
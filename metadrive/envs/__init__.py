@@ -1,6 +1,20 @@
+import importlib
+
 from metadrive.envs.marl_envs import MultiAgentMetaDrive, MultiAgentBottleneckEnv, MultiAgentTollgateEnv, \
     MultiAgentParkingLotEnv, MultiAgentIntersectionEnv, MultiAgentRoundaboutEnv
 from metadrive.envs.metadrive_env import MetaDriveEnv
 from metadrive.envs.safe_metadrive_env import SafeMetaDriveEnv
-from metadrive.envs.top_down_env import TopDownSingleFrameMetaDriveEnv, TopDownMetaDrive, TopDownMetaDriveEnvV2
 from metadrive.envs.varying_dynamics_env import VaryingDynamicsEnv
+
+# Top-down envs depend on pygame, which is slow to import, so they are imported at the first access
+_LAZY_ENVS = {
+    "TopDownSingleFrameMetaDriveEnv": "metadrive.envs.top_down_env",
+    "TopDownMetaDrive": "metadrive.envs.top_down_env",
+    "TopDownMetaDriveEnvV2": "metadrive.envs.top_down_env",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ENVS:
+        return getattr(importlib.import_module(_LAZY_ENVS[name]), name)
+    raise AttributeError("module {} has no attribute {}".format(__name__, name))
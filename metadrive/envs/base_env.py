@@ -18,12 +18,13 @@ from metadrive.engine.engine_utils import initialize_engine, close_engine, \
 from metadrive.manager.agent_manager import AgentManager
 from metadrive.manager.record_manager import RecordManager
 from metadrive.manager.replay_manager import ReplayManager
+from metadrive.manager.vehicle_dynamics_manager import VehicleDynamicsManager
 from metadrive.obs.image_obs import ImageStateObservation
 from metadrive.obs.observation_base import ObservationBase
 from metadrive.obs.state_obs import LidarStateObservation
 from metadrive.policy.env_input_policy import EnvInputPolicy
-from metadrive.scenario.utils import convert_recorded_scenario_exported
 from metadrive.utils import Config, merge_dicts, get_np_random, concat_step_infos
+from metadrive.utils.step_info import InfoLevel, StepInfoRecords
 
 BASE_DEFAULT_CONFIG = dict(
 
@@ -107,6 +108,9 @@ BASE_DEFAULT_CONFIG = dict(
         length=None,
         height=None,
         mass=None,
+        # "bullet" simulates the vehicle as a raycast vehicle. "kinematic_bicycle" moves it with a vectorized kinematic
+        # bicycle model, which is faster, and Bullet is only used for collision queries and sensors
+        dynamics_model="bullet",
 
         # ===== vehicle module config =====
         lidar=dict(
@@ -137,6 +141,12 @@ BASE_DEFAULT_CONFIG = dict(
     # ===== Engine Core config =====
     window_size=(1200, 900),  # or (width, height), if set to None, it will be automatically determined
     physics_world_step_size=2e-2,
+    # Simulate each env step with fewer and larger physics steps when no objects are close to each other, and fall back
+    # to physics_world_step_size otherwise. Results are slightly different from the fixed step simulation, which stays
+    # the default
+    adaptive_physics_step=False,
+    max_physics_world_step_size=5e-2,  # bullet vehicles become inaccurate with larger steps
+    adaptive_physics_step_margin=0.5,  # objects closer than it (meters) in this env step require fine physics steps
     show_fps=True,
     global_light=True,
     # only render physics world without model, a special debug option
@@ -152,6 +162,12 @@ BASE_DEFAULT_CONFIG = dict(
     image_on_cuda=False,
     # accelerate the lidar perception
     _disable_detector_mask=False,
+    # "full": return all info dicts from managers, vehicles and reward/cost/done functions. "minimal": only return
+    # termination flags, cost and episode stats with preallocated records. "none": only return termination flags
+    info_level="full",
+    # compute observations of all agents in vectorized passes with ObservationBase.observe_batch(). It requires all
+    # agents to use the same kind of observation
+    batch_observation=False,
     # clip rgb to (0, 1)
     rgb_clip=True,
     # None: unlimited, number: fps
@@ -163,16 +179,29 @@ BASE_DEFAULT_CONFIG = dict(
     # when possible. But it is possible that some classes of objects are always forcefully respawn
     # and thus those used objects are stored in the buffer and never be reused.
     num_buffering_objects=200,
+    # the capacity of each class is the peak number of its objects used in the last object_pool_trim_window episodes,
+    # and extra objects are destroyed when resetting. Set it to None to keep num_buffering_objects objects for each class
+    object_pool_trim_window=20,
+    # (class_name, number) pairs of objects created in advance, like [("DefaultVehicle", 20)]. They are created after the
+    # first reset and stored in the object pool, so that spawning them later doesn't create new objects
+    object_pool_prefill=None,
     # turn on to use render pipeline, which provides advanced rendering effects (Beta)
     render_pipeline=False,
     # daytime is only available when using render-pipeline
     daytime="19:00",  # use string like "13:40", We usually set this by editor in toolkit
 
+    # merge collision shapes of lanes, lane lines and sidewalks into one bullet body per type in each block, which
+    # greatly reduces the number of bodies and accelerates map loading and ray tests on large maps
+    merge_block_collision=False,
+
     # ===== Mesh Terrain =====
     # road will have a marin whose width is determined by this value, unit: [m]
     drivable_region_extension=6,
     # height scale for mountains, unit: [m]
     height_scale=120,
+    # A directory to cache the semantic and height maps used by the terrain. Images are identified by map features, so
+    # they are drawn once for each map and can be shared by processes. None: disable the cache
+    map_image_cache_dir=None,
 
     # ===== Others =====
     # The maximum distance used in PGLOD. Set to None will use the default values.
@@ -192,6 +221,9 @@ BASE_DEFAULT_CONFIG = dict(
     multi_thread_render=True,
     multi_thread_render_mode="Cull",  # or "Cull/Draw"
     preload_models=True,  # preload pedestrian Object for avoiding lagging when creating it for the first time
+    # Only keep bullet bodies without loading any model or setting up the scene graph. It can only be used when there
+    # is neither render window nor image observation. None: enable it automatically in this case
+    physics_only=None,
 
     # record/replay metadata
     record_episode=False,  # when replay_episode is not None ,this option will be useless
@@ -241,6 +273,13 @@ class BaseEnv(gym.Env):
         self.episode_rewards = defaultdict(float)
         self.episode_lengths = defaultdict(int)
 
+        assert self.config["info_level"] in [InfoLevel.FULL, InfoLevel.MINIMAL, InfoLevel.NONE]
+        # info_level "none" only reports termination flags, so that reading other fields raises KeyError
+        report_stats = self.config["info_level"] != InfoLevel.NONE
+        self._step_info_records = StepInfoRecords(
+            dtype=StepInfoRecords.DTYPE if report_stats else StepInfoRecords.TERMINATION_DTYPE
+        )
+
     def _merge_extra_config(self, config: Union[dict, Config]) -> Config:
         """Check, update, sync and overwrite some config."""
         return config
@@ -391,6 +430,10 @@ class BaseEnv(gym.Env):
         :param seed: The seed to set the env.
         :return: None
         """
+        self._reset_simulator(seed)
+        return self._get_reset_return()
+
+    def _reset_simulator(self, seed):
         self.lazy_init()  # it only works the first time when reset() is called to avoid the error when render
         self._reset_global_seed(seed)
         if self.engine is None:
@@ -410,51 +453,71 @@ class BaseEnv(gym.Env):
 
         assert (len(self.vehicles) == self.num_agents) or (self.num_agents == -1)
         assert self.config is self.engine.global_config is get_global_config(), "Inconsistent config may bring errors!"
-        return self._get_reset_return()
 
     def _get_reset_return(self):
         # TODO: figure out how to get the information of the before step
-        scene_manager_before_step_infos = {}
-        scene_manager_after_step_infos = self.engine.after_step()
+        engine_info = self.engine.after_step()
+        observations = self.observations
+        for v_id, v in self.vehicles.items():
+            observations[v_id].reset(self, v)
+        step_infos = self._get_reset_infos(engine_info)
+        if self.config["batch_observation"]:
+            obses = self._observe_batch(self.vehicles, observations)
+        else:
+            obses = {v_id: observations[v_id].observe(v) for v_id, v in self.vehicles.items()}
+
+        if self.is_multi_agent:
+            return (obses, step_infos)
+        else:
+            return (self._wrap_as_single_agent(obses), self._wrap_as_single_agent(step_infos))
 
-        obses = {}
+    def _get_reset_infos(self, engine_info):
+        """
+        Step infos of all agents after reset
+        """
         done_infos = {}
         cost_infos = {}
         reward_infos = {}
-        engine_info = merge_dicts(
-            scene_manager_after_step_infos, scene_manager_before_step_infos, allow_new_keys=True, without_copy=True
-        )
-        for v_id, v in self.vehicles.items():
-            self.observations[v_id].reset(self, v)
-            obses[v_id] = self.observations[v_id].observe(v)
+        for v_id in self.vehicles.keys():
             _, reward_infos[v_id] = self.reward_function(v_id)
             _, done_infos[v_id] = self.done_function(v_id)
             _, cost_infos[v_id] = self.cost_function(v_id)
+        return self._get_step_infos(engine_info, done_infos, reward_infos, cost_infos)
 
-        step_infos = concat_step_infos([engine_info, done_infos, reward_infos, cost_infos])
+    def _get_step_return(self, actions, engine_info):
+        # update obs, dones, rewards, costs, calculate done at first !
+        rewards, terminateds, step_infos = self._update_agents(engine_info)
+        observations = self.observations
+        if self.config["batch_observation"]:
+            obses = self._observe_batch(self.vehicles, observations)
+        else:
+            obses = {v_id: observations[v_id].observe(v) for v_id, v in self.vehicles.items()}
+        truncateds = {k: False for k in self.vehicles.keys()}
 
-        if self.is_multi_agent:
-            return (obses, step_infos)
+        if not self.is_multi_agent:
+            return self._wrap_as_single_agent(obses), self._wrap_as_single_agent(rewards), \
+                   self._wrap_as_single_agent(terminateds), self._wrap_as_single_agent(truncateds), self._wrap_as_single_agent(step_infos)
         else:
-            return (self._wrap_as_single_agent(obses), self._wrap_as_single_agent(step_infos))
+            return obses, rewards, terminateds, truncateds, step_infos
 
-    def _get_step_return(self, actions, engine_info):
-        # update obs, dones, rewards, costs, calculate done at first !
-        obses = {}
+    def _update_agents(self, engine_info):
+        """
+        Compute rewards, dones, costs and step infos of all agents after a simulation step, and update episode stats.
+        Observations are computed separately
+        :return: rewards, terminateds, step_infos, which are dicts keyed by agent id
+        """
         done_infos = {}
         cost_infos = {}
         reward_infos = {}
         rewards = {}
-        for v_id, v in self.vehicles.items():
+        for v_id in self.vehicles.keys():
             rewards[v_id], reward_infos[v_id] = self.reward_function(v_id)
             done_function_result, done_infos[v_id] = self.done_function(v_id)
             _, cost_infos[v_id] = self.cost_function(v_id)
             done = done_function_result or self.dones[v_id]
             self.dones[v_id] = done
-            o = self.observations[v_id].observe(v)
-            obses[v_id] = o
 
-        step_infos = concat_step_infos([engine_info, done_infos, reward_infos, cost_infos])
+        step_infos = self._get_step_infos(engine_info, done_infos, reward_infos, cost_infos)
 
         # For extreme scenario only. Force to terminate all vehicles if the environmental step exceeds 5 times horizon.
         should_external_done = False
@@ -465,19 +528,50 @@ class BaseEnv(gym.Env):
                 self.dones[k] = True
 
         terminateds = {k: self.dones[k] for k in self.vehicles.keys()}
-        truncateds = {k: False for k in self.vehicles.keys()}
 
+        report_episode_stats = self.config["info_level"] != InfoLevel.NONE
         for v_id, r in rewards.items():
             self.episode_rewards[v_id] += r
-            step_infos[v_id]["episode_reward"] = self.episode_rewards[v_id]
             self.episode_lengths[v_id] += 1
-            step_infos[v_id]["episode_length"] = self.episode_lengths[v_id]
+            if report_episode_stats:
+                step_infos[v_id]["episode_reward"] = self.episode_rewards[v_id]
+                step_infos[v_id]["episode_length"] = self.episode_lengths[v_id]
+        return rewards, terminateds, step_infos
 
-        if not self.is_multi_agent:
-            return self._wrap_as_single_agent(obses), self._wrap_as_single_agent(rewards), \
-                   self._wrap_as_single_agent(terminateds), self._wrap_as_single_agent(truncateds), self._wrap_as_single_agent(step_infos)
-        else:
-            return obses, rewards, terminateds, truncateds, step_infos
+    def _get_step_infos(self, engine_info, done_infos, reward_infos, cost_infos):
+        """
+        Merge infos into one info dict for each agent. If info_level is not "full", only termination flags (and costs)
+        are written into preallocated records and other infos are dropped
+        """
+        if self.config["info_level"] == InfoLevel.FULL:
+            return concat_step_infos([engine_info, done_infos, reward_infos, cost_infos])
+        ret = {}
+        self._step_info_records.reset()
+        report_cost = self.config["info_level"] == InfoLevel.MINIMAL
+        for v_id, done_info in done_infos.items():
+            record = self._step_info_records.new_record()
+            for field in StepInfoRecords.TERMINATION_FIELDS:
+                if field in done_info:
+                    record[field] = done_info[field]
+            if report_cost:
+                record["cost"] = cost_infos[v_id].get("cost", 0)
+            ret[v_id] = record
+        return ret
+
+    def _observe_batch(self, vehicles, observations):
+        """
+        Observe for all agents with one observe_batch() call
+        :param vehicles: Dict[agent_id: vehicle]
+        :param observations: Dict[agent_id: observation]
+        :return: Dict[agent_id: observation array], where arrays are rows of one (num_agents, obs_dim) array
+        """
+        agent_ids = list(vehicles.keys())
+        if len(agent_ids) == 0:
+            return {}
+        observations = [observations[agent_id] for agent_id in agent_ids]
+        assert len(set([type(o) for o in observations])) == 1, "batch_observation requires the same observation type"
+        batch = observations[0].observe_batch([vehicles[agent_id] for agent_id in agent_ids], observations)
+        return {agent_id: batch[i] for i, agent_id in enumerate(agent_ids)}
 
     def close(self):
         if self.engine is not None:
@@ -588,6 +682,11 @@ class BaseEnv(gym.Env):
         self.engine.register_manager("agent_manager", self.agent_manager)
         self.engine.register_manager("record_manager", RecordManager())
         self.engine.register_manager("replay_manager", ReplayManager())
+        dynamics_models = [self.config["vehicle_config"]["dynamics_model"]] + [
+            config.get("dynamics_model", None) for config in self.config["target_vehicle_configs"].values()
+        ]
+        if VehicleDynamicsManager.KINEMATIC_BICYCLE in dynamics_models:
+            self.engine.register_manager("vehicle_dynamics_manager", VehicleDynamicsManager())
 
     @property
     def current_map(self):
@@ -634,6 +733,8 @@ class BaseEnv(gym.Env):
         """
         We export scenarios into a unified format with 10hz sample rate
         """
+        from metadrive.scenario.utils import convert_recorded_scenario_exported
+
         def _act(observation):
             if isinstance(policies, dict):
                 ret = {}
@@ -688,6 +789,7 @@ class BaseEnv(gym.Env):
         Similar export_scenarios, this function transform the internal recorded frames to a standard
         scenario description.
         """
+        from metadrive.scenario.utils import convert_recorded_scenario_exported
         episode = self.engine.dump_episode()
         return convert_recorded_scenario_exported(episode)
 
@@ -182,6 +182,10 @@ class MultiAgentTollgateEnv(MultiAgentMetaDrive):
         self.stay_time_manager.reset()
         return super(MultiAgentTollgateEnv, self).reset(*args, **kwargs)
 
+    def reset_array(self, *args, **kwargs):
+        self.stay_time_manager.reset()
+        return super(MultiAgentTollgateEnv, self).reset_array(*args, **kwargs)
+
     @staticmethod
     def default_config() -> Config:
         assert MATollConfig["vehicle_config"]["side_detector"]["num_lasers"] > 2
@@ -277,6 +281,11 @@ class MultiAgentTollgateEnv(MultiAgentMetaDrive):
         self.stay_time_manager.record(self.agent_manager.active_agents, self.episode_step)
         return o, r, tm, tc, i
 
+    def step_array(self, actions):
+        ret = super(MultiAgentTollgateEnv, self).step_array(actions)
+        self.stay_time_manager.record(self.agent_manager.active_agents, self.episode_step)
+        return ret
+
     def setup_engine(self):
         super(MultiAgentTollgateEnv, self).setup_engine()
         self.engine.update_manager("map_manager", MATollGatePGMapManager())
@@ -3,12 +3,15 @@ from metadrive.component.vehicle_module.vehicle_panel import VehiclePanel
 import logging
 from typing import Dict, Any
 
+import numpy as np
+
 from metadrive.component.pgblock.first_block import FirstPGBlock
 from metadrive.component.road_network import Road
 from metadrive.constants import TerminationState
 from metadrive.envs.metadrive_env import MetaDriveEnv
 from metadrive.manager.spawn_manager import SpawnManager
 from metadrive.utils import setup_logger, get_np_random, Config
+from metadrive.utils.step_info import InfoLevel
 
 MULTI_AGENT_METADRIVE_DEFAULT_CONFIG = dict(
     # ===== Multi-agent =====
@@ -158,44 +161,189 @@ class MultiAgentMetaDrive(MetaDriveEnv):
             for new_id, new_obs in new_obs_dict.items():
                 o[new_id] = new_obs
                 r[new_id] = 0.0
-                i[new_id] = new_info_dict[new_id]
+                i[new_id] = self._get_respawn_info(new_info_dict[new_id])
                 tm[new_id] = False
                 tc[new_id] = False
 
         # Update __all__
-        d_all = False
-        if (self.config["horizon"] is not None):  # No agent alive or a too long episode happens
-            if (self.episode_step >= self.config["horizon"] and (all(tc.values()) or all(tm.values()))
-                    or (self.episode_step >= 5 * self.config["horizon"])):
-                d_all = True
-        if len(self.vehicles) == 0:  # No agent alive
-            d_all = True
-        tm["__all__"] = d_all
+        tm["__all__"] = self._is_all_done(all(tm.values()), all(tc.values()))
         if tm["__all__"]:
             for k in tm.keys():
                 tm[k] = True
 
         return o, r, tm, tc, i
 
+    def reset_array(self, seed=None):
+        """
+        Array-mode reset. Each agent occupies a slot, i.e. a row of the returned arrays, and keeps it until it finishes.
+        See step_array() for the returned values
+        :param seed: The seed to set the env.
+        :return: observations in shape (num_slots, obs_dim), info dict
+        """
+        self._reset_simulator(seed)
+        engine_info = self.engine.after_step()
+        for agent_id, vehicle in self.vehicles.items():
+            self.observations[agent_id].reset(self, vehicle)
+        step_infos = self._get_reset_infos(engine_info)
+
+        buffers = self._get_array_buffers(clear=True)
+        infos = [None] * len(buffers["reward"])
+        agent_ids = [None] * len(buffers["reward"])
+        slots = self._observe_array(buffers["obs"])
+        for agent_id, slot in slots.items():
+            infos[slot] = step_infos[agent_id]
+            agent_ids[slot] = agent_id
+            buffers["active_mask"][slot] = True
+        info = dict(agent_ids=agent_ids, active_mask=buffers["active_mask"], all_done=False, step_infos=infos)
+        return buffers["obs"], info
+
+    def step_array(self, actions):
+        """
+        Array-mode step, which takes an action matrix and returns agent-ordered arrays instead of per-agent dicts. An
+        agent is mapped to a row (slot) of the arrays with info["agent_ids"]. When an agent finishes, its slot is freed
+        and can be taken by a respawned agent in the same step. In this case, reward, terminated, truncated and
+        info["step_infos"] of the slot are from the finished agent, while the observation is from the new agent, and the
+        terminal observation is stored in info["step_infos"][slot]["final_observation"].
+
+        Note: the returned arrays are preallocated and will be overwritten by the next call. Copy them if necessary.
+        :param actions: action matrix in shape (num_slots, action_dim). Rows of empty slots are ignored.
+        :return: obs (num_slots, obs_dim), reward (num_slots, ), terminated (num_slots, ), truncated (num_slots, ),
+        info dict with keys "agent_ids", "active_mask", "all_done" and "step_infos"
+        """
+        agent_actions = {agent_id: actions[slot] for agent_id, slot in self.agent_manager.agent_slots.items()}
+        engine_info = self._step_simulator(self._preprocess_actions(agent_actions))
+        rewards, terminateds, step_infos = self._update_agents(engine_info)
+
+        buffers = self._get_array_buffers(clear=True)
+        infos = [None] * len(buffers["reward"])
+        agent_ids = [None] * len(buffers["reward"])
+        slots = self._observe_array(buffers["obs"])
+        for agent_id, slot in slots.items():
+            buffers["reward"][slot] = rewards[agent_id]
+            buffers["terminated"][slot] = self._finish_if_done(agent_id, step_infos[agent_id], terminateds[agent_id])
+            infos[slot] = step_infos[agent_id]
+            if agent_id in self.agent_manager.agent_slots:
+                agent_ids[slot] = agent_id
+                buffers["active_mask"][slot] = True
+        all_terminated = all(buffers["terminated"][slot] for slot in slots.values())
+
+        if self.episode_step >= self.config["horizon"]:
+            self.agent_manager.set_allow_respawn(False)
+        new_obs_dict, new_info_dict = self._respawn_vehicles(randomize_position=self.config["random_traffic"])
+        num_new_slots = self.agent_manager.num_slots - len(agent_ids)
+        if num_new_slots > 0:
+            buffers = self._get_array_buffers()
+            infos += [None] * num_new_slots
+            agent_ids += [None] * num_new_slots
+        for agent_id, new_obs in new_obs_dict.items():
+            # a slot freed in this step is reused by the respawned agent
+            slot = self.agent_manager.get_agent_slot(agent_id)
+            if infos[slot] is not None:
+                infos[slot]["final_observation"] = buffers["obs"][slot].copy()
+            else:
+                infos[slot] = self._get_respawn_info(new_info_dict[agent_id])
+            buffers["obs"][slot] = new_obs
+            agent_ids[slot] = agent_id
+            buffers["active_mask"][slot] = True
+            all_terminated = False
+
+        all_done = self._is_all_done(all_terminated, False)
+        if all_done:
+            buffers["terminated"][[slot for slot in range(len(agent_ids)) if infos[slot] is not None]] = True
+        info = dict(agent_ids=agent_ids, active_mask=buffers["active_mask"], all_done=all_done, step_infos=infos)
+        return buffers["obs"], buffers["reward"], buffers["terminated"], buffers["truncated"], info
+
+    def _observe_array(self, out):
+        """
+        Observe for all active agents with one observe_batch() call, and write observations to their slots in out
+        :return: Map<agent_id, slot> of observed agents
+        """
+        slots = {agent_id: self.agent_manager.get_agent_slot(agent_id) for agent_id in self.vehicles.keys()}
+        agent_ids = sorted(slots.keys(), key=lambda agent_id: slots[agent_id])
+        if len(agent_ids) == 0:
+            return slots
+        observations = [self.observations[agent_id] for agent_id in agent_ids]
+        vehicles = [self.vehicles[agent_id] for agent_id in agent_ids]
+        slot_index = [slots[agent_id] for agent_id in agent_ids]
+        if slot_index[-1] == len(slot_index) - 1:
+            # slots are 0, 1, ..., n - 1, so that observations can be written to the buffer in place
+            observations[0].observe_batch(vehicles, observations, out=out[:len(slot_index)])
+        else:
+            out[slot_index] = observations[0].observe_batch(vehicles, observations)
+        return slots
+
+    def _get_respawn_info(self, step_info):
+        if self.config["info_level"] == InfoLevel.FULL:
+            return step_info
+        return self._step_info_records.new_record()
+
+    def _is_all_done(self, all_terminated, all_truncated):
+        """
+        Whether the episode is finished, given whether all agents in this step are terminated or truncated
+        """
+        if self.config["horizon"] is not None:  # No agent alive or a too long episode happens
+            if (self.episode_step >= self.config["horizon"] and (all_truncated or all_terminated)
+                    or (self.episode_step >= 5 * self.config["horizon"])):
+                return True
+        return len(self.vehicles) == 0  # No agent alive
+
+    def _get_array_buffers(self, clear=False):
+        """
+        Preallocated arrays returned by the array-mode API, which are resized when the number of slots changes
+        :param clear: clear rewards, termination flags and the active mask, while keeping observations
+        """
+        num_slots = self.agent_manager.num_slots
+        buffers = getattr(self, "_array_buffers", None)
+        if buffers is None or len(buffers["reward"]) != num_slots:
+            obs_space = self.agent_manager._init_observation_spaces["agent0"]
+            assert obs_space.shape is not None, "Array-mode API only supports Box observation space"
+            old_buffers = buffers
+            buffers = dict(
+                obs=np.zeros((num_slots, ) + obs_space.shape, dtype=obs_space.dtype),
+                reward=np.zeros((num_slots, ), dtype=np.float32),
+                terminated=np.zeros((num_slots, ), dtype=bool),
+                truncated=np.zeros((num_slots, ), dtype=bool),
+                active_mask=np.zeros((num_slots, ), dtype=bool),
+            )
+            if old_buffers is not None:
+                # num_slots only grows in one episode when num_agents = -1, even in the middle of step_array()
+                num_old_slots = min(len(old_buffers["reward"]), num_slots)
+                for key, buffer in buffers.items():
+                    buffer[:num_old_slots] = old_buffers[key][:num_old_slots]
+            self._array_buffers = buffers
+        if clear:
+            buffers["reward"].fill(0.0)
+            buffers["terminated"].fill(False)
+            buffers["truncated"].fill(False)
+            buffers["active_mask"].fill(False)
+        return buffers
+
     def _after_vehicle_done(
         self, obs: Dict[str, Any], reward: Dict[str, float], terminated: Dict[str, bool], truncated: Dict[str, bool],
         info: Dict[str, Any]
     ):
         for v_id, v_info in info.items():
-            if v_info.get("episode_length", 0) >= self.config["horizon"]:
-                if terminated[v_id] is not None:
-                    info[v_id][TerminationState.MAX_STEP] = True
-                    terminated[v_id] = True
-                    self.dones[v_id] = True
-        for dead_vehicle_id, termed in terminated.items():
-            if termed:
-                self.agent_manager.finish(
-                    dead_vehicle_id,
-                    ignore_delay_done=info[dead_vehicle_id].get(TerminationState.SUCCESS, False),
-                )
-                self._update_camera_after_finish()
+            terminated[v_id] = self._finish_if_done(v_id, v_info, terminated[v_id])
         return obs, reward, terminated, truncated, info
 
+    def _finish_if_done(self, vehicle_id, step_info, terminated):
+        """
+        Terminate the vehicle if it reaches the horizon, and finish it if it is terminated
+        :return: whether the vehicle is terminated
+        """
+        if self.episode_lengths[vehicle_id] >= self.config["horizon"]:
+            if terminated is not None:
+                step_info[TerminationState.MAX_STEP] = True
+                terminated = True
+                self.dones[vehicle_id] = True
+        if terminated:
+            self.agent_manager.finish(
+                vehicle_id,
+                ignore_delay_done=step_info.get(TerminationState.SUCCESS, False),
+            )
+            self._update_camera_after_finish()
+        return terminated
+
     def _update_camera_after_finish(self):
         if (self.main_camera is not None
                 and self.current_track_vehicle.id not in self.engine.agent_manager._active_objects
@@ -386,6 +386,16 @@ class MultiAgentTinyInter(MultiAgentIntersectionEnv):
             self.agent_manager.filter_RL_agents(i, original_done_dict=original_done_dict),
         )
 
+    def reset_array(self, seed=None):
+        if self.num_RL_agents != self.num_agents:
+            raise NotImplementedError("Array-mode API does not support mixing RL agents and rule-based agents")
+        return super(MultiAgentTinyInter, self).reset_array(seed)
+
+    def step_array(self, actions):
+        if self.num_RL_agents != self.num_agents:
+            raise NotImplementedError("Array-mode API does not support mixing RL agents and rule-based agents")
+        return super(MultiAgentTinyInter, self).step_array(actions)
+
     def _preprocess_actions(self, actions):
         if self.num_RL_agents == self.num_agents:
             return super(MultiAgentTinyInter, self)._preprocess_actions(actions)
@@ -32,6 +32,10 @@ METADRIVE_DEFAULT_CONFIG = dict(
         "exit_length": 50,
     },
     store_map=True,
+    # A directory to cache generated maps on disk, including the block sequence and the built bullet bodies and visual
+    # nodes of blocks. Maps in it are restored without running the map search or building blocks again and can be
+    # shared by processes. None: disable the cache
+    map_cache_dir=None,
 
     # ===== Traffic =====
     traffic_density=0.1,
@@ -20,12 +20,19 @@ from metadrive.obs.image_obs import ImageStateObservation
 from metadrive.policy.replay_policy import ReplayEgoCarPolicy
 from metadrive.utils import get_np_random
 from metadrive.utils.math import wrap_to_pi
+from metadrive.utils.step_info import InfoLevel
 
 SCENARIO_ENV_CONFIG = dict(
     # ===== Scenario Config =====
     data_directory=AssetLoader.file_path("waymo", return_raw_style=False),
     start_scenario_index=0,
     num_scenarios=3,
+    # a list of file names in the dataset summary, e.g. selected by DatasetIndex. If set, start_scenario_index and
+    # num_scenarios index this list instead of the whole dataset
+    scenario_files=None,
+    # name of a SharedScenarioStore created by the parent process. Scenarios in it are read from the shared memory
+    # instead of files, so that workers on one machine share one copy of the dataset. It requires python>=3.8
+    scenario_store=None,
     sequential_seed=False,  # Whether to set seed (the index of map) sequentially across episodes
     worker_index=0,  # Allowing multi-worker sampling with Rllib
     num_workers=1,  # Allowing multi-worker sampling with Rllib
@@ -40,6 +47,21 @@ SCENARIO_ENV_CONFIG = dict(
     store_data=True,
     need_lane_localization=True,
     no_map=False,
+    # Split the map into square tiles with this size [m]. Tiles are built and attached to the world when agents
+    # approach, instead of building the whole map at reset. None: disable map tiles
+    map_tile_size=None,
+    # tiles within this distance [m] to agents are loaded
+    map_tile_radius=100,
+    # the maximum number of tiles built in one step. The tile where an agent is located is always built immediately
+    map_tiles_per_step=2,
+    # the memory budget. The farthest unused tiles are destroyed when the number of built tiles exceeds it
+    max_map_tiles=64,
+    # Build physics bodies and visuals of lanes and lane lines only within this distance [m] to agents. The rest of the
+    # map is built when agents approach, while all lanes are available for navigation and localization at reset. It
+    # should be no less than the distance of side_detector and lane_line_detector, which scan lane lines, so that
+    # observations are the same as building the whole map. Cameras may see the unbuilt part, so it is not for image
+    # observations. It is ignored if map tiles are used. None: build the whole map at reset
+    lane_construction_radius=None,
 
     # ===== Traffic =====
     no_traffic=False,  # nothing will be generated including objects/pedestrian/vehicles
@@ -114,6 +136,18 @@ class ScenarioEnv(BaseEnv):
         if self.config["num_workers"] > 1:
             assert self.config["sequential_seed"], \
                 "If using > 1 workers, you have to allow sequential_seed for consistency!"
+        if self.config["lane_construction_radius"] is not None and self.config["map_tile_size"] is None:
+            sensor_distance = max(
+                [
+                    self.config["vehicle_config"][sensor]["distance"]
+                    for sensor in ["side_detector", "lane_line_detector"]
+                    if self.config["vehicle_config"][sensor]["num_lasers"] > 0
+                ],
+                default=0
+            )
+            assert self.config["lane_construction_radius"] >= sensor_distance, \
+                "lane_construction_radius should be no less than the detector distance {}, otherwise detectors miss " \
+                "lane lines not built yet".format(sensor_distance)
 
     def _merge_extra_config(self, config):
         # config = self.default_config().update(config, allow_add_new_key=True)
@@ -338,6 +372,10 @@ class ScenarioEnv(BaseEnv):
         elif self._is_out_of_road(vehicle):
             reward = -self.config["out_of_road_penalty"]
 
+        if self.config["info_level"] != InfoLevel.FULL:
+            # these keys will be dropped by the env
+            return reward, step_info
+
         # TODO LQY: all a callback to process these keys
         step_info["track_length"] = vehicle.navigation.reference_trajectory.length
         step_info["carsize"] = [vehicle.WIDTH, vehicle.LENGTH]
@@ -1,4 +1,5 @@
 import copy
+import heapq
 from metadrive.policy.idm_policy import TrajectoryIDMPOlicy
 from typing import Dict
 
@@ -34,6 +35,13 @@ class AgentManager(BaseManager):
 
         self.next_agent_count = 0
 
+        # Each active agent occupies a slot, i.e. a row in the stacked arrays returned by the array-mode API of MARL
+        # envs. An agent keeps its slot until it finishes, and the freed slot is reused by the next respawned agent.
+        self._agent_to_slot = {}
+        self._slots_finished_this_frame = dict()
+        self._free_slots = []
+        self.num_slots = 0
+
         # fake init. before creating engine and vehicles, it is necessary when all vehicles re-created in runtime
         self.observations = copy.copy(init_observations)  # its value is map<agent_id, obs> before init() is called
         self._init_observations = init_observations  # map <agent_id, observation>
@@ -135,6 +143,10 @@ class AgentManager(BaseManager):
         self._active_objects = {v.name: v for v in init_vehicles.values()}
         self._dying_objects = {}
         self._agents_finished_this_frame = dict()
+        self._agent_to_slot = {agent_id: slot for slot, agent_id in enumerate(init_vehicles.keys())}
+        self._slots_finished_this_frame = dict()
+        self._free_slots = []
+        self.num_slots = len(init_vehicles)
 
         # real init {obj_name: space} map
         self.observations = dict()
@@ -192,6 +204,9 @@ class AgentManager(BaseManager):
                 # move to invisible place
                 self._remove_vehicle(v)
             self._agents_finished_this_frame[agent_name] = v.name
+            slot = self._agent_to_slot.pop(agent_name)
+            self._slots_finished_this_frame[agent_name] = slot
+            heapq.heappush(self._free_slots, slot)
             self._check()
 
     def _check(self):
@@ -213,11 +228,34 @@ class AgentManager(BaseManager):
         self.observation_spaces[new_v_name] = self._init_observation_spaces["agent0"]
         self.action_spaces[new_v_name] = self._init_action_spaces["agent0"]
         self._active_objects[vehicle.name] = vehicle
+        self._agent_to_slot[agent_name] = self._get_free_slot()
         self._check()
         step_info = vehicle.before_step([0, 0])
         vehicle.set_static(False)
         return agent_name, vehicle, step_info
 
+    def _get_free_slot(self):
+        if len(self._free_slots) > 0:
+            return heapq.heappop(self._free_slots)
+        # only happens when num_agents = -1
+        self.num_slots += 1
+        return self.num_slots - 1
+
+    def get_agent_slot(self, agent_id):
+        """
+        Return the slot of an active agent or an agent finished in this frame
+        """
+        if agent_id in self._agent_to_slot:
+            return self._agent_to_slot[agent_id]
+        return self._slots_finished_this_frame[agent_id]
+
+    @property
+    def agent_slots(self):
+        """
+        Return Map<agent_id, slot> of active agents
+        """
+        return self._agent_to_slot
+
     def next_agent_id(self):
         ret = "agent{}".format(self.next_agent_count)
         self.next_agent_count += 1
@@ -247,6 +285,7 @@ class AgentManager(BaseManager):
     def before_step(self):
         # not in replay mode
         self._agents_finished_this_frame = dict()
+        self._slots_finished_this_frame = dict()
         step_infos = self.try_actuate_agent(dict(), stage="before_step")
 
         finished = set()
@@ -390,6 +429,11 @@ class AgentManager(BaseManager):
         self.observation_spaces = {}
         self.action_spaces = {}
 
+        self._agent_to_slot = {}
+        self._slots_finished_this_frame = dict()
+        self._free_slots = []
+        self.num_slots = 0
+
         self.next_agent_count = 0
         self.INITIALIZED = False
 
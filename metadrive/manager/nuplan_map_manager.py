@@ -61,8 +61,7 @@ class NuPlanMapManager(BaseManager):
     def filter_path(self, start_lanes, end_lanes):
         for start in start_lanes:
             for end in end_lanes:
-                path = self.current_map.road_network.shortest_path(start[0].index, end[0].index)
-                if len(path) > 0:
+                if self.current_map.road_network.has_route(start[0].index, end[0].index):
                     return (start[0].index, end[0].index)
         return None
 
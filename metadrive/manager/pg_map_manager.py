@@ -1,3 +1,6 @@
+import hashlib
+import json
+import os
 import pickle
 
 from tqdm import tqdm
@@ -56,7 +59,7 @@ class PGMapManager(BaseManager):
             map_config = config["map_config"]
             map_config.update({"seed": current_seed})
             map_config = self.add_random_to_map(map_config)
-            map = self.spawn_object(PGMap, map_config=map_config, random_seed=None)
+            map = self.spawn_pg_map(map_config)
             if self.engine.global_config["store_map"]:
                 self.maps[current_seed] = map
         else:
@@ -71,21 +74,82 @@ class PGMapManager(BaseManager):
             map_config[PGMap.LANE_NUM] = self.np_random.randint(PGMap.MIN_LANE_NUM, PGMap.MAX_LANE_NUM + 1)
         return map_config
 
+    def spawn_pg_map(self, map_config):
+        """
+        Create a PGMap. When map_cache_dir is set, the searched block sequence and the built geometry of blocks, i.e.
+        bullet bodies and visual nodes, are loaded from the cache if it exists. The map is then restored without
+        running BIG or building blocks again. Otherwise, the map is generated and saved to the cache.
+        The cache directory can be shared by processes, since each file is written to a temporary file at first and
+        then renamed atomically.
+        """
+        cache_dir = self.engine.global_config["map_cache_dir"]
+        if cache_dir is None:
+            return self.spawn_object(PGMap, map_config=map_config, random_seed=None)
+
+        cache_file = os.path.join(cache_dir, self._get_map_cache_file_name(map_config))
+        if os.path.exists(cache_file):
+            with open(cache_file, "rb") as file:
+                map_data = pickle.load(file)
+            return self.spawn_object(
+                PGMap,
+                map_config=self._get_map_config_from_data(map_data),
+                random_seed=None,
+                baked_blocks=map_data.get("baked_blocks", None)
+            )
+
+        map = self.spawn_object(PGMap, map_config=map_config, random_seed=None)
+        map_data = map.get_block_sequence()
+        map_data["baked_blocks"] = map.bake_blocks()
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_file = "{}.{}.tmp".format(cache_file, os.getpid())
+        with open(tmp_file, "wb+") as file:
+            pickle.dump(map_data, file)
+        os.replace(tmp_file, cache_file)
+        return map
+
+    def _get_map_cache_file_name(self, map_config):
+        """
+        Maps are identified by the map config, the random seed for BIG and the block distribution. The built geometry
+        also depends on whether visual nodes are created and whether collision shapes are merged
+        """
+        key = dict(
+            map_config=map_config.get_serializable_dict(),
+            random_seed=self.engine.global_random_seed,
+            block_dist_config=self.engine.global_config["block_dist_config"].__name__,
+            physics_only=bool(self.engine.physics_only),
+            use_render_pipeline=bool(self.engine.use_render_pipeline),
+            merge_block_collision=bool(self.engine.global_config["merge_block_collision"])
+        )
+        digest = hashlib.sha1(json.dumps(key, sort_keys=True).encode("utf-8")).hexdigest()
+        return "{}_{}.pkl".format(map_config[PGMap.SEED], digest[:16])
+
+    @staticmethod
+    def _get_map_config_from_data(map_data):
+        map_config = map_data["map_config"]
+        map_config[PGMap.GENERATE_TYPE] = MapGenerateMethod.PG_MAP_FILE
+        map_config[PGMap.GENERATE_CONFIG] = map_data[PGMap.BLOCK_SEQUENCE]
+        return map_config
+
     def generate_all_maps(self):
         """
         Call this function to generate all maps before using them
         """
         for seed in tqdm(self.maps.keys(), desc="Generate maps"):
-            config = self.engine.global_config.copy()
-            current_seed = seed
-            self.engine.seed(seed)
-            if self.maps[current_seed] is None:
-                map_config = config["map_config"]
-                map_config.update({"seed": current_seed})
-                map_config = self.add_random_to_map(map_config)
-                map = self.spawn_object(PGMap, map_config=map_config, random_seed=None)
-                self.maps[current_seed] = map
-                map.detach_from_world()
+            if self.maps[seed] is None:
+                self.maps[seed] = self.generate_map(seed)
+
+    def generate_map(self, seed):
+        """
+        Generate the map of a seed. The map is detached from the world and not stored in this manager
+        """
+        config = self.engine.global_config.copy()
+        self.engine.seed(seed)
+        map_config = config["map_config"]
+        map_config.update({"seed": seed})
+        map_config = self.add_random_to_map(map_config)
+        map = self.spawn_pg_map(map_config)
+        map.detach_from_world()
+        return map
 
     def dump_all_maps(self, file_name=None):
         """
@@ -120,11 +184,7 @@ class PGMapManager(BaseManager):
         for i in tqdm(range(self.env_num), desc="Load maps"):
             loaded_seed = i + start_seed
             map_data = loaded_map_data[loaded_seed]
-            block_sequence = map_data["block_sequence"]
-            map_config = map_data["map_config"]
-            map_config[PGMap.GENERATE_TYPE] = MapGenerateMethod.PG_MAP_FILE
-            map_config[PGMap.GENERATE_CONFIG] = block_sequence
-            map = self.spawn_object(PGMap, map_config=map_config, random_seed=None)
+            map = self.spawn_object(PGMap, map_config=self._get_map_config_from_data(map_data), random_seed=None)
             self.maps[i + self.start_seed] = map
             map.detach_from_world()
         self.reset()
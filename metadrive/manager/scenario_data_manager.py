@@ -3,6 +3,7 @@ import os
 
 import numpy as np
 
+from metadrive.component.lane.scenario_lane_table import ScenarioLaneTable
 from metadrive.manager.base_manager import BaseManager
 from metadrive.scenario.scenario_description import ScenarioDescription as SD, MetaDriveType
 from metadrive.scenario.utils import read_scenario_data, read_dataset_summary
@@ -23,9 +24,25 @@ class ScenarioDataManager(BaseManager):
         self.start_scenario_index = engine.global_config["start_scenario_index"]
 
         self._scenarios = {}
+        self._lane_tables = {}
+        store_name = engine.global_config.get("scenario_store", None)
+        self._store = None
+        if store_name is not None:
+            # multiprocessing.shared_memory requires python>=3.8
+            from metadrive.scenario.shared_store import SharedScenarioStore
+            self._store = SharedScenarioStore.attach(store_name)
 
         # Read summary file first:
-        self.summary_dict, self.summary_lookup, self.mapping = read_dataset_summary(self.directory)
+        scenario_files = engine.global_config.get("scenario_files", None)
+        # files used are checked below, so it is skipped when only a subset of a large dataset is used or scenarios are
+        # read from the shared store
+        self.summary_dict, self.summary_lookup, self.mapping = read_dataset_summary(
+            self.directory, check_file_existence=scenario_files is None and self._store is None
+        )
+        if scenario_files is not None:
+            for file in scenario_files:
+                assert file in self.summary_dict, "Can not find {} in the dataset summary".format(file)
+            self.summary_lookup = list(scenario_files)
         self.summary_lookup[:self.start_scenario_index] = [None] * self.start_scenario_index
         end_idx = self.start_scenario_index + self.num_scenarios
         self.summary_lookup[end_idx:] = [None] * (len(self.summary_lookup) - end_idx)
@@ -41,6 +58,8 @@ class ScenarioDataManager(BaseManager):
                                                               len(self.summary_lookup) - self.start_scenario_index)
 
         for p in self.summary_lookup[self.start_scenario_index:end_idx]:
+            if self._store is not None and p in self._store:
+                continue
             p = os.path.join(self.directory, self.mapping[p], p)
             assert os.path.exists(p), "No Data at path: {}".format(p)
 
@@ -55,17 +74,27 @@ class ScenarioDataManager(BaseManager):
         assert self.start_scenario_index <= i < self.start_scenario_index + self.num_scenarios, \
             "scenario index exceeds range, scenario index: {}".format(i)
         assert i < len(self.summary_lookup)
-        scenario_id = self.summary_lookup[i]
-        file_path = os.path.join(self.directory, self.mapping[scenario_id], scenario_id)
-        ret = read_scenario_data(file_path)
-        assert isinstance(ret, SD)
+        ret = self._read_scenario(self.summary_lookup[i])
         self.coverage[i] = 1
         return ret
 
+    def _read_scenario(self, scenario_id):
+        """
+        Read a scenario from the shared store if it is there, otherwise from its file
+        """
+        if self._store is not None and scenario_id in self._store:
+            ret = self._store.get_scenario(scenario_id)
+        else:
+            file_path = os.path.join(self.directory, self.mapping[scenario_id], scenario_id)
+            ret = read_scenario_data(file_path)
+        assert isinstance(ret, SD)
+        return ret
+
     def before_reset(self):
         if not self.store_data:
             assert len(self._scenarios) <= 1, "It seems you access multiple scenarios in one episode"
             self._scenarios = {}
+            self._lane_tables = {}
 
     def get_scenario(self, i, should_copy=False):
 
@@ -151,8 +180,7 @@ class ScenarioDataManager(BaseManager):
             return
 
         def _score(scenario_id):
-            file_path = os.path.join(self.directory, self.mapping[scenario_id], scenario_id)
-            scenario = read_scenario_data(file_path)
+            scenario = self._read_scenario(scenario_id)
             obj_weight = 0
 
             # calculate curvature
@@ -175,8 +203,25 @@ class ScenarioDataManager(BaseManager):
         self.summary_lookup[start:end] = [id_score[0] for id_score in id_scores]
         self.scenario_difficulty = {id_score[0]: id_score[1] for id_score in id_scores}
 
+    def get_lane_table(self, i):
+        """
+        Return the ScenarioLaneTable of the map of scenario i. It is built once and stored with the scenario
+        """
+        if i not in self._lane_tables:
+            self._lane_tables[i] = ScenarioLaneTable(self.get_scenario(i)[SD.MAP_FEATURES])
+        return self._lane_tables[i]
+
     def clear_stored_scenarios(self):
         self._scenarios = {}
+        self._lane_tables = {}
+
+    def destroy(self):
+        self._scenarios = {}
+        self._lane_tables = {}
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+        super(ScenarioDataManager, self).destroy()
 
     @property
     def current_scenario_difficulty(self):
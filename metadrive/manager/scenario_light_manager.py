@@ -12,6 +12,10 @@ logger = logging.getLogger(__file__)
 
 class ScenarioLightManager(BaseManager):
     CLEAR_LIGHTS = False
+    # light status are stored as indices of this tuple in the status array
+    LIGHT_STATUS = (
+        MetaDriveType.LIGHT_UNKNOWN, MetaDriveType.LIGHT_GREEN, MetaDriveType.LIGHT_YELLOW, MetaDriveType.LIGHT_RED
+    )
 
     def __init__(self):
         super(ScenarioLightManager, self).__init__()
@@ -21,15 +25,25 @@ class ScenarioLightManager(BaseManager):
         self.skip_missing_light = self.engine.global_config["skip_missing_light"]
         self._episode_light_data = None
 
+        # compiled light timeline. Each row is a light in _episode_light_data
+        self._light_status = None  # (num_lights, T) array of indices in LIGHT_STATUS
+        self._light_changes = None  # rows of lights whose status changes at each step
+        self._light_objs = None  # spawned light of each row, or None if it is skipped
+        self._lane_index_to_row = {}
+        self._light_step = -1  # the step of current light status
+
     def before_reset(self):
         super(ScenarioLightManager, self).before_reset()
         self._scenario_id_to_obj_id = {}
         self._lane_index_to_obj = {}
         self._obj_id_to_scenario_id = {}
+        self._lane_index_to_row = {}
+        self._light_step = -1
         self._episode_light_data = self._get_episode_light_data()
+        self._compile_light_timeline()
 
     def after_reset(self):
-        for scenario_lane_id, light_info in self._episode_light_data.items():
+        for row, (scenario_lane_id, light_info) in enumerate(self._episode_light_data.items()):
             if str(scenario_lane_id) not in self.engine.current_map.road_network.graph:
                 logger.warning("Can not find lane for this traffic light. Skip!")
                 if self.skip_missing_light:
@@ -48,8 +62,9 @@ class ScenarioLightManager(BaseManager):
             if self.engine.global_config["force_reuse_object_name"]:
                 assert scenario_lane_id == traffic_light.id, "Original id should be assigned to traffic lights"
             self._lane_index_to_obj[lane_info.lane.index] = traffic_light
-            status = light_info[SD.TRAFFIC_LIGHT_STATUS][self.episode_step]
-            traffic_light.set_status(status)
+            self._lane_index_to_row[lane_info.lane.index] = row
+            self._light_objs[row] = traffic_light
+        self._update_light_status(range(len(self._light_objs)))
 
     def _get_light_position(self, light_info):
         if SD.TRAFFIC_LIGHT_POSITION in light_info:
@@ -63,14 +78,52 @@ class ScenarioLightManager(BaseManager):
     def after_step(self, *args, **kwargs):
         if self.episode_step >= self.current_scenario_length:
             return
-
-        for scenario_light_id, light_id, in self._scenario_id_to_obj_id.items():
-            light_obj = self.spawned_objects[light_id]
-            status = self._episode_light_data[scenario_light_id][SD.TRAFFIC_LIGHT_STATUS][self.episode_step]
-            light_obj.set_status(status)
+        if self.episode_step == self._light_step + 1 and self.episode_step < len(self._light_changes):
+            # only lights whose status changes are updated
+            self._update_light_status(self._light_changes[self.episode_step])
+        else:
+            self._update_light_status(range(len(self._light_objs)))
+
+    def _update_light_status(self, rows):
+        step = self.episode_step
+        for row in rows:
+            light_obj = self._light_objs[row]
+            if light_obj is not None:
+                light_obj.set_status(self.LIGHT_STATUS[self._light_status[row, step]])
+        self._light_step = step
+
+    def _compile_light_timeline(self):
+        """
+        Convert status of all lights to a (num_lights, T) array, and find lights whose status changes at each step
+        """
+        codes = {status: code for code, status in enumerate(self.LIGHT_STATUS)}
+        num_lights = len(self._episode_light_data)
+        length = max([len(info[SD.TRAFFIC_LIGHT_STATUS]) for info in self._episode_light_data.values()], default=0)
+        self._light_status = np.zeros((num_lights, length), dtype=np.int8)
+        for row, light_info in enumerate(self._episode_light_data.values()):
+            # parse each kind of raw status only once
+            parsed = {}
+            for t, status in enumerate(light_info[SD.TRAFFIC_LIGHT_STATUS]):
+                if status not in parsed:
+                    parsed[status] = codes[MetaDriveType.parse_light_status(status, simplifying=True)]
+                self._light_status[row, t] = parsed[status]
+        steps, rows = np.nonzero(self._light_status[:, 1:].T != self._light_status[:, :-1].T)
+        # rows are sorted by steps, and lights changing at step t are rows[boundaries[t]:boundaries[t + 1]]
+        boundaries = np.searchsorted(steps + 1, np.arange(length + 1))
+        self._light_changes = [rows[boundaries[t]:boundaries[t + 1]] for t in range(length)]
+        self._light_objs = [None] * num_lights
 
     def has_traffic_light(self, lane_index):
-        return True if lane_index in self._lane_index_to_obj else False
+        return True if lane_index in self._lane_index_to_row else False
+
+    def get_light_status(self, lane_index):
+        """
+        Return the current status of the traffic light on this lane, or None if there is no light
+        """
+        row = self._lane_index_to_row.get(lane_index, None)
+        if row is None or self._light_step < 0:
+            return None
+        return self.LIGHT_STATUS[self._light_status[row, self._light_step]]
 
     @property
     def current_scenario(self):
@@ -83,8 +136,9 @@ class ScenarioLightManager(BaseManager):
     def _get_episode_light_data(self):
         ret = dict()
         for lane_id, light_info in self.current_scenario[SD.DYNAMIC_MAP_STATES].items():
-            ret[lane_id] = copy.deepcopy(light_info[SD.STATE])
-            ret[lane_id]["metadata"] = copy.deepcopy(light_info[SD.METADATA])
+            # status arrays are only read, so the scenario data is not copied
+            ret[lane_id] = dict(light_info[SD.STATE])
+            ret[lane_id]["metadata"] = light_info[SD.METADATA]
 
             if SD.TRAFFIC_LIGHT_POSITION in ret[lane_id]:
                 # Old data format where position is a 2D array with shape [T, 2]
@@ -45,6 +45,14 @@ class ScenarioMapManager(BaseManager):
             self.load_map(new_map)
         self.update_route()
 
+    def after_step(self, *args, **kwargs):
+        if self.current_map is not None and self.current_map.tile_size is not None:
+            positions = [agent.position for agent in self.engine.agents.values()]
+            self.current_map.update_tiles(positions, self.engine.global_config["map_tiles_per_step"])
+        elif self.current_map is not None and self.current_map.lane_construction_radius is not None:
+            self.current_map.update_lanes([agent.position for agent in self.engine.agents.values()])
+        return super(ScenarioMapManager, self).after_step(*args, **kwargs)
+
     def update_route(self):
         data = self.engine.data_manager.current_scenario
 
@@ -78,8 +86,7 @@ class ScenarioMapManager(BaseManager):
     def filter_path(self, start_lanes, end_lanes):
         for start in start_lanes:
             for end in end_lanes:
-                path = self.current_map.road_network.shortest_path(start[0].index, end[0].index)
-                if len(path) > 0:
+                if self.current_map.road_network.has_route(start[0].index, end[0].index):
                     return (start[0].index, end[0].index)
         return None
 
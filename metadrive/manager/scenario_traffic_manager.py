@@ -53,6 +53,16 @@ class ScenarioTrafficManager(BaseManager):
         self.idm_policy_count = 0
         self._obj_to_clean_this_frame = []
 
+        # spawn schedule, built once per episode in after_reset(). Each step only touches tracks entering a valid
+        # interval (or waiting to be spawned) and objects driven by replay policy
+        self._spawn_schedule = None
+        self._spawn_schedule_cursor = 0
+        self._pending_spawn = None
+        self._track_valid = None
+        self._track_order = None
+        self._replay_scenario_ids = None
+        self._despawn_step = None
+
         # some flags
         self.even_sample_v = self.engine.global_config["even_sample_vehicle_class"]
         self.need_default_vehicle = self.engine.global_config["default_vehicle_in_traffic"]
@@ -86,61 +96,122 @@ class ScenarioTrafficManager(BaseManager):
         self._noise_object_id = set()
         self._non_noise_object_id = set()
         self.idm_policy_count = 0
-        for scenario_id, track in self.current_traffic_data.items():
-            if scenario_id == self.sdc_scenario_id:
-                continue
-            if track["type"] == MetaDriveType.VEHICLE:
-                self.spawn_vehicle(scenario_id, track)
-            elif track["type"] == MetaDriveType.CYCLIST:
-                self.spawn_cyclist(scenario_id, track)
-            elif track["type"] == MetaDriveType.PEDESTRIAN:
-                self.spawn_pedestrian(scenario_id, track)
-            elif track["type"] in [MetaDriveType.TRAFFIC_CONE, MetaDriveType.TRAFFIC_BARRIER]:
-                cls = TrafficBarrier if track["type"] == MetaDriveType.TRAFFIC_BARRIER else TrafficCone
-                self.spawn_static_object(cls, scenario_id, track)
-            else:
-                logger.warning("Do not support {}".format(track["type"]))
+        self._replay_scenario_ids = set()
+        self._despawn_step = {}
+        self._build_spawn_schedule()
+        self._update_scheduled_objects()
 
     def after_step(self, *args, **kwargs):
         if self.episode_step < self.current_scenario_length:
             replay_done = False
-            for scenario_id, track in self.current_traffic_data.items():
-                if scenario_id == self.sdc_scenario_id:
-                    continue
-                if scenario_id not in self._scenario_id_to_obj_id:
-                    if track["type"] == MetaDriveType.VEHICLE:
-                        self.spawn_vehicle(scenario_id, track)
-                    elif track["type"] == MetaDriveType.CYCLIST:
-                        self.spawn_cyclist(scenario_id, track)
-                    elif track["type"] == MetaDriveType.PEDESTRIAN:
-                        self.spawn_pedestrian(scenario_id, track)
-                    elif track["type"] in [MetaDriveType.TRAFFIC_CONE, MetaDriveType.TRAFFIC_BARRIER]:
-                        cls = TrafficBarrier if track["type"] == MetaDriveType.TRAFFIC_BARRIER else TrafficCone
-                        self.spawn_static_object(cls, scenario_id, track)
-                    else:
-                        logger.info("Do not support {}".format(track["type"]))
-                elif self.has_policy(self._scenario_id_to_obj_id[scenario_id], ReplayTrafficParticipantPolicy):
-                    # static object will not be cleaned!
-                    policy = self.get_policy(self._scenario_id_to_obj_id[scenario_id])
-                    if policy.is_current_step_valid:
-                        policy.act()
-                    else:
-                        self._obj_to_clean_this_frame.append(scenario_id)
+            self._update_scheduled_objects()
         else:
             replay_done = True
-            # clean replay vehicle
-            for scenario_id, obj_id in self._scenario_id_to_obj_id.items():
-                if self.has_policy(obj_id, ReplayTrafficParticipantPolicy) and not self.is_static_object(obj_id):
-                    self._obj_to_clean_this_frame.append(scenario_id)
+            # clean replay vehicle, static object will not be cleaned!
+            self._obj_to_clean_this_frame.extend(
+                [
+                    scenario_id for scenario_id in self._scenario_id_to_obj_id
+                    if scenario_id in self._replay_scenario_ids
+                ]
+            )
 
         for scenario_id in list(self._obj_to_clean_this_frame):
             obj_id = self._scenario_id_to_obj_id.pop(scenario_id)
             _scenario_id = self._obj_id_to_scenario_id.pop(obj_id)
             assert _scenario_id == scenario_id
+            self._replay_scenario_ids.discard(scenario_id)
+            self._despawn_step.pop(scenario_id, None)
+            # it can be spawned again, if the track is still valid in next steps
+            self._pending_spawn.add(scenario_id)
             self.clear_objects([obj_id])
 
         return dict(default_agent=dict(replay_done=replay_done))
 
+    def _build_spawn_schedule(self):
+        """
+        Compute the steps where each track becomes valid, so that after_step() doesn't have to go through all tracks
+        """
+        spawn_funcs = {
+            MetaDriveType.VEHICLE: self.spawn_vehicle,
+            MetaDriveType.CYCLIST: self.spawn_cyclist,
+            MetaDriveType.PEDESTRIAN: self.spawn_pedestrian,
+            MetaDriveType.TRAFFIC_CONE: lambda *args: self.spawn_static_object(TrafficCone, *args),
+            MetaDriveType.TRAFFIC_BARRIER: lambda *args: self.spawn_static_object(TrafficBarrier, *args),
+        }
+        length = self.current_scenario_length
+        self._spawn_schedule = {}
+        self._spawn_schedule_cursor = 0
+        self._pending_spawn = set()
+        self._track_valid = {}
+        self._track_order = {}
+        for order, (scenario_id, track) in enumerate(self.current_traffic_data.items()):
+            if scenario_id == self.sdc_scenario_id:
+                continue
+            if track["type"] not in spawn_funcs:
+                logger.warning("Do not support {}".format(track["type"]))
+                continue
+            if self._is_filtered(scenario_id, track):
+                continue
+            valid = np.asarray(track["state"]["valid"], dtype=bool)[:length]
+            if len(valid) < length:
+                # parse_object_state() uses the last state for indices out of range
+                valid = np.concatenate([valid, np.full(length - len(valid), valid[-1] if len(valid) else False)])
+            self._track_valid[scenario_id] = valid
+            self._track_order[scenario_id] = (order, spawn_funcs[track["type"]], track)
+            start_steps = np.flatnonzero(valid & ~np.concatenate([[False], valid[:-1]]))
+            for step in start_steps:
+                self._spawn_schedule.setdefault(int(step), []).append(scenario_id)
+
+    def _is_filtered(self, scenario_id, track):
+        """
+        Objects filtered in this function will never be spawned in this episode
+        """
+        if track["type"] == MetaDriveType.VEHICLE:
+            valid_points = track["state"]["position"][np.where(track["state"]["valid"])]
+            moving = np.max(np.std(valid_points, axis=0)[:2]) > self.STATIC_THRESHOLD
+            set_to_add = self._moving_car_id if moving else self._static_car_id
+            set_to_add.add(scenario_id)
+            return self.engine.global_config["no_static_vehicles"] and scenario_id in self._static_car_id
+        elif track["type"] in [MetaDriveType.TRAFFIC_CONE, MetaDriveType.TRAFFIC_BARRIER]:
+            valid_length = np.sum(track["state"]["valid"])
+            set_to_add = self._noise_object_id if valid_length < self.MIN_VALID_FRAME_LEN else self._non_noise_object_id
+            set_to_add.add(scenario_id)
+            return scenario_id in self._noise_object_id
+        return False
+
+    def _update_scheduled_objects(self):
+        """
+        Spawn objects becoming valid at this step or failing to be spawned in previous steps, and update replayed
+        objects. Objects are processed in the order of tracks, so the result is the same as iterating all tracks
+        """
+        while self._spawn_schedule_cursor <= self.episode_step:
+            self._pending_spawn.update(self._spawn_schedule.get(self._spawn_schedule_cursor, []))
+            self._spawn_schedule_cursor += 1
+        active = self._pending_spawn | self._replay_scenario_ids
+        for scenario_id in sorted(active, key=lambda x: self._track_order[x][0]):
+            if scenario_id in self._replay_scenario_ids:
+                if self.episode_step < self._despawn_step[scenario_id]:
+                    self.get_policy(self._scenario_id_to_obj_id[scenario_id]).act()
+                else:
+                    self._obj_to_clean_this_frame.append(scenario_id)
+            elif scenario_id in self._scenario_id_to_obj_id or not self._track_valid[scenario_id][self.episode_step]:
+                self._pending_spawn.discard(scenario_id)
+            else:
+                _, spawn_func, track = self._track_order[scenario_id]
+                spawn_func(scenario_id, track)
+                if scenario_id in self._scenario_id_to_obj_id:
+                    self._pending_spawn.discard(scenario_id)
+                    if scenario_id in self._replay_scenario_ids:
+                        self._despawn_step[scenario_id] = self._get_despawn_step(scenario_id)
+
+    def _get_despawn_step(self, scenario_id):
+        """
+        The first step after current step where the track becomes invalid
+        """
+        valid = self._track_valid[scenario_id]
+        invalid_steps = np.flatnonzero(~valid[self.episode_step:])
+        return self.episode_step + int(invalid_steps[0]) if len(invalid_steps) > 0 else len(valid)
+
     @property
     def current_traffic_data(self):
         data = self.engine.data_manager.current_scenario["tracks"]
@@ -213,6 +284,7 @@ class ScenarioTrafficManager(BaseManager):
         need_reactive_traffic = self.engine.global_config["reactive_traffic"]
         if not need_reactive_traffic or v_id in self._static_car_id or not idm_ok or not length_ok:
             policy = self.add_policy(v.name, ReplayTrafficParticipantPolicy, v, track)
+            self._replay_scenario_ids.add(v_id)
             policy.act()
         else:
             idm_route = get_idm_route(track["state"]["position"][start_index:end_index][..., :2])
@@ -238,6 +310,7 @@ class ScenarioTrafficManager(BaseManager):
         self._scenario_id_to_obj_id[scenario_id] = obj.name
         self._obj_id_to_scenario_id[obj.name] = scenario_id
         policy = self.add_policy(obj.name, ReplayTrafficParticipantPolicy, obj, track)
+        self._replay_scenario_ids.add(scenario_id)
         policy.act()
 
     def spawn_cyclist(self, scenario_id, track):
@@ -254,6 +327,7 @@ class ScenarioTrafficManager(BaseManager):
         self._scenario_id_to_obj_id[scenario_id] = obj.name
         self._obj_id_to_scenario_id[obj.name] = scenario_id
         policy = self.add_policy(obj.name, ReplayTrafficParticipantPolicy, obj, track)
+        self._replay_scenario_ids.add(scenario_id)
         policy.act()
 
     def spawn_static_object(self, cls, scenario_id, track):
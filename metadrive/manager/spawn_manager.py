@@ -8,13 +8,12 @@ from panda3d.core import Vec3
 from metadrive.component.lane.straight_lane import StraightLane
 from metadrive.component.pgblock.first_block import FirstPGBlock
 from metadrive.component.vehicle.base_vehicle import BaseVehicle
-from metadrive.constants import MetaDriveType
 from metadrive.constants import CollisionGroup
 from metadrive.engine.engine_utils import get_engine
 from metadrive.manager.base_manager import BaseManager
 from metadrive.utils import Config
 from metadrive.utils.coordinates_shift import panda_vector, panda_heading
-from metadrive.utils.pg.utils import rect_region_detection
+from metadrive.utils.math import rotated_rectangles_overlap
 
 
 class SpawnManager(BaseManager):
@@ -50,6 +49,11 @@ class SpawnManager(BaseManager):
         self.need_update_spawn_places = True
         self.spawn_places_used = []  # reset every step
 
+        # occupancy of safe spawn places, which is updated once per step. See get_respawn_place_occupancy()
+        self._respawn_place_geometry = None
+        self._respawn_place_dicts = {}
+        self._respawn_place_occupancy = None
+
         target_vehicle_configs = copy.copy(self.engine.global_config["target_vehicle_configs"])
         self._init_target_vehicle_configs = target_vehicle_configs
 
@@ -70,6 +74,7 @@ class SpawnManager(BaseManager):
         return ret
 
     def reset(self):
+        self._respawn_place_occupancy = None
         # random assign spawn points
         num_agents = self.num_agents if self.num_agents is not None else len(self.available_target_vehicle_configs)
         assert len(self.available_target_vehicle_configs) > 0
@@ -159,6 +164,8 @@ class SpawnManager(BaseManager):
 
     def step(self):
         self.spawn_places_used = []
+        # vehicles will move, so the occupancy should be updated
+        self._respawn_place_occupancy = None
 
     def get_available_respawn_places(self, map, randomize=False):
         """
@@ -167,30 +174,15 @@ class SpawnManager(BaseManager):
         """
         engine = get_engine()
         ret = {}
+        occupancy = self.get_respawn_place_occupancy(map)
         for bid, bp in self.safe_spawn_places.items():
-            if bid in self.spawn_places_used:
+            if bid in self.spawn_places_used or not self._allow_respawn_at(bid):
                 continue
-            # save time calculate once
-            if not bp.get("spawn_point_position", False):
-                lane = map.road_network.get_lane(bp["config"]["spawn_lane_index"])
-                assert isinstance(lane, StraightLane), "Now we don't support respawn on circular lane"
-                long = self.RESPAWN_REGION_LONGITUDE / 2
-                spawn_point_position = lane.position(longitudinal=long, lateral=0)
-                bp.force_update(
-                    {
-                        "spawn_point_heading": np.rad2deg(lane.heading_theta_at(long)),
-                        "spawn_point_position": (spawn_point_position[0], spawn_point_position[1])
-                    }
-                )
 
-            spawn_point_position = bp["spawn_point_position"]
-            lane_heading = bp["spawn_point_heading"]
-            result = rect_region_detection(
-                engine, spawn_point_position, lane_heading, self.RESPAWN_REGION_LONGITUDE, self.RESPAWN_REGION_LATERAL,
-                CollisionGroup.Vehicle
-            )
             if (engine.global_config["debug"] or engine.global_config["debug_physics_world"]) \
                     and bp.get("need_debug", True):
+                spawn_point_position = bp["spawn_point_position"]
+                lane_heading = bp["spawn_point_heading"]
                 shape = BulletBoxShape(Vec3(self.RESPAWN_REGION_LONGITUDE / 2, self.RESPAWN_REGION_LATERAL / 2, 1))
                 vis_body = engine.render.attach_new_node(BulletGhostNode("debug"))
                 vis_body.node().addShape(shape)
@@ -200,14 +192,72 @@ class SpawnManager(BaseManager):
                 vis_body.node().setIntoCollideMask(CollisionGroup.AllOff)
                 bp.force_set("need_debug", False)
 
-            if not result.hasHit() or result.node.getName() != MetaDriveType.VEHICLE:
-                new_bp = copy.deepcopy(bp).get_dict()
+            if not occupancy[bid]:
+                # the returned config may be modified by update_destination_for(), so make a shallow copy
+                new_bp = dict(self._respawn_place_dicts[bid])
+                new_bp["config"] = dict(new_bp["config"])
                 if randomize:
                     new_bp["config"] = self._randomize_position_in_slot(new_bp["config"])
                 ret[bid] = new_bp
                 self.spawn_places_used.append(bid)
         return ret
 
+    def _allow_respawn_at(self, spawn_place_id):
+        """
+        Return False to skip a safe spawn place when looking for available respawn places
+        """
+        return True
+
+    def get_respawn_place_occupancy(self, map):
+        """
+        Return a dict mapping each safe spawn place to whether a vehicle is in its respawn region. It is computed once
+        per step with a vectorized rectangle overlap test between all respawn regions and vehicles, instead of running
+        a physics sweep test for each place every time a vehicle respawns
+        """
+        if self._respawn_place_occupancy is None:
+            ids, positions, headings = self._get_respawn_place_geometry(map)
+            vehicles = [
+                v for v in self.engine.get_objects(lambda o: isinstance(o, BaseVehicle)).values()
+                if v.dynamic_nodes.attached
+            ]
+            if len(vehicles) == 0:
+                occupied = np.zeros(len(ids), dtype=bool)
+            else:
+                region_size = np.array([[self.RESPAWN_REGION_LONGITUDE / 2, self.RESPAWN_REGION_LATERAL / 2]])
+                occupied = rotated_rectangles_overlap(
+                    positions, headings, np.repeat(region_size, len(ids), axis=0),
+                    np.array([v.position for v in vehicles]), np.array([v.heading_theta for v in vehicles]),
+                    np.array([[v.LENGTH / 2, v.WIDTH / 2] for v in vehicles])
+                ).any(axis=1)
+            self._respawn_place_occupancy = dict(zip(ids, occupied))
+        return self._respawn_place_occupancy
+
+    def _get_respawn_place_geometry(self, map):
+        """
+        Positions and headings [rad] of all safe spawn places. They are calculated once
+        """
+        if self._respawn_place_geometry is None:
+            ids = list(self.safe_spawn_places.keys())
+            for bid in ids:
+                bp = self.safe_spawn_places[bid]
+                # save time calculate once
+                if not bp.get("spawn_point_position", False):
+                    lane = map.road_network.get_lane(bp["config"]["spawn_lane_index"])
+                    assert isinstance(lane, StraightLane), "Now we don't support respawn on circular lane"
+                    long = self.RESPAWN_REGION_LONGITUDE / 2
+                    spawn_point_position = lane.position(longitudinal=long, lateral=0)
+                    bp.force_update(
+                        {
+                            "spawn_point_heading": np.rad2deg(lane.heading_theta_at(long)),
+                            "spawn_point_position": (spawn_point_position[0], spawn_point_position[1])
+                        }
+                    )
+                self._respawn_place_dicts[bid] = bp.get_dict()
+            positions = np.array([self.safe_spawn_places[bid]["spawn_point_position"] for bid in ids]).reshape(-1, 2)
+            headings = np.deg2rad([self.safe_spawn_places[bid]["spawn_point_heading"] for bid in ids])
+            self._respawn_place_geometry = (ids, positions, headings)
+        return self._respawn_place_geometry
+
     def _randomize_position_in_slot(self, target_vehicle_config):
         vehicle_config = copy.deepcopy(target_vehicle_config)
         long = self.RESPAWN_REGION_LONGITUDE - self.MAX_VEHICLE_LENGTH
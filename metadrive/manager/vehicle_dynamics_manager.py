@@ -0,0 +1,112 @@
+import math
+
+import numpy as np
+from panda3d.core import Vec3
+
+from metadrive.component.vehicle.base_vehicle import BaseVehicle
+from metadrive.component.vehicle_model.bicycle_model import KinematicBicycleModel
+from metadrive.manager.base_manager import BaseManager
+
+
+class VehicleDynamicsManager(BaseManager):
+    """
+    Move all vehicles whose dynamics_model is "kinematic_bicycle" with a vectorized kinematic bicycle model. The chassis
+    of these vehicles are kinematic bodies, so Bullet is only used for collision queries and sensors. States are
+    integrated in each physics step, and poses are written to the scene graph once the env step is finished.
+    Actions are converted to accelerations in the same way as the raycast vehicle: the engine force is applied on four
+    wheels, and the brake is an impulse applied in each physics step, which is limited by the tyre friction
+    """
+    PRIORITY = 5  # velocities should be updated before vehicles call after_step()
+    KINEMATIC_BICYCLE = "kinematic_bicycle"
+    NUM_WHEELS = 4
+    IDLE_BRAKE = 2.0  # the brake applied by BaseVehicle when throttle_brake is 0
+    GRAVITY = 9.81
+
+    def __init__(self):
+        super(VehicleDynamicsManager, self).__init__()
+        self._vehicles = None
+        self._states = None
+
+    def reset(self):
+        self._vehicles = None
+        self._states = None
+
+    def before_step(self, *args, **kwargs):
+        # actions are set in before_step() of other managers, so states are collected in the first step()
+        self._vehicles = None
+        self._states = None
+        return dict()
+
+    def step(self, *args, **kwargs):
+        if self._vehicles is None:
+            self._collect_states()
+        if len(self._vehicles) == 0:
+            return
+        s = self._states
+        s["x"], s["y"], s["heading"], s["speed"] = KinematicBicycleModel.step(
+            s["x"], s["y"], s["heading"], s["speed"], s["steering"], s["drive"], s["resistance"], s["max_speed"],
+            s["front_wheelbase"], s["rear_wheelbase"], self.engine.physics_step_size
+        )
+
+    def after_step(self, *args, **kwargs):
+        """
+        Write the new states back to vehicles once per env step, before vehicles check collisions and update sensors
+        """
+        if self._vehicles is None or len(self._vehicles) == 0:
+            return dict()
+        s = self._states
+        direction = s["heading"] + KinematicBicycleModel.slip_angle(
+            s["steering"], s["front_wheelbase"], s["rear_wheelbase"]
+        )
+        vx = s["speed"] * np.cos(direction)
+        vy = s["speed"] * np.sin(direction)
+        for i, vehicle in enumerate(self._vehicles):
+            vehicle.set_position((s["x"][i], s["y"][i]))
+            vehicle.set_heading_theta(s["heading"][i])
+            # Bullet derives the velocity of kinematic bodies from the displacement, so it is set explicitly
+            vehicle.body.setLinearVelocity(Vec3(vx[i], vy[i], 0))
+            vehicle.body.setAngularVelocity(Vec3(0, 0, 0))
+        return dict()
+
+    def _collect_states(self):
+        self._vehicles = list(
+            self.engine.get_objects(
+                lambda obj: isinstance(obj, BaseVehicle) and obj.config["dynamics_model"] == self.KINEMATIC_BICYCLE and
+                obj.dynamic_nodes.attached and not obj.body.isStatic()
+            ).values()
+        )
+        num = len(self._vehicles)
+        s = {
+            key: np.zeros((num, ))
+            for key in [
+                "x", "y", "heading", "speed", "steering", "drive", "resistance", "max_speed", "front_wheelbase",
+                "rear_wheelbase"
+            ]
+        }
+        dt = self.engine.global_config["physics_world_step_size"]
+        for i, vehicle in enumerate(self._vehicles):
+            s["x"][i], s["y"][i] = vehicle.position
+            s["heading"][i] = vehicle.heading_theta
+            heading = vehicle.heading
+            velocity = vehicle.velocity
+            speed = math.hypot(velocity[0], velocity[1])
+            s["speed"][i] = -speed if velocity[0] * heading[0] + velocity[1] * heading[1] < 0 else speed
+            s["steering"][i] = math.radians(vehicle.steering * vehicle.max_steering)
+            s["max_speed"][i] = vehicle.max_speed_m_s
+            s["front_wheelbase"][i] = vehicle.FRONT_WHEELBASE
+            s["rear_wheelbase"][i] = vehicle.REAR_WHEELBASE
+            s["drive"][i], s["resistance"][i] = self._get_acceleration(vehicle, dt)
+        self._states = s
+
+    def _get_acceleration(self, vehicle, dt):
+        """
+        Return the acceleration from the engine and the deceleration from brakes for the current throttle_brake
+        """
+        mass = vehicle.config["mass"] if vehicle.config["mass"] else vehicle.MASS
+        throttle_brake = vehicle.throttle_brake
+        engine_force = self.NUM_WHEELS * vehicle.config["max_engine_force"] * throttle_brake
+        if throttle_brake > 0 or (throttle_brake < 0 and vehicle.enable_reverse):
+            return engine_force / mass, 0.
+        brake = self.IDLE_BRAKE if throttle_brake == 0 else abs(throttle_brake) * vehicle.config["max_brake_force"]
+        max_deceleration = vehicle.config["wheel_friction"] * self.GRAVITY
+        return 0., min(self.NUM_WHEELS * brake / mass / dt, max_deceleration)
@@ -4,12 +4,7 @@ import numpy as np
 from metadrive.component.vehicle.base_vehicle import BaseVehicle
 from metadrive.obs.observation_base import ObservationBase
 from metadrive.obs.state_obs import StateObservation
-
-_cuda_enable = True
-try:
-    import cupy as cp
-except ImportError:
-    _cuda_enable = False
+from metadrive.utils.cuda import cuda_available, cp
 
 
 class ImageStateObservation(ObservationBase):
@@ -48,7 +43,7 @@ class ImageObservation(ObservationBase):
     def __init__(self, config, image_source: str, clip_rgb: bool):
         self.enable_cuda = self.global_config["image_on_cuda"]
         if self.enable_cuda:
-            assert _cuda_enable, "CuPy is not enabled"
+            assert cuda_available(), "CuPy is not enabled"
         self.STACK_SIZE = config["stack_size"]
         self.image_source = image_source
         super(ImageObservation, self).__init__(config)
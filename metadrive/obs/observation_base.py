@@ -1,5 +1,8 @@
 from abc import ABC
 
+import gymnasium as gym
+import numpy as np
+
 
 class ObservationBase(ABC):
     def __init__(self, config):
@@ -13,6 +16,26 @@ class ObservationBase(ABC):
     def observe(self, *args, **kwargs):
         raise NotImplementedError
 
+    def observe_batch(self, vehicles, observations=None, out=None):
+        """
+        Observe for a batch of vehicles and write results into one (num_vehicles, obs_dim) float32 array. Override it to
+        compute observations in vectorized passes
+        :param vehicles: a list of vehicles
+        :param observations: observation instances of these vehicles, whose states will be updated. Use self by default
+        :param out: the buffer to write. A new one is created if it is None
+        :return: the buffer. For observations not in a Box space, e.g. dict or image observations, it can not be stacked
+        into one array, and a list of observations returned by observe() is returned instead
+        """
+        observations = observations or [self] * len(vehicles)
+        if not isinstance(self.observation_space, gym.spaces.Box):
+            assert out is None, "Can not write {} to an array buffer".format(self.observation_space)
+            return [observation.observe(vehicle) for observation, vehicle in zip(observations, vehicles)]
+        if out is None:
+            out = np.zeros((len(vehicles), ) + self.observation_space.shape, dtype=np.float32)
+        for i, (observation, vehicle) in enumerate(zip(observations, vehicles)):
+            out[i] = observation.observe(vehicle)
+        return out
+
     def reset(self, env, vehicle=None):
         pass
 
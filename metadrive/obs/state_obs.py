@@ -1,6 +1,7 @@
 import gymnasium as gym
 import numpy as np
 
+from metadrive.component.vehicle_module.lidar import Lidar
 from metadrive.component.vehicle_navigation_module.node_network_navigation import NodeNetworkNavigation
 from metadrive.obs.observation_base import ObservationBase
 from metadrive.utils.math import clip, norm
@@ -61,6 +62,31 @@ class StateObservation(ObservationBase):
         ret = np.concatenate([ego_state, navi_info])
         return ret.astype(np.float32)
 
+    def observe_batch(self, vehicles, observations=None, out=None):
+        """
+        Vectorized observe(). Ego states are gathered for all vehicles at once and navigation info is written to the
+        buffer directly
+        """
+        if type(self) is not StateObservation:
+            # Subclasses may change observe(), so their observations are computed one by one
+            return super(StateObservation, self).observe_batch(vehicles, observations, out)
+        if out is None:
+            out = np.zeros((len(vehicles), ) + self.observation_space.shape, dtype=np.float32)
+        if len(vehicles) == 0:
+            return out
+        ego_state = self.vehicle_state_batch(vehicles)
+        out[:, :ego_state.shape[1]] = ego_state
+        out[:, ego_state.shape[1]:] = [vehicle.navigation.get_navi_info() for vehicle in vehicles]
+        return out
+
+    def vehicle_state_batch(self, vehicles):
+        """
+        Ego states of a batch of vehicles. Sensors and lane queries are per vehicle and dominate the cost, so states are
+        computed with vehicle_state() and stacked
+        :return: ego states in shape (num_vehicles, ego_state_dim)
+        """
+        return np.array([self.vehicle_state(vehicle) for vehicle in vehicles], dtype=float)
+
     def vehicle_state(self, vehicle):
         """
         Wrap vehicle states to list
@@ -186,13 +212,46 @@ class LidarStateObservation(ObservationBase):
         ret = self.current_observation
         return ret.astype(np.float32)
 
+    def observe_batch(self, vehicles, observations=None, out=None):
+        """
+        Vectorized observe(). The state part and the lidar part are computed for all vehicles in batch and written into
+        one (num_vehicles, obs_dim) float32 buffer. The cloud points and detected objects of each vehicle are stored in
+        its observation instance as observe() does
+        """
+        if type(self) is not LidarStateObservation:
+            # Subclasses may change observe(), so their observations are computed one by one
+            return super(LidarStateObservation, self).observe_batch(vehicles, observations, out)
+        observations = observations or [self] * len(vehicles)
+        if out is None:
+            out = np.zeros((len(vehicles), ) + self.observation_space.shape, dtype=np.float32)
+        if len(vehicles) == 0:
+            return out
+        state_dim = self.state_obs.observation_space.shape[0]
+        self.state_obs.observe_batch(vehicles, out=out[:, :state_dim])
+        lidar_vehicles = [v for v in vehicles if v.lidar.available]
+        perceive_results = dict(zip(lidar_vehicles, Lidar.perceive_batch(lidar_vehicles)))
+        for i, (observation, vehicle) in enumerate(zip(observations, vehicles)):
+            if vehicle in perceive_results:
+                other_v_info = observation.lidar_observe(vehicle, perceive_results[vehicle])
+                out[i, state_dim:] = other_v_info
+            observation.current_observation = out[i]
+        return out
+
     def state_observe(self, vehicle):
         return self.state_obs.observe(vehicle)
 
-    def lidar_observe(self, vehicle):
+    def lidar_observe(self, vehicle, perceive_result=None):
+        """
+        :param vehicle: BaseVehicle
+        :param perceive_result: (cloud_points, detected_objects) if the lidar has already perceived
+        :return: other vehicles' info + lidar points
+        """
         other_v_info = []
         if vehicle.lidar.available:
-            cloud_points, detected_objects = vehicle.lidar.perceive(vehicle, )
+            if perceive_result is None:
+                cloud_points, detected_objects = vehicle.lidar.perceive(vehicle, )
+            else:
+                cloud_points, detected_objects = perceive_result
             if self.config["lidar"]["num_others"] > 0:
                 other_v_info += vehicle.lidar.get_surrounding_vehicles_info(
                     vehicle, detected_objects, self.config["lidar"]["num_others"],
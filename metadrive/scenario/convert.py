@@ -0,0 +1,181 @@
+"""
+Convert datasets to ScenarioDescription in parallel. Inputs, like tfrecord files of Waymo or scene tokens of nuScenes,
+are sharded across a process pool. Each worker saves converted scenarios to the output folder and keeps its own
+summary and progress files, so an interrupted conversion can be resumed. At the end, summaries of all workers are
+merged into the dataset summary and mapping.
+
+Example:
+    convert_dataset(convert_func, inputs, output_path, num_workers=8)
+
+where convert_func(input, **kwargs) yields (export_file_name, scenario) pairs converted from one input.
+"""
+import copy
+import glob
+import logging
+import multiprocessing
+import os
+import pickle
+import re
+import shutil
+
+from metadrive.scenario.scenario_description import ScenarioDescription as SD
+from metadrive.utils.utils import dict_recursive_remove_array
+
+logger = logging.getLogger(__name__)
+
+
+def _atomic_dump(obj, file_path):
+    """
+    Dump to a temporary file and rename it, so readers never see a partially written file
+    """
+    tmp_file = file_path + ".tmp"
+    with open(tmp_file, "wb") as f:
+        pickle.dump(obj, f)
+    os.replace(tmp_file, file_path)
+
+
+def _load(file_path, default):
+    if not os.path.isfile(file_path):
+        return default
+    with open(file_path, "rb") as f:
+        return pickle.load(f)
+
+
+def _worker_files(output_path, suffix_format):
+    """
+    Return a dict mapping worker index to the file of that worker
+    """
+    pattern = re.compile(re.escape(suffix_format).replace(r"\{\}", r"(\d+)") + "$")
+    ret = {}
+    for file in glob.glob(os.path.join(output_path, suffix_format.format("*"))):
+        match = pattern.match(os.path.basename(file))
+        if match is not None:
+            ret[int(match.group(1))] = file
+    return ret
+
+
+def get_converted_inputs(output_path):
+    """
+    Return inputs that are already converted by workers of previous runs
+    """
+    ret = set()
+    for file in _worker_files(output_path, SD.DATASET.WORKER_PROGRESS_FILE).values():
+        ret.update(_load(file, []))
+    return ret
+
+
+def convert_shard(worker_index, convert_func, shard, output_path, convert_kwargs=None):
+    """
+    Convert a shard of inputs in one worker. The worker summary and progress are updated after each input is converted
+
+    :param worker_index: index of this worker
+    :param convert_func: convert_func(input, **convert_kwargs) yields (export_file_name, scenario) pairs
+    :param shard: inputs to convert
+    :param output_path: the folder to save scenarios and worker files
+    :param convert_kwargs: extra arguments for convert_func
+    :return: number of converted scenarios
+    """
+    convert_kwargs = convert_kwargs or {}
+    summary_file = os.path.join(output_path, SD.DATASET.WORKER_SUMMARY_FILE.format(worker_index))
+    progress_file = os.path.join(output_path, SD.DATASET.WORKER_PROGRESS_FILE.format(worker_index))
+    # append to files of the same worker in previous runs
+    summary = _load(summary_file, {})
+    converted = _load(progress_file, [])
+
+    total_scenarios = 0
+    for count, item in enumerate(shard):
+        for export_file_name, scenario in convert_func(item, **convert_kwargs):
+            if isinstance(scenario, SD):
+                scenario = scenario.to_dict()
+            SD.sanity_check(scenario, check_self_type=True)
+            with open(os.path.join(output_path, export_file_name), "wb") as f:
+                pickle.dump(scenario, f)
+            summary[export_file_name] = dict_recursive_remove_array(copy.deepcopy(scenario[SD.METADATA]))
+            total_scenarios += 1
+        converted.append(item)
+        # the summary is saved first, so an input is converted again if the worker stops between the two dumps
+        _atomic_dump(summary, summary_file)
+        _atomic_dump(converted, progress_file)
+        logger.info(
+            "Worker {}: {}/{} inputs are converted, {} scenarios in total".format(
+                worker_index, count + 1, len(shard), total_scenarios
+            )
+        )
+    return total_scenarios
+
+
+def _convert_shard(args):
+    return convert_shard(*args)
+
+
+def merge_worker_summaries(output_path):
+    """
+    Merge summaries of all workers in output_path to the dataset summary and mapping. Both files are replaced
+    atomically, so the dataset can be read during the conversion
+
+    :param output_path: the folder containing worker summaries
+    :return: the merged summary
+    """
+    summary = _load(os.path.join(output_path, SD.DATASET.SUMMARY_FILE), {})
+    for _, file in sorted(_worker_files(output_path, SD.DATASET.WORKER_SUMMARY_FILE).items()):
+        for export_file_name, metadata in _load(file, {}).items():
+            if export_file_name in summary and summary[export_file_name] != metadata:
+                logger.warning("Scenario {} is converted more than once, {} is used".format(export_file_name, file))
+            summary[export_file_name] = metadata
+    # scenarios are saved in output_path directly
+    mapping = {export_file_name: "" for export_file_name in summary}
+    _atomic_dump(mapping, os.path.join(output_path, SD.DATASET.MAPPING_FILE))
+    _atomic_dump(summary, os.path.join(output_path, SD.DATASET.SUMMARY_FILE))
+    return summary
+
+
+def convert_dataset(
+    convert_func, inputs, output_path, num_workers=8, convert_kwargs=None, resume=True, force_overwrite=False
+):
+    """
+    Convert inputs with a process pool and merge summaries of workers to the dataset summary and mapping
+
+    :param convert_func: convert_func(input, **convert_kwargs) yields (export_file_name, scenario) pairs. It should be
+    a module-level function, which can be pickled
+    :param inputs: a list of inputs, like file names or scene tokens. They are recorded in progress files and have to be
+    picklable and hashable
+    :param output_path: the folder to save the dataset
+    :param num_workers: number of processes. Inputs are converted in this process if it is 1
+    :param convert_kwargs: extra arguments for convert_func
+    :param resume: skip inputs converted in previous runs. Otherwise, the output_path should not exist
+    :param force_overwrite: remove the output_path if it exists and resume is False
+    :return: the merged summary
+    """
+    if os.path.exists(output_path) and not resume:
+        if force_overwrite:
+            shutil.rmtree(output_path)
+        else:
+            raise ValueError("Directory already exists! Abort")
+    os.makedirs(output_path, exist_ok=True)
+
+    converted = get_converted_inputs(output_path)
+    todo = [item for item in inputs if item not in converted]
+    if len(converted) > 0:
+        logger.info("Resume conversion: {} inputs are converted, {} inputs left".format(len(converted), len(todo)))
+
+    num_workers = max(min(num_workers, len(todo)), 1)
+    shards = [todo[i::num_workers] for i in range(num_workers)]
+    args = [(i, convert_func, shard, output_path, convert_kwargs) for i, shard in enumerate(shards)]
+    if num_workers == 1:
+        results = [_convert_shard(args[0])]
+    else:
+        with multiprocessing.Pool(num_workers) as pool:
+            results = pool.map(_convert_shard, args)
+    logger.info("{} scenarios are converted by {} workers".format(sum(results), num_workers))
+    summary = merge_worker_summaries(output_path)
+    logger.info("Summary is saved at: {}".format(os.path.join(output_path, SD.DATASET.SUMMARY_FILE)))
+    return summary
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Merge worker summaries to the dataset summary and mapping")
+    parser.add_argument("path", help="The folder containing scenarios and worker summaries")
+    args = parser.parse_args()
+    print("{} scenarios are merged".format(len(merge_worker_summaries(args.path))))
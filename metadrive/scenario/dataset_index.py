@@ -0,0 +1,177 @@
+"""
+A columnar index of scenario summaries, which can select scenarios of a dataset without loading scenario files.
+
+Example:
+    index = DatasetIndex.from_dataset(dataset_path)
+    files = index.select(min_num_moving_objects=10, max_length=200)
+    env = ScenarioEnv(dict(data_directory=dataset_path, scenario_files=files, num_scenarios=len(files)))
+"""
+import logging
+import os
+import pickle
+
+import numpy as np
+
+from metadrive.scenario.scenario_description import ScenarioDescription as SD
+from metadrive.scenario.utils import read_dataset_summary
+
+logger = logging.getLogger(__name__)
+
+
+def _get_sdc_summary(metadata):
+    return metadata.get(SD.SUMMARY.OBJECT_SUMMARY, {}).get(metadata.get(SD.SDC_ID, None), {})
+
+
+def _num_objects(metadata):
+    number_summary = metadata.get(SD.SUMMARY.NUMBER_SUMMARY, {})
+    # "object" is used by summaries of old versions
+    return number_summary.get(SD.SUMMARY.NUM_OBJECTS, number_summary.get("object", -1))
+
+
+def _num_moving_objects(metadata):
+    number_summary = metadata.get(SD.SUMMARY.NUMBER_SUMMARY, {})
+    if SD.SUMMARY.NUM_MOVING_OBJECTS in number_summary:
+        return number_summary[SD.SUMMARY.NUM_MOVING_OBJECTS]
+    object_summary = metadata.get(SD.SUMMARY.OBJECT_SUMMARY, None)
+    if not object_summary:
+        return -1
+    return sum(obj.get(SD.SUMMARY.MOVING_DIST, obj.get("distance", 0)) > 1 for obj in object_summary.values())
+
+
+def _sdc_moving_distance(metadata):
+    sdc_summary = _get_sdc_summary(metadata)
+    return sdc_summary.get(SD.SUMMARY.MOVING_DIST, sdc_summary.get("distance", np.nan))
+
+
+def _length(metadata):
+    return _get_sdc_summary(metadata).get(SD.SUMMARY.TRACK_LENGTH, metadata.get("track_length", -1))
+
+
+def _difficulty(metadata):
+    # the highest difficulty of tracks to predict, which is only provided by Waymo
+    tracks_to_predict = metadata.get("tracks_to_predict", None)
+    if not tracks_to_predict:
+        return np.nan
+    return max(track.get("difficulty", np.nan) for track in tracks_to_predict.values())
+
+
+class DatasetIndex:
+    """
+    Store summaries of scenarios in a dataset as columns of numpy arrays. Numeric columns can be filtered by
+    min_<column>/max_<column> and string columns by their values. Missing numbers are -1 for integer columns and nan
+    for float columns, so they are always filtered out when bounds are given
+    """
+    COLUMNS = dict(
+        num_objects=(np.int32, _num_objects),
+        num_moving_objects=(np.int32, _num_moving_objects),
+        sdc_moving_distance=(np.float32, _sdc_moving_distance),
+        length=(np.int32, _length),
+        difficulty=(np.float32, _difficulty),
+        dataset=(object, lambda metadata: metadata.get("dataset", None)),
+        map=(object, lambda metadata: metadata.get("map", None)),
+    )
+    ALIAS = dict(moving_objects="num_moving_objects", objects="num_objects", map_type="map")
+
+    def __init__(self, file_names, scenario_ids, columns):
+        """
+        :param file_names: file names of scenarios, which are keys of the dataset summary
+        :param scenario_ids: scenario ids of scenarios
+        :param columns: a dict mapping column names to arrays with the same length as file_names
+        """
+        self.file_names = np.asarray(file_names, dtype=object)
+        self.scenario_ids = np.asarray(scenario_ids, dtype=object)
+        self.columns = columns
+        for name, column in columns.items():
+            assert len(column) == len(self.file_names), "Column {} has a wrong length".format(name)
+
+    @classmethod
+    def from_summary(cls, summary_dict):
+        file_names = list(summary_dict.keys())
+        metadata = list(summary_dict.values())
+        scenario_ids = [m.get("scenario_id", m.get(SD.ID, file_name)) for file_name, m in zip(file_names, metadata)]
+        columns = {
+            name: np.array([func(m) for m in metadata], dtype=dtype)
+            for name, (dtype, func) in cls.COLUMNS.items()
+        }
+        return cls(file_names, scenario_ids, columns)
+
+    @classmethod
+    def from_dataset(cls, dataset_path, use_cache=True):
+        """
+        Build the index from the summary of a dataset. The index is saved in the dataset folder, and it is built again
+        only if the summary file is changed
+
+        :param dataset_path: the folder containing the dataset summary
+        :param use_cache: read and update the index file in the dataset folder
+        :return: DatasetIndex
+        """
+        summary_file = os.path.join(dataset_path, SD.DATASET.SUMMARY_FILE)
+        index_file = os.path.join(dataset_path, SD.DATASET.INDEX_FILE)
+        stat = os.stat(summary_file) if os.path.isfile(summary_file) else None
+        summary_version = (stat.st_size, stat.st_mtime_ns) if stat is not None else None
+        if use_cache and summary_version is not None and os.path.isfile(index_file):
+            with open(index_file, "rb") as f:
+                data = pickle.load(f)
+            if data["summary_version"] == summary_version and set(data["columns"]) == set(cls.COLUMNS):
+                return cls(data["file_names"], data["scenario_ids"], data["columns"])
+
+        summary_dict, _, _ = read_dataset_summary(dataset_path, check_file_existence=False)
+        index = cls.from_summary(summary_dict)
+        if use_cache and summary_version is not None:
+            try:
+                with open(index_file, "wb") as f:
+                    pickle.dump(
+                        dict(
+                            summary_version=summary_version,
+                            file_names=index.file_names,
+                            scenario_ids=index.scenario_ids,
+                            columns=index.columns
+                        ), f
+                    )
+            except OSError:
+                logger.warning("Can not save the dataset index to {}".format(index_file))
+        return index
+
+    def __len__(self):
+        return len(self.file_names)
+
+    def _column(self, name):
+        name = self.ALIAS.get(name, name)
+        if name not in self.columns:
+            raise ValueError("Unknown column: {}, supported: {}".format(name, list(self.columns.keys())))
+        return self.columns[name]
+
+    def mask(self, **conditions):
+        """
+        Return a boolean array of scenarios satisfying all conditions. A condition is min_<column>=value,
+        max_<column>=value, or <column>=value where value can be a list of accepted values
+        """
+        mask = np.ones(len(self), dtype=bool)
+        for key, value in conditions.items():
+            if value is None:
+                continue
+            if key.startswith("min_") or key.startswith("max_"):
+                column = self._column(key[4:])
+                mask &= (column >= value) if key.startswith("min_") else (column <= value)
+                if np.issubdtype(column.dtype, np.integer):
+                    # -1 is used for missing values
+                    mask &= column >= 0
+            elif isinstance(value, (list, tuple, set)):
+                value = set(value)
+                mask &= np.fromiter((v in value for v in self._column(key)), dtype=bool, count=len(self))
+            else:
+                mask &= self._column(key) == value
+        return mask
+
+    def select(self, **conditions):
+        """
+        Return file names of scenarios satisfying all conditions, e.g. select(min_moving_objects=10, max_length=200).
+        File names are keys of the dataset summary, which can be used as the scenario_files of ScenarioEnv
+        """
+        return self.file_names[self.mask(**conditions)].tolist()
+
+    def select_scenario_ids(self, **conditions):
+        """
+        The same as select(), but return scenario ids
+        """
+        return self.scenario_ids[self.mask(**conditions)].tolist()
@@ -113,7 +113,8 @@ Example:
 """
 import math
 import os
-from collections import defaultdict
+from collections import defaultdict, Counter
+from itertools import chain
 
 import numpy as np
 
@@ -190,6 +191,10 @@ class ScenarioDescription(dict):
     class DATASET:
         SUMMARY_FILE = "dataset_summary.pkl"  # dataset summary file name
         MAPPING_FILE = "dataset_mapping.pkl"  # store the relative path of summary file and each scenario
+        CHECK_CACHE_FILE = "dataset_check_cache.pkl"  # summary records of checked scenarios and their file hashes
+        WORKER_SUMMARY_FILE = "dataset_summary_worker{}.pkl"  # summary written by each conversion worker
+        WORKER_PROGRESS_FILE = "dataset_progress_worker{}.pkl"  # inputs converted by each conversion worker
+        INDEX_FILE = "dataset_index.pkl"  # columns of scenario summaries for selecting scenarios
 
     @classmethod
     def sanity_check(cls, scenario_dict, check_self_type=False, valid_check=False):
@@ -212,13 +217,18 @@ class ScenarioDescription(dict):
         assert isinstance(scenario_dict[cls.TRACKS], dict)
         for obj_id, obj_state in scenario_dict[cls.TRACKS].items():
             cls._check_object_state_dict(
-                obj_state, scenario_length=scenario_length, object_id=obj_id, valid_check=valid_check
+                obj_state, scenario_length=scenario_length, object_id=obj_id, valid_check=False
             )
+        if valid_check:
+            cls._check_valid_states(scenario_dict[cls.TRACKS])
 
         # Check dynamic_map_state
         assert isinstance(scenario_dict[cls.DYNAMIC_MAP_STATES], dict)
         for obj_id, obj_state in scenario_dict[cls.DYNAMIC_MAP_STATES].items():
-            cls._check_object_state_dict(obj_state, scenario_length=scenario_length, object_id=obj_id)
+            cls._check_object_state_dict(
+                obj_state, scenario_length=scenario_length, object_id=obj_id, valid_check=False
+            )
+        cls._check_valid_states(scenario_dict[cls.DYNAMIC_MAP_STATES])
 
         # Check metadata
         assert isinstance(scenario_dict[cls.METADATA], dict)
@@ -254,15 +264,8 @@ class ScenarioDescription(dict):
                 assert state_array.shape[
                     1] != 0, "Please convert all state with dim 1 to a 1D array instead of 2D array."
 
-            if state_key == "valid" and valid_check:
-                assert np.sum(state_array) >= 1, "No frame valid for this object. Consider removing it"
-
-            # check valid
-            if "valid" in obj_state[cls.STATE] and valid_check:
-                _array = state_array[..., :2] if state_key == "position" else state_array
-                assert abs(np.sum(_array[np.where(obj_state[cls.STATE]["valid"], False, True)])) < 1e-2, \
-                    "Valid array mismatches with {} array, some frames in {} have non-zero values, " \
-                    "so it might be valid".format(state_key, state_key)
+        if valid_check:
+            cls._check_valid_states({object_id: obj_state})
 
         # Check metadata
         assert isinstance(obj_state[cls.METADATA], dict)
@@ -273,6 +276,53 @@ class ScenarioDescription(dict):
         if cls.OBJECT_ID in obj_state[cls.METADATA]:
             assert obj_state[cls.METADATA][cls.OBJECT_ID] == object_id
 
+    @classmethod
+    def _check_valid_states(cls, obj_states):
+        """
+        Check that each object has valid frames, and its states are zero in invalid frames. Numeric arrays with the same
+        key and shape are stacked, so that each kind of state is checked for all objects at once
+        """
+        groups = defaultdict(lambda: ([], [], []))  # (state key, shape) -> object ids, state arrays, valid arrays
+        for object_id, obj_state in obj_states.items():
+            state_dict = obj_state[cls.STATE]
+            if "valid" not in state_dict:
+                continue
+            for state_key, state_array in state_dict.items():
+                if not isinstance(state_array, np.ndarray):
+                    continue
+                if state_array.dtype.kind not in "biuf":
+                    cls._check_valid_state(object_id, state_key, state_array, state_dict["valid"])
+                    continue
+                ids, arrays, valids = groups[(state_key, state_array.shape)]
+                ids.append(object_id)
+                arrays.append(state_array)
+                valids.append(state_dict["valid"])
+
+        for (state_key, shape), (ids, arrays, valids) in groups.items():
+            arrays = np.stack(arrays)
+            if state_key == "valid":
+                no_valid = np.sum(arrays.reshape(len(ids), -1), axis=-1) < 1
+                assert not np.any(no_valid), \
+                    "No frame valid for object {}. Consider removing it".format(ids[np.argmax(no_valid)])
+            if state_key == "position":
+                arrays = arrays[..., :2]
+            invalid = np.logical_not(np.stack(valids).astype(bool))
+            invalid = invalid.reshape(invalid.shape + (1, ) * (arrays.ndim - invalid.ndim))
+            invalid_sum = np.sum(np.where(invalid, arrays, 0).reshape(len(ids), -1), axis=-1)
+            mismatch = np.abs(invalid_sum) >= 1e-2
+            assert not np.any(mismatch), \
+                "Valid array mismatches with {} array, some frames in {} of object {} have non-zero values, " \
+                "so it might be valid".format(state_key, state_key, ids[np.argmax(mismatch)])
+
+    @staticmethod
+    def _check_valid_state(object_id, state_key, state_array, valid):
+        if state_key == "valid":
+            assert np.sum(state_array) >= 1, "No frame valid for object {}. Consider removing it".format(object_id)
+        _array = state_array[..., :2] if state_key == "position" else state_array
+        assert abs(np.sum(_array[np.where(valid, False, True)])) < 1e-2, \
+            "Valid array mismatches with {} array, some frames in {} of object {} have non-zero values, " \
+            "so it might be valid".format(state_key, state_key, object_id)
+
     def to_dict(self):
         return dict(self)
 
@@ -286,18 +336,16 @@ class ScenarioDescription(dict):
         type = state_dict["type"]
         state_dict = state_dict["state"]
         track = state_dict["position"]
-        valid_track = track[np.where(state_dict["valid"].astype(int))][..., :2]
-        distance = float(
-            sum(np.linalg.norm(valid_track[i] - valid_track[i + 1]) for i in range(valid_track.shape[0] - 1))
-        )
-        valid_length = int(sum(state_dict["valid"]))
+        valid = np.asarray(state_dict["valid"]).astype(bool)
+        valid_track = track[valid][..., :2]
+        distance = float(np.sum(np.linalg.norm(np.diff(valid_track, axis=0), axis=-1)))
+        valid_length = int(np.sum(state_dict["valid"]))
 
+        # length of the first valid segment
         continuous_valid_length = 0
-        for v in state_dict["valid"]:
-            if v:
-                continuous_valid_length += 1
-            if continuous_valid_length > 0 and not v:
-                break
+        if np.any(valid):
+            first_valid = valid[np.argmax(valid):]
+            continuous_valid_length = len(first_valid) if np.all(first_valid) else int(np.argmin(first_valid))
 
         return {
             ScenarioDescription.SUMMARY.TYPE: type,
@@ -322,14 +370,15 @@ class ScenarioDescription(dict):
     @staticmethod
     def _calculate_num_moving_objects(scenario):
         # moving object
+        moving_types = [
+            v["type"]
+            for v in scenario[ScenarioDescription.METADATA][ScenarioDescription.SUMMARY.OBJECT_SUMMARY].values()
+            if v[ScenarioDescription.SUMMARY.MOVING_DIST] > 1
+        ]
         number_summary_dict = {
-            ScenarioDescription.SUMMARY.NUM_MOVING_OBJECTS: 0,
-            ScenarioDescription.SUMMARY.NUM_MOVING_OBJECTS_EACH_TYPE: defaultdict(int)
+            ScenarioDescription.SUMMARY.NUM_MOVING_OBJECTS: len(moving_types),
+            ScenarioDescription.SUMMARY.NUM_MOVING_OBJECTS_EACH_TYPE: defaultdict(int, Counter(moving_types))
         }
-        for v in scenario[ScenarioDescription.METADATA][ScenarioDescription.SUMMARY.OBJECT_SUMMARY].values():
-            if v[ScenarioDescription.SUMMARY.MOVING_DIST] > 1:
-                number_summary_dict[ScenarioDescription.SUMMARY.NUM_MOVING_OBJECTS] += 1
-                number_summary_dict[ScenarioDescription.SUMMARY.NUM_MOVING_OBJECTS_EACH_TYPE][v["type"]] += 1
         return number_summary_dict
 
     @staticmethod
@@ -338,25 +387,21 @@ class ScenarioDescription(dict):
 
         # object
         number_summary_dict[ScenarioDescription.SUMMARY.NUM_OBJECTS] = len(scenario[ScenarioDescription.TRACKS])
-        number_summary_dict[ScenarioDescription.SUMMARY.OBJECT_TYPES
-                            ] = set(v["type"] for v in scenario[ScenarioDescription.TRACKS].values())
-        object_types_counter = defaultdict(int)
-        for v in scenario[ScenarioDescription.TRACKS].values():
-            object_types_counter[v["type"]] += 1
+        object_types_counter = Counter(v["type"] for v in scenario[ScenarioDescription.TRACKS].values())
+        number_summary_dict[ScenarioDescription.SUMMARY.OBJECT_TYPES] = set(object_types_counter)
         number_summary_dict[ScenarioDescription.SUMMARY.NUM_OBJECTS_EACH_TYPE] = dict(object_types_counter)
 
         # moving object
         number_summary_dict.update(ScenarioDescription._calculate_num_moving_objects(scenario))
 
         # Number of different dynamic object states
-        dynamic_object_states_types = set()
-        dynamic_object_states_counter = defaultdict(int)
-        for v in scenario[ScenarioDescription.DYNAMIC_MAP_STATES].values():
-            for step_state in v["state"]["object_state"]:
-                if step_state is None:
-                    continue
-                dynamic_object_states_types.add(step_state)
-                dynamic_object_states_counter[step_state] += 1
+        dynamic_object_states_counter = Counter(
+            chain.from_iterable(
+                v["state"]["object_state"] for v in scenario[ScenarioDescription.DYNAMIC_MAP_STATES].values()
+            )
+        )
+        dynamic_object_states_counter.pop(None, None)
+        dynamic_object_states_types = set(dynamic_object_states_counter)
         number_summary_dict[ScenarioDescription.SUMMARY.NUM_TRAFFIC_LIGHTS
                             ] = len(scenario[ScenarioDescription.DYNAMIC_MAP_STATES])
         number_summary_dict[ScenarioDescription.SUMMARY.NUM_TRAFFIC_LIGHT_TYPES] = dynamic_object_states_types
@@ -423,20 +468,33 @@ class ScenarioDescription(dict):
 
 
 def _recursive_check_type(obj, allow_types, depth=0):
-    if isinstance(obj, dict):
-        for k, v in obj.items():
-            assert isinstance(k, str), "Must use string to be dict keys"
-            _recursive_check_type(v, allow_types, depth=depth + 1)
-
-    if isinstance(obj, list):
-        for v in obj:
-            _recursive_check_type(v, allow_types, depth=depth + 1)
-
+    """
+    Check that obj and all items in its dicts and lists have allowed types, and all dict keys are str. Leaves are checked
+    in place without recursive calls, and items of a list are checked by the set of their types
+    """
     assert isinstance(obj, allow_types), "Object type {} not allowed! ({})".format(type(obj), allow_types)
 
     if depth > 1000:
         raise ValueError()
 
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            assert isinstance(k, str), "Must use string to be dict keys"
+            if isinstance(v, (dict, list)):
+                _recursive_check_type(v, allow_types, depth=depth + 1)
+            else:
+                assert isinstance(v, allow_types), "Object type {} not allowed! ({})".format(type(v), allow_types)
+
+    elif isinstance(obj, list):
+        item_types = set(map(type, obj))
+        if any(issubclass(item_type, (dict, list)) for item_type in item_types):
+            for v in obj:
+                _recursive_check_type(v, allow_types, depth=depth + 1)
+        else:
+            for item_type in item_types:
+                assert issubclass(item_type, allow_types), \
+                    "Object type {} not allowed! ({})".format(item_type, allow_types)
+
 
 # TODO (LQY): Remove me after paper writing
 # {
@@ -0,0 +1,206 @@
+"""
+A read-only scenario store in shared memory, so that processes on one machine, like RL workers running ScenarioEnv,
+share one copy of the dataset instead of loading scenarios to their own memory.
+
+Example:
+    store = SharedScenarioStore.create(dataset_path)  # in the parent process
+    env = ScenarioEnv(dict(data_directory=dataset_path, scenario_store=store.name))  # in workers
+    ...
+    store.close()
+    store.unlink()  # when all workers are finished
+
+Numpy arrays of scenarios are copied to one shared memory segment. The rest of each scenario, like dicts, lists and
+strings, is pickled into the same segment and unpickled in each process only when the scenario is read, with arrays
+restored as read-only views of the shared memory.
+"""
+import io
+import logging
+import os
+import pickle
+import struct
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from metadrive.scenario.scenario_description import ScenarioDescription as SD
+from metadrive.scenario.utils import read_dataset_summary
+
+logger = logging.getLogger(__name__)
+
+# the header stores the offset and size of the pickled index, which maps file names to pickled scenarios
+_HEADER = struct.Struct("QQ")
+_ALIGNMENT = 64
+
+# segments closed while their views are still used, which are kept until the process exits
+_unclosed_segments = []
+
+
+def _align(offset):
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+class _ScenarioPickler(pickle.Pickler):
+    """
+    Pickle a scenario without its numpy arrays, which are recorded with their offsets in the shared memory instead
+    """
+    def __init__(self, file, arrays, offset):
+        super(_ScenarioPickler, self).__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.arrays = arrays
+        self.offset = offset
+
+    def persistent_id(self, obj):
+        if type(obj) is not np.ndarray or obj.dtype == object:
+            return None
+        offset = _align(self.offset)
+        self.arrays.append((offset, obj))
+        self.offset = offset + obj.nbytes
+        return offset, obj.shape, obj.dtype.str
+
+
+class _ScenarioUnpickler(pickle.Unpickler):
+    """
+    Restore a scenario with read-only views of arrays in the shared memory
+    """
+    def __init__(self, file, buffer):
+        super(_ScenarioUnpickler, self).__init__(file)
+        self.buffer = buffer
+
+    def persistent_load(self, pid):
+        offset, shape, dtype = pid
+        array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=self.buffer, offset=offset)
+        array.flags.writeable = False
+        return array
+
+
+def get_process_memory():
+    """
+    Return the memory usage of this process in bytes. rss includes pages of shared memory touched by this process,
+    while uss only counts memory owned by this process, which shows the saving of the shared store
+    """
+    import psutil
+    info = psutil.Process(os.getpid()).memory_full_info()
+    return dict(rss=info.rss, uss=getattr(info, "uss", info.rss))
+
+
+class SharedScenarioStore:
+    """
+    Scenarios stored in a shared memory segment. Create it once with create() and attach to it in other processes with
+    attach(). Scenarios read from the store are ScenarioDescriptions whose arrays are read-only
+    """
+    def __init__(self, shm, owner=False):
+        self._shm = shm
+        self._owner = owner
+        index_offset, index_size = _HEADER.unpack_from(shm.buf, 0)
+        self._index = pickle.loads(shm.buf[index_offset:index_offset + index_size])
+
+    @classmethod
+    def create(cls, dataset_path, file_names=None, name=None):
+        """
+        Load scenarios of a dataset to a new shared memory segment
+
+        :param dataset_path: the folder containing the dataset summary and mapping
+        :param file_names: scenarios to load, all scenarios of the dataset by default
+        :param name: name of the segment, a random one by default
+        :return: SharedScenarioStore
+        """
+        _, files, mapping = read_dataset_summary(dataset_path)
+        file_names = files if file_names is None else file_names
+        arrays = []
+        pickled = []
+        # arrays of all scenarios are kept until they are copied to the shared memory
+        offset = _HEADER.size
+        for file_name in file_names:
+            with open(os.path.join(dataset_path, mapping[file_name], file_name), "rb") as f:
+                scenario = pickle.load(f)
+            buffer = io.BytesIO()
+            pickler = _ScenarioPickler(buffer, arrays, offset)
+            pickler.dump(dict(scenario))
+            offset = pickler.offset
+            pickled.append(buffer.getvalue())
+
+        index = {}
+        for file_name, data in zip(file_names, pickled):
+            index[file_name] = (offset, len(data))
+            offset += len(data)
+        index_data = pickle.dumps(index, protocol=pickle.HIGHEST_PROTOCOL)
+
+        shm = shared_memory.SharedMemory(name=name, create=True, size=offset + len(index_data))
+        try:
+            _HEADER.pack_into(shm.buf, 0, offset, len(index_data))
+            for array_offset, array in arrays:
+                target = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf, offset=array_offset)
+                target[...] = array
+                del target
+            for (data_offset, size), data in zip(index.values(), pickled):
+                shm.buf[data_offset:data_offset + size] = data
+            shm.buf[offset:offset + len(index_data)] = index_data
+        except Exception:
+            shm.close()
+            shm.unlink()
+            raise
+        logger.info("Load {} scenarios to shared memory {}, {:.1f} MB".format(len(index), shm.name, shm.size / 1e6))
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        """
+        Attach to a store created by another process
+        """
+        shm = shared_memory.SharedMemory(name=name)
+        if os.name == "posix":
+            # The segment is registered to the resource tracker when attached, which unlinks it when this process
+            # exits. Only the creator should unlink it
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, "shared_memory")
+        return cls(shm, owner=False)
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    @property
+    def nbytes(self):
+        return self._shm.size
+
+    @property
+    def file_names(self):
+        return list(self._index.keys())
+
+    def __contains__(self, file_name):
+        return file_name in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def get_scenario(self, file_name):
+        """
+        Return a ScenarioDescription whose arrays are read-only views of the shared memory
+        """
+        offset, size = self._index[file_name]
+        data = self._shm.buf[offset:offset + size]
+        try:
+            return SD(_ScenarioUnpickler(io.BytesIO(data), self._shm.buf).load())
+        finally:
+            data.release()
+
+    def close(self):
+        """
+        Detach from the shared memory. Scenarios read from the store should not be used after it
+        """
+        try:
+            self._shm.close()
+        except BufferError:
+            # views of the memory are still referenced somewhere, so the memory can not be released now
+            logger.debug("Shared memory {} is still used when closing the store".format(self._shm.name))
+            _unclosed_segments.append(self._shm)
+
+    def unlink(self):
+        """
+        Remove the shared memory segment. It should be called by the creator after all processes close the store
+        """
+        assert self._owner, "Only the creator can unlink the store"
+        if os.name == "posix":
+            # the registration may be removed by processes attached in the same process tree
+            from multiprocessing import resource_tracker
+            resource_tracker.register(self._shm._name, "shared_memory")
+        self._shm.unlink()
@@ -1,10 +1,10 @@
 import copy
+import hashlib
+import logging
 import os
 import pickle
 
-import matplotlib.pyplot as plt
 import numpy as np
-from matplotlib.pyplot import figure
 
 from metadrive.component.static_object.traffic_object import TrafficCone, TrafficBarrier
 from metadrive.component.traffic_light.base_traffic_light import BaseTrafficLight
@@ -21,9 +21,12 @@ NP_ARRAY_DECIMAL = 3
 VELOCITY_DECIMAL = 1  # velocity can not be set accurately
 MIN_LENGTH_RATIO = 0.8
 
+logger = logging.getLogger(__name__)
+
 
 def draw_map(map_features, show=False):
-    figure(figsize=(8, 6), dpi=500)
+    import matplotlib.pyplot as plt
+    plt.figure(figsize=(8, 6), dpi=500)
     for key, value in map_features.items():
         if value.get("type", None) == MetaDriveType.LANE_SURFACE_STREET:
             plt.scatter([x[0] for x in value["polyline"]], [y[1] for y in value["polyline"]], s=0.1)
@@ -375,6 +378,65 @@ def read_dataset_summary(file_folder, check_file_existence=True):
     return summary_dict, list(summary_dict.keys()), mapping
 
 
+def get_scenario_summary_record(scenario, file_hash=None, valid_check=False):
+    """
+    Summary record of a checked scenario, which is stored in the check cache of datasets
+    """
+    # object summaries are computed again, as they are missing or in other formats in some datasets
+    scenario = copy.copy(scenario)
+    scenario[SD.METADATA] = dict(scenario[SD.METADATA])
+    scenario[SD.METADATA][SD.SUMMARY.OBJECT_SUMMARY] = {
+        track_id: SD.get_object_summary(state_dict=track, id=track_id)
+        for track_id, track in scenario[SD.TRACKS].items()
+    }
+    return {
+        "hash": file_hash,
+        "valid_check": valid_check,
+        SD.ID: scenario[SD.ID],
+        SD.LENGTH: scenario[SD.LENGTH],
+        SD.SUMMARY.NUMBER_SUMMARY: SD.get_number_summary(scenario)
+    }
+
+
+def check_dataset(dataset_path, valid_check=False, use_cache=True):
+    """
+    Run ScenarioDescription.sanity_check() for all scenarios in a dataset and return their summary records. Records are
+    saved in the dataset folder with the hash of each file, so files not changed since the last check are skipped
+
+    :param dataset_path: the folder containing the dataset summary and mapping
+    :param valid_check: check whether states of objects are zero in invalid frames
+    :param use_cache: read and update the check cache
+    :return: a dict mapping file names to summary records
+    """
+    cache_file = os.path.join(dataset_path, SD.DATASET.CHECK_CACHE_FILE)
+    cache = {}
+    if use_cache and os.path.isfile(cache_file):
+        with open(cache_file, "rb") as f:
+            cache = pickle.load(f)
+
+    _, files, mapping = read_dataset_summary(dataset_path)
+    ret = {}
+    for file in files:
+        with open(os.path.join(dataset_path, mapping[file], file), "rb") as f:
+            content = f.read()
+        file_hash = hashlib.md5(content).hexdigest()
+        record = cache.get(file, None)
+        if record is not None and record["hash"] == file_hash and (record["valid_check"] or not valid_check):
+            ret[file] = record
+            continue
+        scenario = pickle.loads(content)
+        SD.sanity_check(scenario, valid_check=valid_check)
+        ret[file] = get_scenario_summary_record(scenario, file_hash, valid_check)
+
+    if use_cache and ret != cache:
+        try:
+            with open(cache_file, "wb") as f:
+                pickle.dump(ret, f)
+        except OSError:
+            logger.warning("Can not save the check cache to {}".format(cache_file))
+    return ret
+
+
 def get_number_of_scenarios(dataset_path):
     _, files, _ = read_dataset_summary(dataset_path)
     return len(files)
@@ -0,0 +1,73 @@
+import time
+from multiprocessing import get_context
+
+from metadrive.component.traffic_participants.pedestrian import Pedestrian
+from metadrive.component.vehicle.vehicle_type import DefaultVehicle
+from metadrive.envs.metadrive_env import MetaDriveEnv
+
+
+def process_memory():
+    import psutil
+    import os
+    process = psutil.Process(os.getpid())
+    mem_info = process.memory_info()
+    # return mb
+    return mem_info.rss / 1024 / 1024
+
+
+def benchmark_startup_and_spawn(physics_only, num_objects=200):
+    """
+    Measure the time of creating the engine and spawning objects, and the memory after spawning
+    """
+    env = MetaDriveEnv(dict(num_scenarios=1, traffic_density=0.1, physics_only=physics_only))
+    try:
+        start = time.time()
+        env.reset()
+        startup_time = time.time() - start
+
+        start = time.time()
+        objs = []
+        for i in range(num_objects):
+            objs.append(
+                env.engine.spawn_object(
+                    DefaultVehicle,
+                    vehicle_config=dict(need_navigation=False),
+                    position=[i * 2, 3.5],
+                    heading=0,
+                    force_spawn=True
+                )
+            )
+            objs.append(env.engine.spawn_object(Pedestrian, position=[i * 2, 7], heading_theta=0, force_spawn=True))
+        spawn_time = (time.time() - start) / len(objs)
+
+        start = time.time()
+        for i in range(100):
+            env.step([0, 0])
+        step_time = (time.time() - start) / 100
+        return dict(
+            physics_only=physics_only,
+            startup_time=startup_time,
+            spawn_time=spawn_time,
+            step_time=step_time,
+            memory=process_memory()
+        )
+    finally:
+        env.close()
+
+
+def benchmark_physics_only():
+    # run each setting in a new process, so that the memory and model cache won't affect each other
+    ctx = get_context("spawn")
+    for physics_only in [False, True]:
+        with ctx.Pool(1) as pool:
+            ret = pool.apply(benchmark_startup_and_spawn, (physics_only, ))
+        print(
+            "Physics only: {}, Startup: {:.3f}s, Spawn: {:.2f}ms/object, Step: {:.2f}ms, Memory: {:.1f}MB".format(
+                ret["physics_only"], ret["startup_time"], ret["spawn_time"] * 1000, ret["step_time"] * 1000,
+                ret["memory"]
+            )
+        )
+
+
+if __name__ == "__main__":
+    benchmark_physics_only()
@@ -0,0 +1,74 @@
+import multiprocessing
+import time
+
+from metadrive.engine.asset_loader import AssetLoader
+
+
+def _run_worker(args):
+    """
+    Reset a ScenarioEnv on all scenarios with them kept in memory, and return the memory usage of the worker
+    """
+    data_directory, num_scenarios, store_name = args
+    from metadrive.envs.scenario_env import ScenarioEnv
+    from metadrive.policy.replay_policy import ReplayEgoCarPolicy
+    from metadrive.scenario.shared_store import get_process_memory
+    env = ScenarioEnv(
+        dict(
+            data_directory=data_directory,
+            num_scenarios=num_scenarios,
+            scenario_store=store_name,
+            store_data=True,
+            agent_policy=ReplayEgoCarPolicy
+        )
+    )
+    try:
+        for seed in range(num_scenarios):
+            env.reset(seed=seed)
+            env.step([0, 0])
+        return get_process_memory()
+    finally:
+        env.close()
+
+
+def _report(name, memory):
+    for index, m in enumerate(memory):
+        print("{} worker {}: RSS {:.1f} MB, USS {:.1f} MB".format(name, index, m["rss"] / 1e6, m["uss"] / 1e6))
+    print(
+        "{} average: RSS {:.1f} MB, USS {:.1f} MB".format(
+            name,
+            sum(m["rss"] for m in memory) / len(memory) / 1e6,
+            sum(m["uss"] for m in memory) / len(memory) / 1e6
+        )
+    )
+
+
+def benchmark_shared_store(data_directory=None, num_workers=4):
+    """
+    Print the memory of workers reading scenarios from their own files and from a SharedScenarioStore. USS, the memory
+    owned by each worker, shows the saving, while RSS also counts the shared pages touched by the worker
+    """
+    from metadrive.scenario.shared_store import SharedScenarioStore
+    from metadrive.scenario.utils import read_dataset_summary
+    data_directory = data_directory or AssetLoader.file_path("waymo", return_raw_style=False)
+    num_scenarios = len(read_dataset_summary(data_directory)[1])
+    ctx = multiprocessing.get_context("spawn")
+
+    with ctx.Pool(num_workers) as pool:
+        memory = pool.map(_run_worker, [(data_directory, num_scenarios, None)] * num_workers, chunksize=1)
+    _report("Without store", memory)
+
+    store = SharedScenarioStore.create(data_directory)
+    print("Store size: {:.1f} MB".format(store.nbytes / 1e6))
+    try:
+        with ctx.Pool(num_workers) as pool:
+            memory = pool.map(_run_worker, [(data_directory, num_scenarios, store.name)] * num_workers, chunksize=1)
+        _report("With store", memory)
+    finally:
+        store.close()
+        store.unlink()
+
+
+if __name__ == "__main__":
+    start = time.time()
+    benchmark_shared_store()
+    print("Total benchmark time: {:.1f}s".format(time.time() - start))
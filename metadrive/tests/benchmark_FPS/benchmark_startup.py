@@ -0,0 +1,53 @@
+import subprocess
+import sys
+import time
+
+
+def _run_in_new_interpreter(code):
+    """
+    Run code in a clean interpreter, so that modules imported by this process don't affect the result
+    """
+    output = subprocess.check_output([sys.executable, "-c", code], stderr=subprocess.DEVNULL)
+    return float(output.decode().strip().split("\n")[-1])
+
+
+IMPORT_CODE = """
+import time
+start = time.time()
+import metadrive
+print(time.time() - start)
+"""
+
+CONSTRUCT_CODE = """
+import time
+start = time.time()
+from metadrive.envs.metadrive_env import MetaDriveEnv
+env = MetaDriveEnv(dict(num_scenarios=1, use_render={}))
+env.reset()
+print(time.time() - start)
+env.close()
+"""
+
+HEAVY_MODULES_CODE = """
+import sys
+import metadrive
+heavy = ["pygame", "seaborn", "matplotlib", "scipy", "cupy", "metadrive.render_pipeline.rpcore", "gltf"]
+print(" ".join([m for m in heavy if m in sys.modules]) or "None")
+"""
+
+
+def benchmark_startup(repeat=3):
+    import_time = sum([_run_in_new_interpreter(IMPORT_CODE) for _ in range(repeat)]) / repeat
+    print("Import metadrive: {:.3f}s".format(import_time))
+
+    construct_time = sum([_run_in_new_interpreter(CONSTRUCT_CODE.format(False)) for _ in range(repeat)]) / repeat
+    print("Import + construct + first reset MetaDriveEnv (no render): {:.3f}s".format(construct_time))
+
+    heavy = subprocess.check_output([sys.executable, "-c", HEAVY_MODULES_CODE], stderr=subprocess.DEVNULL)
+    print("Heavy modules loaded by import metadrive: {}".format(heavy.decode().strip().split("\n")[-1]))
+
+
+if __name__ == "__main__":
+    start = time.time()
+    benchmark_startup()
+    print("Total benchmark time: {:.1f}s".format(time.time() - start))
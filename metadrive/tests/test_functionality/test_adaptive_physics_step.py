@@ -0,0 +1,94 @@
+import numpy as np
+
+from metadrive.engine.physics_step_scheduler import PhysicsStepScheduler
+from metadrive.envs.metadrive_env import MetaDriveEnv
+
+
+def _drive(config):
+    env = MetaDriveEnv(dict(map="SSSSS", num_scenarios=1, horizon=1000, **config))
+    try:
+        env.reset()
+        trajectory = []
+        for step in range(60):
+            env.step([np.sin(step / 6) * 0.05, 1 if step < 40 else -0.5])
+            trajectory.append((*env.vehicle.position, env.vehicle.speed))
+        return np.array(trajectory)
+    finally:
+        env.close()
+
+
+def test_is_sparse():
+    positions = np.array([[0, 0], [0, 3.5], [10, 0]])
+    headings = np.zeros((3, ))
+    half_sizes = np.array([[2.25, 0.9]] * 3)
+    still = np.zeros((3, 2))
+    # vehicles in adjacent lanes are not close
+    assert PhysicsStepScheduler.is_sparse(positions, headings, half_sizes, still, 0.1, 0.5)
+    assert not PhysicsStepScheduler.is_sparse(positions, headings, half_sizes, still, 0.1, 2)
+    # the first vehicle reaches the third one
+    assert not PhysicsStepScheduler.is_sparse(
+        positions, headings, half_sizes, np.array([[60, 0], [0, 0], [0, 0]]), 0.1, 0.5
+    )
+    # the third vehicle reverses into the first one
+    assert not PhysicsStepScheduler.is_sparse(
+        positions, headings, half_sizes, np.array([[0, 0], [0, 0], [-60, 0]]), 0.1, 0.5
+    )
+    # the third vehicle drives away from the first one
+    assert PhysicsStepScheduler.is_sparse(
+        positions, headings, half_sizes, np.array([[0, 0], [0, 0], [60, 0]]), 0.1, 0.5
+    )
+    # the first vehicle slides sideways into the second one
+    assert not PhysicsStepScheduler.is_sparse(
+        positions, headings, half_sizes, np.array([[0, 20], [0, 0], [0, 0]]), 0.1, 0.5
+    )
+
+
+def test_near_map_bodies():
+    env = MetaDriveEnv(dict(map="S", num_scenarios=1, traffic_density=0, adaptive_physics_step=True))
+    try:
+        env.reset()
+        states = PhysicsStepScheduler.get_object_states(env.engine)
+        assert not PhysicsStepScheduler.is_near_map_bodies(env.engine.physics_world, *states, 0.1, 0.5)
+        assert PhysicsStepScheduler.schedule(env.engine, 5) == (2, 0.05)
+        # drive to the sidewalk on the right side
+        positions, headings, half_sizes, velocities = states
+        lateral = np.array([np.sin(headings[0]), -np.cos(headings[0])])
+        velocities = velocities + lateral * env.vehicle.dist_to_right_side / 0.1
+        assert PhysicsStepScheduler.is_near_map_bodies(
+            env.engine.physics_world, positions, headings, half_sizes, velocities, 0.1, 0.5
+        )
+        env.vehicle.set_position(env.vehicle.position + lateral * (env.vehicle.dist_to_right_side - 0.5))
+        assert PhysicsStepScheduler.schedule(env.engine, 5) == (5, 0.02)
+    finally:
+        env.close()
+
+
+def test_adaptive_physics_step():
+    fixed = _drive(dict(traffic_density=0))
+    adaptive = _drive(dict(traffic_density=0, adaptive_physics_step=True))
+    assert not np.array_equal(fixed, adaptive), "large physics steps are not used"
+    error = np.abs(fixed - adaptive)
+    assert np.max(error[:, :2]) < 1 and np.max(error[:, 2]) < 0.5
+
+
+def test_close_objects_use_fixed_step():
+    env = MetaDriveEnv(dict(map="S", num_scenarios=1, traffic_density=0.1, adaptive_physics_step=True))
+    try:
+        env.reset()
+        assert PhysicsStepScheduler.schedule(env.engine, 5) == (2, 0.05)
+        other = [v for v in env.engine.traffic_manager.spawned_objects.values()][0]
+        other.set_position(env.vehicle.position + np.array([0, 2]))
+        other.set_heading_theta(env.vehicle.heading_theta)
+        assert PhysicsStepScheduler.schedule(env.engine, 5) == (5, 0.02)
+        env.config["adaptive_physics_step"] = False
+        other.set_position(env.vehicle.position + np.array([100, 0]))
+        assert PhysicsStepScheduler.schedule(env.engine, 5) == (5, 0.02)
+    finally:
+        env.close()
+
+
+if __name__ == '__main__':
+    test_is_sparse()
+    test_near_map_bodies()
+    test_adaptive_physics_step()
+    test_close_objects_use_fixed_step()
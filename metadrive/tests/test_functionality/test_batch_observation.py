@@ -0,0 +1,95 @@
+import gymnasium as gym
+import numpy as np
+
+from metadrive.component.vehicle_module.lidar import Lidar
+from metadrive.envs.marl_envs import MultiAgentRoundaboutEnv
+from metadrive.envs.metadrive_env import MetaDriveEnv
+from metadrive.obs.state_obs import LidarStateObservation
+
+
+def _check_batch_observation(env, get_actions, num_steps=100):
+    try:
+        env.reset(seed=0)
+        last_agent_ids = list(env.vehicles.keys())
+        for step in range(num_steps):
+            obs, r, tm, tc, info = env.step(get_actions(env))
+            agent_ids = list(env.vehicles.keys())
+            vehicles = [env.vehicles[agent_id] for agent_id in agent_ids]
+            observations = [env.observations[agent_id] for agent_id in agent_ids]
+            batch = observations[0].observe_batch(vehicles, observations)
+            assert batch.dtype == np.float32
+            for i, (observation, vehicle) in enumerate(zip(observations, vehicles)):
+                np.testing.assert_array_equal(batch[i], observation.observe(vehicle))
+            objs = [v.lidar.get_surrounding_objects(v) for v in vehicles]
+            masks = Lidar._get_lidar_masks(vehicles, objs, vehicles[0].lidar.num_lasers)
+            for mask, vehicle, vehicle_objs in zip(masks, vehicles, objs):
+                np.testing.assert_array_equal(mask, vehicle.lidar._get_lidar_mask(vehicle, vehicle_objs)[0])
+
+            # returned by the env with batch_observation=True. Skip the steps when vehicles are removed or respawned
+            if env.config["is_multi_agent"]:
+                if not any(tm.values()) and set(last_agent_ids) == set(agent_ids):
+                    for agent_id, o in zip(agent_ids, batch):
+                        np.testing.assert_array_equal(obs[agent_id], o)
+            else:
+                np.testing.assert_array_equal(obs, batch[0])
+            last_agent_ids = agent_ids
+            if tm is True or tc is True or (isinstance(tm, dict) and tm["__all__"]):
+                break
+    finally:
+        env.close()
+
+
+def test_batch_observation_multi_agent():
+    env = MultiAgentRoundaboutEnv(
+        dict(
+            num_agents=20,
+            batch_observation=True,
+            random_agent_model=True,
+            vehicle_config=dict(lidar=dict(num_others=4, add_others_navi=True))
+        )
+    )
+    _check_batch_observation(env, lambda e: {k: [0.0, 1.0] for k in e.vehicles})
+
+
+def test_batch_observation_single_agent():
+    env = MetaDriveEnv(
+        dict(
+            batch_observation=True,
+            traffic_density=0.3,
+            vehicle_config=dict(
+                lidar=dict(num_others=4), side_detector=dict(num_lasers=30), lane_line_detector=dict(num_lasers=12)
+            )
+        )
+    )
+    _check_batch_observation(env, lambda e: [0.1, 1.0])
+
+
+class _DictObservation(LidarStateObservation):
+    @property
+    def observation_space(self):
+        return gym.spaces.Dict({"state": super(_DictObservation, self).observation_space})
+
+    def observe(self, vehicle):
+        return {"state": super(_DictObservation, self).observe(vehicle)}
+
+
+def test_batch_observation_dict_space():
+    env = MetaDriveEnv(dict(traffic_density=0.0))
+    try:
+        env.reset(seed=0)
+        env.step([0.0, 1.0])
+        observation = _DictObservation(env.vehicle.config)
+        # observations in a dict space can not be stacked, so observe() results are returned in a list
+        batch = observation.observe_batch([env.vehicle, env.vehicle])
+        assert isinstance(batch, list) and len(batch) == 2
+        for o in batch:
+            assert observation.observation_space.contains(o)
+            np.testing.assert_array_equal(o["state"], observation.observe(env.vehicle)["state"])
+    finally:
+        env.close()
+
+
+if __name__ == '__main__':
+    test_batch_observation_multi_agent()
+    test_batch_observation_single_agent()
+    test_batch_observation_dict_space()
@@ -0,0 +1,77 @@
+import copy
+import os
+import pickle
+import shutil
+import tempfile
+
+import numpy as np
+import pytest
+
+from metadrive.engine.asset_loader import AssetLoader
+from metadrive.scenario.scenario_description import ScenarioDescription as SD
+from metadrive.scenario.utils import check_dataset, read_dataset_summary, read_scenario_data
+
+
+def test_valid_check():
+    dataset = AssetLoader.file_path("waymo", return_raw_style=False)
+    _, files, mapping = read_dataset_summary(dataset)
+    scenario = read_scenario_data(os.path.join(dataset, mapping[files[0]], files[0])).to_dict()
+    # clear states in invalid frames, so that the valid check can pass
+    for track in scenario[SD.TRACKS].values():
+        invalid = np.logical_not(track[SD.STATE]["valid"].astype(bool))
+        for key, array in track[SD.STATE].items():
+            if key != "valid" and isinstance(array, np.ndarray):
+                array[invalid] = 0
+    SD.sanity_check(scenario, check_self_type=True, valid_check=True)
+
+    broken = copy.deepcopy(scenario)
+    track_id, track = next(
+        (k, v) for k, v in broken[SD.TRACKS].items() if not np.all(v[SD.STATE]["valid"].astype(bool))
+    )
+    invalid_frame = np.argmin(track[SD.STATE]["valid"].astype(bool))
+    track[SD.STATE]["heading"][invalid_frame] = 1
+    with pytest.raises(AssertionError, match="heading array.*object {}".format(track_id)):
+        SD.sanity_check(broken, valid_check=True)
+    SD.sanity_check(broken, valid_check=False)
+
+    broken = copy.deepcopy(scenario)
+    for array in broken[SD.TRACKS][track_id][SD.STATE].values():
+        array[:] = 0
+    with pytest.raises(AssertionError, match="No frame valid for object {}".format(track_id)):
+        SD.sanity_check(broken, valid_check=True)
+
+    broken = copy.deepcopy(scenario)
+    broken[SD.MAP_FEATURES][next(iter(broken[SD.MAP_FEATURES]))]["polyline"] = [[0.0, 1.0], object()]
+    with pytest.raises(AssertionError, match="not allowed"):
+        SD.sanity_check(broken)
+
+
+def test_check_dataset():
+    with tempfile.TemporaryDirectory() as dataset:
+        shutil.copytree(AssetLoader.file_path("waymo", return_raw_style=False), dataset, dirs_exist_ok=True)
+        records = check_dataset(dataset)
+        _, files, mapping = read_dataset_summary(dataset)
+        assert set(records) == set(files)
+        for file, record in records.items():
+            scenario = read_scenario_data(os.path.join(dataset, mapping[file], file))
+            assert record[SD.ID] == scenario[SD.ID]
+            assert record[SD.SUMMARY.NUMBER_SUMMARY][SD.SUMMARY.NUM_OBJECTS] == len(scenario[SD.TRACKS])
+        assert os.path.isfile(os.path.join(dataset, SD.DATASET.CHECK_CACHE_FILE))
+
+        # change one file, and the others are read from the cache
+        file_path = os.path.join(dataset, mapping[files[0]], files[0])
+        with open(file_path, "rb") as f:
+            scenario = pickle.load(f)
+        scenario[SD.TRACKS].pop(next(iter(scenario[SD.TRACKS])))
+        with open(file_path, "wb") as f:
+            pickle.dump(scenario, f)
+        new_records = check_dataset(dataset)
+        assert new_records[files[0]]["hash"] != records[files[0]]["hash"]
+        assert new_records[files[0]][SD.SUMMARY.NUMBER_SUMMARY][SD.SUMMARY.NUM_OBJECTS] == len(scenario[SD.TRACKS])
+        for file in files[1:]:
+            assert new_records[file] == records[file]
+
+
+if __name__ == '__main__':
+    test_valid_check()
+    test_check_dataset()
@@ -0,0 +1,59 @@
+import copy
+import os
+import tempfile
+
+import pytest
+
+from metadrive.engine.asset_loader import AssetLoader
+from metadrive.scenario.convert import convert_dataset, get_converted_inputs
+from metadrive.scenario.scenario_description import ScenarioDescription as SD
+from metadrive.scenario.utils import read_dataset_summary, read_scenario_data
+
+_dataset = AssetLoader.file_path("waymo", return_raw_style=False)
+
+
+def _convert_func(source, num_copies, fail_on=None):
+    # a synthetic converter making copies of a scenario in the waymo asset with new ids
+    if source == fail_on:
+        raise ValueError("Fail to convert {}".format(source))
+    _, files, mapping = read_dataset_summary(_dataset)
+    scenario = read_scenario_data(os.path.join(_dataset, mapping[files[0]], files[0])).to_dict()
+    for i in range(num_copies):
+        new_scenario = copy.copy(scenario)
+        new_scenario[SD.ID] = "{}_{}".format(source, i)
+        new_scenario[SD.METADATA] = dict(scenario[SD.METADATA], source_file=source)
+        yield SD.get_export_file_name("test", "v0", new_scenario[SD.ID]), new_scenario
+
+
+def test_convert_dataset():
+    inputs = ["file_{}".format(i) for i in range(5)]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_path = os.path.join(tmp_dir, "converted")
+        # the second worker stops at file_3 after converting file_1, while the first worker finishes its shard
+        with pytest.raises(ValueError):
+            convert_dataset(
+                _convert_func, inputs, output_path, num_workers=2, convert_kwargs=dict(num_copies=2, fail_on="file_3")
+            )
+        assert get_converted_inputs(output_path) == {"file_0", "file_1", "file_2", "file_4"}
+
+        summary = convert_dataset(_convert_func, inputs, output_path, num_workers=2, convert_kwargs=dict(num_copies=2))
+        assert get_converted_inputs(output_path) == set(inputs)
+        assert len(summary) == 10
+        summary, files, mapping = read_dataset_summary(output_path)
+        assert len(files) == 10 and all(mapping[file] == "" for file in files)
+        for file in files:
+            scenario = read_scenario_data(os.path.join(output_path, file))
+            assert summary[file]["source_file"] == scenario[SD.ID].rsplit("_", 1)[0]
+
+        # nothing is converted again
+        assert len(convert_dataset(_convert_func, inputs, output_path, convert_kwargs=dict(num_copies=3))) == 10
+        with pytest.raises(ValueError):
+            convert_dataset(_convert_func, inputs, output_path, resume=False, convert_kwargs=dict(num_copies=1))
+        summary = convert_dataset(
+            _convert_func, inputs, output_path, resume=False, force_overwrite=True, convert_kwargs=dict(num_copies=1)
+        )
+        assert len(summary) == 5 and len(read_dataset_summary(output_path)[1]) == 5
+
+
+if __name__ == '__main__':
+    test_convert_dataset()
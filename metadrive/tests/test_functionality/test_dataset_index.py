@@ -0,0 +1,44 @@
+import os
+import shutil
+import tempfile
+
+from metadrive.engine.asset_loader import AssetLoader
+from metadrive.envs.scenario_env import ScenarioEnv
+from metadrive.scenario.dataset_index import DatasetIndex
+from metadrive.scenario.scenario_description import ScenarioDescription as SD
+from metadrive.scenario.utils import read_dataset_summary
+
+
+def test_dataset_index():
+    with tempfile.TemporaryDirectory() as dataset:
+        shutil.copytree(AssetLoader.file_path("waymo", return_raw_style=False), dataset, dirs_exist_ok=True)
+        summary, files, _ = read_dataset_summary(dataset)
+        index = DatasetIndex.from_dataset(dataset)
+        assert os.path.isfile(os.path.join(dataset, SD.DATASET.INDEX_FILE))
+        assert len(index) == len(files) and index.select() == files
+        assert index.select(dataset="waymo") == files and index.select(dataset=["nuplan", "nuscenes"]) == []
+
+        num_objects = index.columns["num_objects"]
+        threshold = sorted(num_objects)[1]
+        selected = index.select(min_objects=threshold)
+        assert selected == [f for f, n in zip(files, num_objects) if n >= threshold] and len(selected) == 2
+        lengths = index.columns["length"]
+        assert all(length > 0 for length in lengths)
+        assert index.select(max_length=max(lengths), min_moving_objects=1) == files
+        assert index.select(max_length=min(lengths) - 1) == []
+        assert index.select_scenario_ids(min_objects=threshold) == [summary[f]["scenario_id"] for f in selected]
+
+        # read from the cache
+        assert DatasetIndex.from_dataset(dataset).select(min_objects=threshold) == selected
+
+        env = ScenarioEnv(dict(data_directory=dataset, scenario_files=selected, num_scenarios=len(selected)))
+        try:
+            for seed in range(len(selected)):
+                env.reset(seed=seed)
+                assert env.engine.data_manager.current_scenario_file_name == selected[seed]
+        finally:
+            env.close()
+
+
+if __name__ == '__main__':
+    test_dataset_index()
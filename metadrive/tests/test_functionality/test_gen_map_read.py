@@ -1,30 +1,36 @@
+import pathlib
 import pickle
+import tempfile
 
 import tqdm
 
 from metadrive.envs.metadrive_env import MetaDriveEnv
 from metadrive.utils import recursive_equal, setup_logger
+from metadrive.utils.pg.generate_maps import generate_maps_in_parallel
 
 
-def test_gen_map_read():
+def test_gen_map_read(tmp_path):
     env_num = 3
     generate_config = {"num_scenarios": env_num, "start_seed": 0}
     restore_config = {"num_scenarios": env_num, "start_seed": 0}
+    map_file = str(tmp_path / "test_10maps.pickle")
 
     setup_logger(debug=True)
+    env = MetaDriveEnv(generate_config)
     try:
-        env = MetaDriveEnv(generate_config)
         env.reset()
-        data = env.engine.map_manager.dump_all_maps(file_name="test_10maps.pickle")
+        data = env.engine.map_manager.dump_all_maps(file_name=map_file)
+    finally:
         env.close()
 
-        # Check load
-        with open("test_10maps.pickle", "rb") as f:
-            restored_data = pickle.load(f)
+    # Check load
+    with open(map_file, "rb") as f:
+        restored_data = pickle.load(f)
 
-        env = MetaDriveEnv(restore_config)
+    env = MetaDriveEnv(restore_config)
+    try:
         env.reset()
-        env.engine.map_manager.load_all_maps("test_10maps.pickle")
+        env.engine.map_manager.load_all_maps(map_file)
 
         for i in range(env_num):
             m = env.maps[i + restore_config["start_seed"]].get_meta_data()
@@ -45,5 +51,34 @@ def test_gen_map_read():
         env.close()
 
 
+def test_gen_map_in_parallel(tmp_path):
+    env_num = 5
+    config = {"num_scenarios": env_num, "start_seed": 3}
+    parallel_file = str(tmp_path / "test_parallel_maps.pickle")
+    data = generate_maps_in_parallel(parallel_file, config, num_workers=2, chunk_size=2)
+    assert list(data.keys()) == list(range(3, 3 + env_num))
+
+    env = MetaDriveEnv(config)
+    try:
+        env.reset()
+        sequential_data = env.engine.map_manager.dump_all_maps(file_name=str(tmp_path / "test_sequential_maps.pickle"))
+    finally:
+        env.close()
+    recursive_equal(data, sequential_data, need_assert=True)
+
+    env = MetaDriveEnv(config)
+    try:
+        env.reset()
+        env.engine.map_manager.load_all_maps(parallel_file)
+        for seed in range(3, 3 + env_num):
+            env.reset(seed=seed)
+            m = env.current_map.get_meta_data()
+            recursive_equal(m["block_sequence"], data[seed]["block_sequence"], need_assert=True)
+            for i in range(10):
+                env.step(env.action_space.sample())
+    finally:
+        env.close()
+
+
 if __name__ == "__main__":
-    test_gen_map_read()
+    test_gen_map_read(pathlib.Path(tempfile.mkdtemp()))
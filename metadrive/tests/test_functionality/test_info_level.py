@@ -0,0 +1,67 @@
+import pytest
+
+from metadrive.constants import TerminationState
+from metadrive.envs.marl_envs import MultiAgentIntersectionEnv
+from metadrive.envs.metadrive_env import MetaDriveEnv
+from metadrive.utils.step_info import StepInfoRecords
+
+
+def _run(info_level):
+    env = MetaDriveEnv(dict(num_scenarios=2, traffic_density=0.2, info_level=info_level))
+    try:
+        ret = []
+        infos = []
+        for seed in range(2):
+            env.reset(seed=seed)
+            for step in range(300):
+                o, r, tm, tc, info = env.step([0.1, 1.0])
+                ret.append((o.tolist(), r, tm, tc))
+                infos.append(dict(info))
+                if tm or tc:
+                    break
+            if info_level == "none":
+                # records do not have fields that are not reported
+                with pytest.raises(KeyError):
+                    info["cost"]
+        return ret, infos
+    finally:
+        env.close()
+
+
+def test_info_level():
+    result, full_infos = _run("full")
+    minimal_result, minimal_infos = _run("minimal")
+    none_result, none_infos = _run("none")
+    assert result == minimal_result == none_result
+    for full, minimal, none in zip(full_infos, minimal_infos, none_infos):
+        assert set(minimal.keys()) == set(StepInfoRecords.DTYPE.names)
+        assert set(none.keys()) == set(StepInfoRecords.TERMINATION_FIELDS)
+        for key in StepInfoRecords.TERMINATION_FIELDS:
+            assert full.get(key, False) == minimal[key] == none[key]
+        for key in ["cost", "episode_reward", "episode_length"]:
+            assert full[key] == minimal[key]
+            assert key not in none
+    assert any(info[TerminationState.OUT_OF_ROAD] or info[TerminationState.CRASH] for info in minimal_infos)
+
+
+def test_info_level_multi_agent():
+    env = MultiAgentIntersectionEnv(dict(num_agents=20, horizon=100, info_level="minimal"))
+    try:
+        env.reset(seed=0)
+        total_episode_length = 0
+        for step in range(150):
+            o, r, tm, tc, info = env.step({k: [0.0, 1.0] for k in env.vehicles})
+            assert set(info.keys()) == set(o.keys())
+            for agent_id, agent_info in info.items():
+                if tm[agent_id]:
+                    total_episode_length += agent_info["episode_length"]
+            if tm["__all__"]:
+                break
+        assert total_episode_length > 0
+    finally:
+        env.close()
+
+
+if __name__ == '__main__':
+    test_info_level()
+    test_info_level_multi_agent()
@@ -0,0 +1,71 @@
+import numpy as np
+
+from metadrive.component.vehicle_model.bicycle_model import KinematicBicycleModel
+from metadrive.envs.marl_envs import MultiAgentRoundaboutEnv
+from metadrive.envs.metadrive_env import MetaDriveEnv
+
+
+def _drive(dynamics_model):
+    env = MetaDriveEnv(
+        dict(map="SSSS", traffic_density=0, num_scenarios=1, vehicle_config=dict(dynamics_model=dynamics_model))
+    )
+    try:
+        env.reset()
+        speeds = []
+        for step in range(30):
+            env.step([0, 1])
+            speeds.append(env.vehicle.speed)
+        position = env.vehicle.position
+        for step in range(10):
+            env.step([0, -1])
+        return np.array(speeds), position, env.vehicle.speed
+    finally:
+        env.close()
+
+
+def test_kinematic_bicycle_model():
+    x, y, heading, speed = [np.zeros((2, )) for _ in range(4)]
+    speed[:] = 10
+    steering = np.array([0., 0.3])
+    for _ in range(10):
+        x, y, heading, speed = KinematicBicycleModel.step(
+            x, y, heading, speed, steering, np.zeros((2, )), np.zeros((2, )), np.full((2, ), 20.), 1., 1.5, 0.02
+        )
+    assert np.allclose([x[0], y[0], heading[0]], [2, 0, 0])
+    assert heading[1] > 0 and y[1] > 0 and x[1] < 2
+    # brakes never reverse the vehicle
+    new_speed = KinematicBicycleModel.step(
+        x, y, heading, speed, steering, np.zeros((2, )), np.full((2, ), 1000.), speed + 1, 1., 1.5, 0.02
+    )[-1]
+    assert np.all(new_speed == 0)
+
+
+def test_kinematic_bicycle_env():
+    bullet_speeds, bullet_position, _ = _drive("bullet")
+    speeds, position, speed_after_brake = _drive("kinematic_bicycle")
+    # the engine force is converted to the same acceleration
+    assert np.allclose(speeds, bullet_speeds, atol=0.5)
+    assert np.linalg.norm(position - bullet_position) < 2
+    assert speed_after_brake < 1e-3
+
+
+def test_kinematic_bicycle_crash():
+    env = MultiAgentRoundaboutEnv(dict(num_agents=20, vehicle_config=dict(dynamics_model="kinematic_bicycle")))
+    try:
+        env.reset()
+        assert "vehicle_dynamics_manager" in env.engine.managers
+        crash = False
+        for step in range(300):
+            o, r, tm, tc, info = env.step({k: [1, 1] for k in env.vehicles})
+            crash = crash or any([i.get("crash_vehicle", False) for i in info.values()])
+            if tm["__all__"]:
+                break
+        assert crash
+    finally:
+        env.close()
+
+
+if __name__ == '__main__':
+    test_kinematic_bicycle_model()
+    test_kinematic_bicycle_env()
+    test_kinematic_bicycle_crash()
@@ -0,0 +1,29 @@
+import subprocess
+import sys
+
+CODE = """
+import sys
+import metadrive
+heavy = ["pygame", "seaborn", "matplotlib", "scipy", "cupy", "metadrive.render_pipeline.rpcore", "gltf"]
+print("loaded:" + ",".join([m for m in heavy if m in sys.modules]))
+"""
+
+
+def test_lazy_import():
+    """
+    Importing metadrive should not import the heavy or optional dependencies
+    """
+    output = subprocess.check_output([sys.executable, "-c", CODE], stderr=subprocess.DEVNULL)
+    loaded = output.decode().strip().split("\n")[-1]
+    assert loaded == "loaded:", "{} are imported with metadrive".format(loaded)
+
+    # lazily loaded envs are still accessible
+    from metadrive import TopDownMetaDrive
+    from metadrive.envs import TopDownMetaDriveEnvV2
+    from metadrive.envs.top_down_env import TopDownMetaDrive as TopDownEnv
+    assert TopDownMetaDrive is TopDownEnv
+    assert TopDownMetaDriveEnvV2 is not None
+
+
+if __name__ == '__main__':
+    test_lazy_import()
@@ -0,0 +1,69 @@
+import pytest
+
+from metadrive.engine.asset_loader import AssetLoader
+from metadrive.envs.scenario_env import ScenarioEnv
+from metadrive.policy.replay_policy import ReplayEgoCarPolicy
+
+
+def _run(config):
+    env = ScenarioEnv(
+        dict(
+            data_directory=AssetLoader.file_path("waymo", return_raw_style=False),
+            num_scenarios=2,
+            agent_policy=ReplayEgoCarPolicy,
+            # detectors scan lane lines within 50m, which are built lazily
+            vehicle_config=dict(
+                side_detector=dict(num_lasers=12, distance=50), lane_line_detector=dict(num_lasers=12, distance=50)
+            ),
+            **config
+        )
+    )
+    try:
+        ret = []
+        visited = set()
+        for seed in [0, 1, 0]:
+            o, _ = env.reset(seed=seed)
+            ret.append(o.tolist())
+            block = env.current_map.blocks[0]
+            if config.get("lane_construction_radius", None) is not None:
+                # all lanes exist for navigation, while only some of them are built
+                assert len(env.current_map.road_network.get_all_lanes()) == len(block.block_network.graph)
+                # a stored map is reused with lanes built in previous episodes
+                assert block.num_pending_items > 0 or (config["store_map"] and seed in visited)
+            visited.add(seed)
+            for step in range(100):
+                o, r, tm, tc, info = env.step([0, 0])
+                ret.append((o.tolist(), env.vehicle.lane_index, info["out_of_road"], info["crash"]))
+
+            if config.get("lane_construction_radius", None) is not None and block.num_pending_items > 0:
+                # pending lanes far from the ego car are built and attached when it approaches them
+                num_pending_items = block.num_pending_items
+                num_bodies = env.engine.physics_world.static_world.getNumRigidBodies()
+                env.current_map.update_lanes([(1e5, 1e5)])
+                assert block.num_pending_items == num_pending_items
+                assert env.current_map.update_lanes(block._pending_bounding_boxes[:, [0, 2]]) == num_pending_items
+                assert block.num_pending_items == 0
+                assert env.engine.physics_world.static_world.getNumRigidBodies() > num_bodies
+        return ret
+    finally:
+        env.close()
+
+
+def test_lazy_lane_construction():
+    result = _run(dict(store_map=False))
+    # observations, including side detector and lane line detector cloud points, are the same as building the whole map
+    lazy_result = _run(dict(store_map=False, lane_construction_radius=50))
+    assert result == lazy_result
+    stored_lazy_result = _run(dict(store_map=True, lane_construction_radius=50))
+    assert result == stored_lazy_result
+
+
+def test_lane_construction_radius_check():
+    # detectors would miss lane lines out of the radius
+    with pytest.raises(AssertionError):
+        _run(dict(store_map=False, lane_construction_radius=30))
+
+
+if __name__ == '__main__':
+    test_lazy_lane_construction()
+    test_lane_construction_radius_check()
@@ -0,0 +1,84 @@
+import os
+import tempfile
+
+import numpy as np
+
+from metadrive.component.map.pg_map import MapGenerateMethod, PGMap
+from metadrive.engine.physics_node import BaseRigidBodyNode, BaseGhostBodyNode
+from metadrive.envs.metadrive_env import MetaDriveEnv
+from metadrive.utils import recursive_equal
+
+
+def _get_block_sequences(config):
+    env = MetaDriveEnv(config)
+    try:
+        ret = {}
+        for seed in range(config["num_scenarios"]):
+            env.reset(seed=seed)
+            ret[seed] = env.current_map.get_block_sequence()
+            ret[seed]["map_type"] = env.current_map.config[PGMap.GENERATE_TYPE]
+            bodies = []
+            for block in env.current_map.blocks:
+                for node in block.static_nodes:
+                    # python wrappers of bodies are found from bullet nodes in contact and ray test results
+                    wrapper = node.getPythonTag(node.getName())
+                    object_name = None
+                    if isinstance(wrapper, (BaseRigidBodyNode, BaseGhostBodyNode)):
+                        object_name = wrapper.base_object_name
+                    bodies.append((type(wrapper).__name__, object_name, node.getName(), node.getNumShapes()))
+            ret[seed]["bodies"] = bodies
+            trajectory = []
+            for i in range(30):
+                o, r, tm, tc, info = env.step([0.3, 1])
+                trajectory.append((*env.vehicle.position, env.vehicle.lane_index, info["out_of_road"]))
+            ret[seed]["trajectory"] = trajectory
+        return ret
+    finally:
+        env.close()
+
+
+def _test_map_cache(merge_block_collision):
+    env_num = 3
+    with tempfile.TemporaryDirectory() as cache_dir:
+        config = {
+            "num_scenarios": env_num,
+            "start_seed": 0,
+            "map": 4,
+            "map_cache_dir": cache_dir,
+            "traffic_density": 0.0,
+            "merge_block_collision": merge_block_collision
+        }
+        generated = _get_block_sequences(config)
+        assert len(os.listdir(cache_dir)) == env_num
+        loaded = _get_block_sequences(config)
+        assert len(os.listdir(cache_dir)) == env_num
+
+        for seed in range(env_num):
+            assert generated[seed].pop("map_type") == MapGenerateMethod.BIG_BLOCK_NUM
+            assert loaded[seed].pop("map_type") == MapGenerateMethod.PG_MAP_FILE
+            for data in [generated[seed], loaded[seed]]:
+                data["map_config"].pop(PGMap.GENERATE_TYPE)
+                data["map_config"].pop(PGMap.GENERATE_CONFIG)
+            # restored bodies are the same as built ones, so the vehicle drives in the same way
+            assert generated[seed].pop("bodies") == loaded[seed].pop("bodies")
+            generated_trajectory, loaded_trajectory = generated[seed].pop("trajectory"), loaded[seed].pop("trajectory")
+            for generated_state, loaded_state in zip(generated_trajectory, loaded_trajectory):
+                assert np.allclose(generated_state[:2], loaded_state[:2])
+                assert generated_state[2:] == loaded_state[2:]
+            recursive_equal(generated[seed], loaded[seed], need_assert=True)
+
+        # different map config should not hit the cache
+        _get_block_sequences(dict(config, num_scenarios=1, map=2))
+        assert len(os.listdir(cache_dir)) == env_num + 1
+
+
+def test_map_cache():
+    _test_map_cache(merge_block_collision=False)
+
+
+def test_map_cache_merged_collision():
+    _test_map_cache(merge_block_collision=True)
+
+
+if __name__ == "__main__":
+    test_map_cache()
@@ -0,0 +1,135 @@
+import math
+import os
+import tempfile
+
+import cv2
+import numpy as np
+
+from metadrive.constants import DrivableAreaProperty, MapTerrainSemanticColor, MetaDriveType
+from metadrive.engine.asset_loader import AssetLoader
+from metadrive.envs.metadrive_env import MetaDriveEnv
+from metadrive.envs.scenario_env import ScenarioEnv
+
+
+def _get_map_images(config, seeds):
+    env = MetaDriveEnv(config)
+    try:
+        ret = []
+        for seed in seeds:
+            env.reset(seed=seed)
+            m = env.current_map
+            semantic = m.get_semantic_map(
+                size=128, pixels_per_meter=4, polyline_thickness=2, layer=["lane", "lane_line"]
+            )
+            height = m.get_height_map(512, 1, 2)
+            ret.append((semantic, height))
+        return ret
+    finally:
+        env.close()
+
+
+def test_map_image_cache():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        config = dict(num_scenarios=2, map=3, map_image_cache_dir=cache_dir)
+        drawn = _get_map_images(config, [0, 1])
+        assert len(os.listdir(cache_dir)) == 4
+        loaded = _get_map_images(config, [1, 0])
+        assert len(os.listdir(cache_dir)) == 4
+        no_cache = _get_map_images(dict(num_scenarios=2, map=3), [0])
+
+        for (semantic, height), (cached_semantic, cached_height) in zip(drawn, loaded[::-1]):
+            assert np.array_equal(semantic, cached_semantic)
+            assert np.array_equal(height, cached_height)
+        assert np.array_equal(no_cache[0][0], drawn[0][0])
+        assert np.array_equal(no_cache[0][1], drawn[0][1])
+        # drivable area is enlarged
+        assert np.sum(drawn[0][1] > 0) > np.sum(drawn[0][0][..., 1] > 0) / 16
+
+
+def test_height_map_per_polygon(monkeypatch):
+    # polygons are buffered one by one with shapely 1.x, which gives the same height maps
+    from metadrive.component.map import base_map
+    height = _get_map_images(dict(num_scenarios=2, map=3), [0, 1])
+    monkeypatch.setattr(base_map, "_SHAPELY_2", False)
+    per_polygon_height = _get_map_images(dict(num_scenarios=2, map=3), [0, 1])
+    for (_, h), (_, per_polygon_h) in zip(height, per_polygon_height):
+        assert np.array_equal(h, per_polygon_h)
+
+
+def _draw_semantic_map_per_shape(m, size, pixels_per_meter, line_sample_interval, polyline_thickness):
+    # rasterize polygons and polylines one by one in the order of map features
+    all_lanes = m.get_map_features(interval=line_sample_interval)
+    polygons = []
+    polylines = []
+    points_to_skip = math.floor(DrivableAreaProperty.STRIPE_LENGTH * 2 / line_sample_interval)
+    for obj in all_lanes.values():
+        if MetaDriveType.is_lane(obj["type"]):
+            polygons.append((obj["polygon"], MapTerrainSemanticColor.get_color(obj["type"])))
+        elif MetaDriveType.is_road_line(obj["type"]) or MetaDriveType.is_sidewalk(obj["type"]):
+            if MetaDriveType.is_broken_line(obj["type"]):
+                for index in range(0, len(obj["polyline"]) - 1, points_to_skip * 2):
+                    if index + points_to_skip < len(obj["polyline"]):
+                        polylines.append(
+                            (
+                                [obj["polyline"][index], obj["polyline"][index + points_to_skip]],
+                                MapTerrainSemanticColor.get_color(obj["type"])
+                            )
+                        )
+            else:
+                polylines.append((obj["polyline"], MapTerrainSemanticColor.get_color(obj["type"])))
+
+    size = int(size * pixels_per_meter)
+    mask = np.zeros([size, size, 4], dtype=np.float32)
+    mask[..., 0:] = MapTerrainSemanticColor.get_color(MetaDriveType.GROUND)
+    center_p = m.get_center_point()
+    for polygon, color in polygons:
+        points = [
+            [
+                int((p[0] - center_p[0]) * pixels_per_meter + size / 2),
+                int((p[1] - center_p[1]) * pixels_per_meter) + size / 2
+            ] for p in polygon
+        ]
+        cv2.fillPoly(mask, np.array([points]).astype(np.int32), color=color)
+    for line, color in polylines:
+        points = [
+            [
+                int((p[0] - center_p[0]) * pixels_per_meter + size / 2),
+                int((p[1] - center_p[1]) * pixels_per_meter) + size / 2
+            ] for p in line
+        ]
+        cv2.polylines(mask, np.array([points]).astype(np.int32), False, color, polyline_thickness)
+    return mask
+
+
+def test_scenario_map_image_cache():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = ScenarioEnv(
+            dict(
+                data_directory=AssetLoader.file_path("waymo", return_raw_style=False),
+                num_scenarios=3,
+                map_image_cache_dir=cache_dir
+            )
+        )
+        try:
+            for seed in range(3):
+                env.reset(seed=seed)
+                m = env.current_map
+                # the center point of scenario maps can be numpy scalars
+                center_p = m.get_center_point()
+                m.get_center_point = lambda: (np.float64(center_p[0]), np.float32(center_p[1]))
+                m._semantic_map = None
+                semantic = m.get_semantic_map(size=256, pixels_per_meter=4, polyline_thickness=2)
+                expected = _draw_semantic_map_per_shape(
+                    m, size=256, pixels_per_meter=4, line_sample_interval=2, polyline_thickness=2
+                )
+                assert np.array_equal(semantic, expected)
+                m._semantic_map = None
+                assert np.array_equal(m.get_semantic_map(size=256, pixels_per_meter=4, polyline_thickness=2), expected)
+                del m.get_center_point
+        finally:
+            env.close()
+        assert len(os.listdir(cache_dir)) >= 3
+
+
+if __name__ == "__main__":
+    test_map_image_cache()
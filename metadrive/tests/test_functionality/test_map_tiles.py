@@ -0,0 +1,113 @@
+import numpy as np
+
+from metadrive.component.map.nuplan_map import NuPlanMap
+from metadrive.component.scenario_block.scenario_block import ScenarioBlock
+from metadrive.engine.asset_loader import AssetLoader
+from metadrive.engine.scene_cull import SceneCull
+from metadrive.envs.scenario_env import ScenarioEnv
+from metadrive.policy.replay_policy import ReplayEgoCarPolicy
+from metadrive.type import MetaDriveType
+from metadrive.utils.pg.utils import ray_localization
+
+
+def _run(config):
+    env = ScenarioEnv(
+        dict(
+            data_directory=AssetLoader.file_path("waymo", return_raw_style=False),
+            num_scenarios=2,
+            agent_policy=ReplayEgoCarPolicy,
+            **config
+        )
+    )
+    try:
+        ret = []
+        for seed in [0, 1, 0]:
+            env.reset(seed=seed)
+            for step in range(100):
+                o, r, tm, tc, info = env.step([0, 0])
+                # lanes under the ego car are built, even if most parts of them are in other tiles
+                lanes = ray_localization(env.vehicle.heading, env.vehicle.position, env.engine, False, True)[0]
+                lane_ids = sorted({lane[1] for lane in lanes})
+                ret.append((env.vehicle.lane_index, info["out_of_road"], info["crash"], lane_ids))
+                if config.get("map_tile_size", None) is not None:
+                    # tiles in use are never destroyed, even if the budget is exceeded
+                    num_attached = sum([block.static_nodes.attached for block in env.current_map.blocks])
+                    assert env.current_map.num_created_tiles <= max(config["max_map_tiles"], num_attached)
+        return ret
+    finally:
+        env.close()
+
+
+def test_map_tiles():
+    result = _run(dict())
+    tile_result = _run(dict(map_tile_size=50, map_tile_radius=30, max_map_tiles=6, map_tiles_per_step=1))
+    assert result == tile_result
+    # only tiles under agents are built, so lanes crossing tile borders have to be in all tiles they overlap
+    small_tile_result = _run(dict(map_tile_size=20, map_tile_radius=0, max_map_tiles=64, map_tiles_per_step=1))
+    assert result == small_tile_result
+
+
+def test_nuplan_city_map_lazy_blocks(monkeypatch):
+    """
+    With load_city_map, NuPlanMap builds the bodies of a block when it is attached for the first time. nuplan-devkit is
+    not required, as the city map is made of blocks with one lane of a Waymo map each
+    """
+    env = ScenarioEnv(
+        dict(data_directory=AssetLoader.file_path("waymo", return_raw_style=False), num_scenarios=1, store_map=False)
+    )
+    try:
+        env.reset()
+        engine = env.engine
+        scenario = engine.data_manager.current_scenario
+        monkeypatch.setattr(scenario, "map_api", None, raising=False)
+        monkeypatch.setitem(engine.global_config._config, "load_city_map", True)
+        monkeypatch.setitem(engine.global_config._config, "scenario_radius", 50)
+
+        def _generate(self):
+            lanes = {k: v for k, v in scenario["map_features"].items() if MetaDriveType.is_lane(v["type"])}
+            for index, lane_id in enumerate(lanes):
+                block = ScenarioBlock(index, self.road_network, 0, 0, True, map_features={lane_id: lanes[lane_id]})
+                block.construct_block(
+                    engine.worldNP, engine.physics_world, attach_to_world=False, create_in_world=False
+                )
+                self.blocks.append(block)
+
+        monkeypatch.setattr(NuPlanMap, "_generate", _generate)
+        built = []
+        create_in_world = ScenarioBlock._create_in_world
+
+        def _create_in_world(self, *args, **kwargs):
+            built.append(self.name)
+            return create_in_world(self, *args, **kwargs)
+
+        monkeypatch.setattr(ScenarioBlock, "_create_in_world", _create_in_world)
+        env.current_map.detach_from_world()
+        city_map = NuPlanMap(map_name="city", nuplan_center=(0, 0), radius=1e4)
+        try:
+            assert len(built) == 0
+            num_bodies = engine.physics_world.static_world.getNumRigidBodies()
+            positions = scenario.get_sdc_track()["state"]["position"]
+            for center in [positions[0][:2], positions[-1][:2], positions[0][:2]]:
+                city_map.detach_from_world()
+                city_map.attach_to_world(np.asarray(center))
+                nearby = [
+                    block for block in city_map.blocks
+                    if not SceneCull.out_of_bounding_box(block.bounding_box, center, city_map.cull_dist)
+                ]
+                assert 0 < len(nearby) < len(city_map.blocks)
+                assert city_map.attached_blocks == nearby
+                assert set(city_map.road_network.graph) == {lane for b in nearby for lane in b.block_network.graph}
+                # only blocks around the center have bodies in the physics world
+                num_nearby_bodies = sum(len(block.static_nodes) for block in nearby)
+                assert engine.physics_world.static_world.getNumRigidBodies() == num_bodies + num_nearby_bodies
+            # each block is built once, when it is attached for the first time
+            assert len(built) == len(set(built)) == len(city_map._created_blocks) < len(city_map.blocks)
+        finally:
+            city_map.detach_from_world()
+            city_map.destroy()
+    finally:
+        env.close()
+
+
+if __name__ == '__main__':
+    test_map_tiles()
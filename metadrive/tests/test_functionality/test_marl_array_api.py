@@ -0,0 +1,109 @@
+import numpy as np
+
+from metadrive.envs.marl_envs import MultiAgentRoundaboutEnv
+
+
+def _run(config, num_steps=300, num_episodes=2):
+    env = MultiAgentRoundaboutEnv(config)
+    try:
+        num_final_obs = 0
+        for episode in range(num_episodes):
+            obs, info = env.reset_array(seed=0)
+            assert obs.shape[0] == env.agent_manager.num_slots == len(env.vehicles)
+            assert info["active_mask"].all() and all(agent_id is not None for agent_id in info["agent_ids"])
+            for step in range(num_steps):
+                last_slots = {agent_id: slot for slot, agent_id in enumerate(info["agent_ids"]) if agent_id is not None}
+                obs, reward, terminated, truncated, info = env.step_array(np.tile([0.0, 1.0], (len(obs), 1)))
+                num_slots = env.agent_manager.num_slots
+                assert len(obs) == len(reward) == len(terminated) == len(info["agent_ids"]) == num_slots
+                assert info["active_mask"].sum() == len(env.vehicles)
+                for slot, agent_id in enumerate(info["agent_ids"]):
+                    if agent_id is None:
+                        continue
+                    # slots are stable
+                    assert last_slots.get(agent_id, slot) == slot
+                    assert env.agent_manager.agent_slots[agent_id] == slot
+                    assert obs[slot].shape == env.observation_space[agent_id].shape
+                for agent_id, slot in last_slots.items():
+                    if agent_id not in env.vehicles:
+                        assert terminated[slot] or truncated[slot]
+                for step_info in info["step_infos"]:
+                    if step_info is not None and "final_observation" in step_info:
+                        num_final_obs += 1
+                if info["all_done"]:
+                    break
+        return num_final_obs
+    finally:
+        env.close()
+
+
+def _collect(config, array_mode, num_steps=150):
+    """
+    Per-agent returns of each step, collected from the dict API or the array-mode API
+    """
+    env = MultiAgentRoundaboutEnv(config)
+    # respawn places are chosen randomly
+    env._DEBUG_RANDOM_SEED = 0
+    try:
+        ret = []
+        if array_mode:
+            obs, info = env.reset_array(seed=0)
+            ret.append({agent_id: obs[slot].copy() for slot, agent_id in enumerate(info["agent_ids"]) if agent_id})
+        else:
+            obs, info = env.reset(seed=0)
+            ret.append(obs)
+        for step in range(num_steps):
+            if array_mode:
+                last_agent_ids = info["agent_ids"]
+                obs, reward, terminated, truncated, info = env.step_array(np.tile([0.0, 1.0], (len(obs), 1)))
+                step_ret = {}
+                for slot, step_info in enumerate(info["step_infos"]):
+                    last_agent_id = last_agent_ids[slot] if slot < len(last_agent_ids) else None
+                    if last_agent_id is not None:
+                        final_obs = step_info.get("final_observation", obs[slot])
+                        step_ret[last_agent_id] = (final_obs.copy(), reward[slot], terminated[slot])
+                    agent_id = info["agent_ids"][slot]
+                    if agent_id is not None and agent_id != last_agent_id:
+                        # respawned agent
+                        step_ret[agent_id] = (obs[slot].copy(), 0.0, info["all_done"])
+                ret.append((step_ret, info["all_done"]))
+                if info["all_done"]:
+                    break
+            else:
+                obs, reward, terminated, truncated, info = env.step({k: [0.0, 1.0] for k in env.vehicles})
+                ret.append(({k: (obs[k], reward[k], terminated[k]) for k in obs}, terminated["__all__"]))
+                if terminated["__all__"]:
+                    break
+        return ret
+    finally:
+        env.close()
+
+
+def test_marl_array_api_consistency():
+    config = dict(num_agents=20, horizon=100, delay_done=0, force_seed_spawn_manager=True)
+    dict_result = _collect(config, array_mode=False)
+    array_result = _collect(config, array_mode=True)
+    assert len(dict_result) == len(array_result)
+    # agents are respawned, and may take slots freed in the same step
+    assert any(agent_id not in dict_result[0] for step, _ in dict_result[1:] for agent_id in step)
+    assert dict_result[0].keys() == array_result[0].keys()
+    assert all(np.allclose(dict_result[0][k], array_result[0][k]) for k in dict_result[0])
+    for (dict_step, dict_all_done), (array_step, array_all_done) in zip(dict_result[1:], array_result[1:]):
+        assert dict_all_done == array_all_done
+        assert dict_step.keys() == array_step.keys()
+        for agent_id, (obs, reward, terminated) in dict_step.items():
+            assert np.allclose(obs, array_step[agent_id][0])
+            assert np.isclose(reward, array_step[agent_id][1])
+            assert terminated == array_step[agent_id][2]
+
+
+def test_marl_array_api():
+    _run(dict(num_agents=20, horizon=200))
+    # slots of finished agents are reused by respawned agents in the same step
+    assert _run(dict(num_agents=20, horizon=200, delay_done=0)) > 0
+    # infinite agents
+    _run(dict(num_agents=-1, horizon=100, delay_done=0), num_steps=100)
+
+
+if __name__ == '__main__':
+    test_marl_array_api()
@@ -0,0 +1,44 @@
+import numpy as np
+
+from metadrive.envs.metadrive_env import MetaDriveEnv
+from metadrive.utils.pg.utils import ray_localization
+
+
+def _run(merge_block_collision):
+    env = MetaDriveEnv(
+        dict(num_scenarios=2, map="SCrRX", traffic_density=0.1, merge_block_collision=merge_block_collision)
+    )
+    try:
+        num_bodies = []
+        trajectory = []
+        for seed in range(2):
+            env.reset(seed=seed)
+            num_bodies.append(sum([len(b.static_nodes) + len(b.dynamic_nodes) for b in env.current_map.blocks]))
+            for step in range(200):
+                o, r, tm, tc, info = env.step([0.05, 0.5])
+                v = env.vehicle
+                lanes = ray_localization(v.heading, v.position, env.engine, use_heading_filter=False)
+                trajectory.append(
+                    (
+                        tuple(np.round(v.position, 3)), v.lane_index, tuple([lane[1] for lane in lanes]),
+                        info["out_of_road"], info["crash_vehicle"]
+                    )
+                )
+                if tm or tc:
+                    break
+        return num_bodies, trajectory
+    finally:
+        env.close()
+
+
+def test_merge_block_collision():
+    bodies, trajectory = _run(False)
+    merged_bodies, merged_trajectory = _run(True)
+    for num, merged_num in zip(bodies, merged_bodies):
+        assert merged_num * 10 < num, "Collision shapes are not merged"
+    # lanes are still localized and lines still take effect
+    assert trajectory == merged_trajectory
+
+
+if __name__ == '__main__':
+    test_merge_block_collision()
@@ -0,0 +1,78 @@
+from panda3d.core import GeomNode, NodePath, Texture
+
+from metadrive.component.static_object.traffic_object import TrafficCone
+from metadrive.component.vehicle.base_vehicle import BaseVehicle
+from metadrive.component.vehicle.vehicle_type import DefaultVehicle
+from metadrive.engine.asset_loader import AssetLoader
+from metadrive.envs.metadrive_env import MetaDriveEnv
+
+
+class _FakeLoader:
+    """
+    Return a node with one empty geometry for each model, so that objects build their models without a window
+    """
+    loader = None
+
+    def __init__(self):
+        self.num_loaded_models = 0
+
+    def loadModel(self, path):
+        self.num_loaded_models += 1
+        model = NodePath("model")
+        model.attachNewNode(GeomNode("geometry"))
+        return model
+
+    def loadTexture(self, path):
+        return Texture()
+
+
+def test_model_instancing(monkeypatch):
+    num_objects = 3
+    env = MetaDriveEnv(dict(map="S", num_scenarios=1, traffic_density=0))
+    try:
+        env.reset()
+        engine = env.engine
+        loader = _FakeLoader()
+        # objects created from now on load their models with the fake loader
+        monkeypatch.setattr(AssetLoader, "loader", loader)
+        monkeypatch.setitem(engine.global_config._config, "physics_only", False)
+        monkeypatch.setattr(BaseVehicle, "model_collection", {})
+        monkeypatch.setattr(TrafficCone, "MODEL", None)
+        lane_index = env.vehicle.lane_index
+        for episode in range(3):
+            vehicles = [
+                engine.spawn_object(
+                    DefaultVehicle, vehicle_config=dict(spawn_lane_index=lane_index, spawn_longitude=10 * (i + 1))
+                ) for i in range(num_objects)
+            ]
+            cones = [
+                engine.spawn_object(TrafficCone, position=[10 * i, 20], heading_theta=0) for i in range(num_objects)
+            ]
+            assert all(obj.render for obj in vehicles + cones)
+            wheel_models = [model for key, model in BaseVehicle.model_collection.items() if isinstance(key, tuple)]
+            assert len(wheel_models) == 4
+            # each shared model is instanced under all objects
+            for model in wheel_models + [TrafficCone.MODEL]:
+                assert model.node().getNumParents() == num_objects
+            for vehicle in vehicles:
+                assert len(vehicle._wheel_models) == 4
+                assert all(
+                    wheel_model.node() in [m.node() for m in wheel_models] for wheel_model in vehicle._wheel_models
+                )
+
+            engine.clear_objects([obj.id for obj in vehicles + cones], force_destroy=True)
+            # destroying objects keeps the geometry of shared models
+            for model in wheel_models + [TrafficCone.MODEL]:
+                assert model.node().getNumParents() == 0
+                assert model.getNumChildren() == 1 and model.getChild(0).node().isGeomNode()
+        # 4 wheel models, 1 vehicle model and 1 cone model are loaded once
+        assert loader.num_loaded_models == 6
+    finally:
+        env.close()
+    assert len(BaseVehicle.model_collection) == 0
+    assert TrafficCone.MODEL is None
+
+
+if __name__ == '__main__':
+    import pytest
+    pytest.main([__file__])
@@ -0,0 +1,61 @@
+from metadrive.engine.object_pool import ObjectPool
+from metadrive.envs.metadrive_env import MetaDriveEnv
+
+
+class _Object:
+    def __init__(self, class_name):
+        self.class_name = class_name
+
+
+def test_object_pool_capacity():
+    pool = ObjectPool(max_size=4, trim_window=2)
+    objs = []
+    for _ in range(3):
+        assert pool.get("A") is None
+        pool.on_spawn("A")
+        objs.append(_Object("A"))
+    for obj in objs:
+        assert pool.release(obj)
+    assert pool.num_stored("A") == 3 and pool.capacity("A") == 3
+    assert len(pool.end_episode()) == 0
+
+    # one object is used in each of the next two episodes, so two of the stored objects are trimmed
+    for _ in range(2):
+        obj = pool.get("A")
+        assert obj is not None
+        pool.on_spawn("A")
+        assert pool.release(obj)
+        to_destroy = pool.end_episode()
+    assert len(to_destroy) == 2 and pool.num_stored("A") == 1 and pool.capacity("A") == 1
+
+    # prefill size is kept when trimming
+    pool.set_prefill_size("A", 2)
+    assert pool.release(_Object("A"))
+    assert not pool.release(_Object("A"))
+    assert len(pool.end_episode()) == 0
+
+    stats = pool.get_statistics()["A"]
+    assert stats["hits"] == 2 and stats["misses"] == 3
+    assert stats["released"] == 6 and stats["destroyed"] == 3
+    assert stats["stored"] == 2 and stats["alive"] == 0 and stats["capacity"] == 2
+
+
+def test_object_pool_prefill():
+    env = MetaDriveEnv(dict(num_scenarios=3, traffic_density=0., object_pool_prefill=[("DefaultVehicle", 3)]))
+    try:
+        env.reset()
+        stats = env.engine.get_object_pool_statistics()["DefaultVehicle"]
+        assert stats["alive"] == 1 and stats["stored"] == 2 and stats["misses"] == 1
+        for seed in range(3):
+            env.reset(seed=seed)
+            env.step([0, 0])
+        stats = env.engine.get_object_pool_statistics()["DefaultVehicle"]
+        assert stats["misses"] == 1 and stats["hits"] == 3
+        assert stats["alive"] == 1 and stats["stored"] == 2
+    finally:
+        env.close()
+
+
+if __name__ == '__main__':
+    test_object_pool_capacity()
+    test_object_pool_prefill()
@@ -0,0 +1,40 @@
+import pytest
+
+from metadrive.component.traffic_participants.pedestrian import Pedestrian
+from metadrive.envs.metadrive_env import MetaDriveEnv
+
+
+def test_physics_only():
+    env = MetaDriveEnv(dict(num_scenarios=1, traffic_density=0.1))
+    try:
+        env.reset()
+        assert env.engine.physics_only, "physics only mode should be enabled when there is no rendering"
+        assert not env.vehicle.render
+        for v in env.engine.traffic_manager.vehicles:
+            assert not v.render
+            assert len(v.origin.findAllMatches("**/+GeomNode")) == 0, "No model should be loaded"
+
+        # spawn and recycle pedestrians without models
+        for _ in range(2):
+            obj = env.engine.spawn_object(Pedestrian, position=[10, 3.5], heading_theta=0)
+            obj.set_velocity([1, 0], 1)
+            env.step([0, 0])
+            env.engine.clear_objects([obj.id])
+        for _ in range(10):
+            o, r, tm, tc, info = env.step([0, 1])
+        assert env.vehicle.speed > 0
+    finally:
+        env.close()
+
+
+def test_physics_only_with_image_observation():
+    env = MetaDriveEnv(dict(num_scenarios=1, traffic_density=0.0, physics_only=True, image_observation=True))
+    try:
+        with pytest.raises(ValueError, match="physics_only"):
+            env.reset()
+    finally:
+        env.close()
+
+
+if __name__ == '__main__':
+    test_physics_only()
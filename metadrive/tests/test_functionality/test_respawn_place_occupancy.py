@@ -0,0 +1,63 @@
+import numpy as np
+from shapely.geometry import Polygon
+
+from metadrive.component.vehicle.base_vehicle import BaseVehicle
+from metadrive.constants import CollisionGroup, MetaDriveType
+from metadrive.envs.marl_envs import MultiAgentRoundaboutEnv
+from metadrive.utils.pg.utils import rect_region_detection
+
+
+def _region(position, heading, length, width):
+    heading = np.deg2rad(heading)
+    direction = np.array([np.cos(heading), np.sin(heading)]) * length / 2
+    side = np.array([-np.sin(heading), np.cos(heading)]) * width / 2
+    return Polygon(
+        [
+            position + direction + side, position + direction - side, position - direction - side,
+            position - direction + side
+        ]
+    )
+
+
+def test_respawn_place_occupancy():
+    env = MultiAgentRoundaboutEnv(dict(num_agents=4, horizon=1000))
+    try:
+        env.reset(seed=0)
+        spawn_manager = env.engine.spawn_manager
+        for step, (target_bid, target_bp) in enumerate(spawn_manager.safe_spawn_places.items()):
+            if spawn_manager.get_respawn_place_occupancy(env.current_map)[target_bid]:
+                continue
+            # move an agent onto a free respawn place, which should be reported as occupied in the next step
+            vehicle = list(env.vehicles.values())[step % len(env.vehicles)]
+            vehicle.set_position(target_bp["spawn_point_position"])
+            vehicle.set_heading_theta(np.deg2rad(target_bp["spawn_point_heading"]))
+            vehicle.set_velocity([0, 0])
+            o, r, tm, tc, info = env.step({k: [0.0, -1.0] for k in env.vehicles})
+            assert not any(tm.values()) and not any(tc.values())
+            occupancy = spawn_manager.get_respawn_place_occupancy(env.current_map)
+            assert spawn_manager.get_respawn_place_occupancy(env.current_map) is occupancy, "Computed once per step"
+            assert occupancy[target_bid]
+
+            vehicles = [
+                Polygon(v.bounding_box) for v in env.engine.get_objects(lambda o: isinstance(o, BaseVehicle)).values()
+                if v.dynamic_nodes.attached
+            ]
+            for bid, bp in spawn_manager.safe_spawn_places.items():
+                region = _region(
+                    np.array(bp["spawn_point_position"]), bp["spawn_point_heading"],
+                    spawn_manager.RESPAWN_REGION_LONGITUDE, spawn_manager.RESPAWN_REGION_LATERAL
+                )
+                assert any([region.intersection(v).area > 1e-6 for v in vehicles]) == occupancy[bid]
+                # vehicles found by the physics sweep test are always detected
+                result = rect_region_detection(
+                    env.engine, bp["spawn_point_position"], bp["spawn_point_heading"],
+                    spawn_manager.RESPAWN_REGION_LONGITUDE, spawn_manager.RESPAWN_REGION_LATERAL, CollisionGroup.Vehicle
+                )
+                if result.hasHit() and result.node.getName() == MetaDriveType.VEHICLE:
+                    assert occupancy[bid]
+    finally:
+        env.close()
+
+
+if __name__ == '__main__':
+    test_respawn_place_occupancy()
@@ -0,0 +1,47 @@
+from metadrive.component.lane.straight_lane import StraightLane
+from metadrive.component.road_network.node_road_network import NodeRoadNetwork
+from metadrive.engine.asset_loader import AssetLoader
+from metadrive.envs.scenario_env import ScenarioEnv
+
+
+def test_node_network_route():
+    network = NodeRoadNetwork()
+    # a long road from a to d, and a shorter route with more roads a -> b -> c -> d
+    network.add_lane("a", "d", StraightLane([0, 0], [100, 0]))
+    network.add_lane("a", "b", StraightLane([0, 0], [20, 0]))
+    network.add_lane("b", "c", StraightLane([20, 0], [40, 0]))
+    network.add_lane("c", "d", StraightLane([40, 0], [60, 0]))
+    assert next(network.bfs_paths("a", "d")) == ["a", "d"]
+    assert network.shortest_path(("a", "b", 0), "d") == ["a", "b", "c", "d"]
+    assert network.has_route("a", "d") and not network.has_route("d", "a")
+
+    # the cached route is updated once the road network is modified
+    network.add_lane("b", "d", StraightLane([20, 0], [30, 0]))
+    assert network.shortest_path(("a", "b", 0), "d") == ["a", "b", "d"]
+    network.after_init()
+    assert network.shortest_path(("a", "b", 0), "e") == []
+
+
+def test_edge_network_route():
+    env = ScenarioEnv(dict(data_directory=AssetLoader.file_path("waymo", return_raw_style=False), num_scenarios=1))
+    try:
+        env.reset()
+        road_network = env.current_map.road_network
+        num_routes = 0
+        for start in road_network.graph:
+            for goal in road_network.graph:
+                path = road_network.shortest_path(start, goal)
+                assert (len(path) > 0) == road_network.has_route(start, goal)
+                if len(path) > 0:
+                    num_routes += 1
+                    assert path[0] == start and path[-1] == goal
+                    for lane, next_lane in zip(path[:-1], path[1:]):
+                        assert next_lane in [str(i) for i in road_network.graph[lane].exit_lanes]
+        assert num_routes > 0
+    finally:
+        env.close()
+
+
+if __name__ == '__main__':
+    test_node_network_route()
+    test_edge_network_route()
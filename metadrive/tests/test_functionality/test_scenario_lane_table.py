@@ -0,0 +1,55 @@
+import numpy as np
+
+from metadrive.component.lane.scenario_lane import ScenarioLane
+from metadrive.component.lane.scenario_lane_table import ScenarioLaneTable
+from metadrive.engine.asset_loader import AssetLoader
+from metadrive.envs.scenario_env import ScenarioEnv
+from metadrive.scenario.scenario_description import ScenarioDescription as SD
+from metadrive.utils.interpolating_line import InterpolatingLine
+
+
+def test_interpolating_line():
+    line = InterpolatingLine([[0, 0], [0.5, 0], [2, 0], [2, 0], [2, 3], [2.2, 3.1]])
+    assert len(line.segment_property) == 3 and np.isclose(line.length, 2 + 3 + np.hypot(0.2, 0.1))
+    longs = np.array([-1, 0, 1, 2.05, 3, line.length, line.length + 1])
+    laterals = np.linspace(-1, 1, len(longs))
+    points = line.get_points(longs, laterals)
+    for long, lateral, point in zip(longs, laterals, points):
+        assert np.allclose(line.get_point(long, lateral), point)
+    assert np.allclose(line.get_point(3, 0.5), [2.5, 1])
+    assert np.isclose(line.get_heading_theta(3), np.pi / 2)
+    assert np.allclose(line.local_coordinates([2.5, 1]), [3, 0.5])
+
+    static_line = InterpolatingLine([[1, 1], [1, 1]])
+    assert np.isclose(static_line.length, 0.1) and np.allclose(static_line.get_point(0.1, 1), [1.1, 2])
+
+
+def test_scenario_lane_table():
+    env = ScenarioEnv(dict(data_directory=AssetLoader.file_path("waymo", return_raw_style=False), num_scenarios=3))
+    try:
+        for seed in range(3):
+            env.reset(seed=seed)
+            data_manager = env.engine.data_manager
+            lane_table = data_manager.get_lane_table(seed)
+            assert data_manager.get_lane_table(seed) is lane_table
+            map_features = data_manager.current_scenario[SD.MAP_FEATURES]
+            road_network = env.current_map.road_network
+            assert len(lane_table) == len(road_network.graph)
+            for lane_id in lane_table.lane_ids:
+                lane = road_network.get_lane(lane_id)
+                assert np.shares_memory(lane._start_points, lane_table.segments[0])
+                expected = ScenarioLane(lane_id, map_features, True)
+                assert np.isclose(lane.length, expected.length) and np.isclose(lane.width, expected.width)
+                assert np.allclose(lane.polygon, expected.polygon)
+                assert np.allclose(lane.get_bounding_box(), expected.get_bounding_box())
+                for long in np.linspace(0, lane.length, 5):
+                    assert np.allclose(lane.position(long, 1), expected.position(long, 1))
+                    assert np.isclose(lane.heading_theta_at(long), expected.heading_theta_at(long))
+                expected.destroy()
+    finally:
+        env.close()
+
+
+if __name__ == '__main__':
+    test_interpolating_line()
+    test_scenario_lane_table()
@@ -0,0 +1,40 @@
+from metadrive.engine.asset_loader import AssetLoader
+from metadrive.envs.scenario_env import ScenarioEnv
+from metadrive.policy.replay_policy import ReplayEgoCarPolicy
+from metadrive.scenario.scenario_description import ScenarioDescription as SD
+from metadrive.type import MetaDriveType
+
+
+def test_scenario_light_timeline():
+    env = ScenarioEnv(
+        dict(
+            data_directory=AssetLoader.file_path("waymo", return_raw_style=False),
+            num_scenarios=3,
+            agent_policy=ReplayEgoCarPolicy
+        )
+    )
+    try:
+        num_checked = 0
+        for seed in range(3):
+            env.reset(seed=seed)
+            manager = env.engine.light_manager
+            light_states = env.engine.data_manager.current_scenario[SD.DYNAMIC_MAP_STATES]
+            for step in range(200):
+                for scenario_id, obj_id in manager._scenario_id_to_obj_id.items():
+                    light = manager.spawned_objects[obj_id]
+                    status = light_states[scenario_id][SD.STATE][SD.TRAFFIC_LIGHT_STATUS][env.engine.episode_step]
+                    status = MetaDriveType.parse_light_status(status, simplifying=True)
+                    assert light.status == status
+                    assert manager.has_traffic_light(light.lane.index)
+                    assert manager.get_light_status(light.lane.index) == status
+                    num_checked += 1
+                o, r, tm, tc, info = env.step([0, 0])
+                if tm or tc:
+                    break
+        assert num_checked > 0
+    finally:
+        env.close()
+
+
+if __name__ == '__main__':
+    test_scenario_light_timeline()
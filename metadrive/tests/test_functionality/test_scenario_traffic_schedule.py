@@ -0,0 +1,44 @@
+from metadrive.engine.asset_loader import AssetLoader
+from metadrive.envs.scenario_env import ScenarioEnv
+from metadrive.policy.replay_policy import ReplayEgoCarPolicy, ReplayTrafficParticipantPolicy
+from metadrive.type import MetaDriveType
+
+
+def test_scenario_traffic_schedule(num_scenarios=3):
+    """
+    Objects driven by the spawn schedule should exist exactly in the steps where their tracks are valid
+    """
+    env = ScenarioEnv(
+        {
+            "agent_policy": ReplayEgoCarPolicy,
+            "data_directory": AssetLoader.file_path("waymo", return_raw_style=False),
+            "num_scenarios": num_scenarios
+        }
+    )
+    try:
+        for seed in range(num_scenarios):
+            env.reset(seed=seed)
+            manager = env.engine.traffic_manager
+            tracks = manager.current_traffic_data
+            for i in range(1000):
+                o, r, tm, tc, info = env.step([0, 0])
+                if tm or tc:
+                    break
+                step = env.engine.episode_step
+                for scenario_id, valid in manager._track_valid.items():
+                    is_replay = tracks[scenario_id]["type"] in [
+                        MetaDriveType.VEHICLE, MetaDriveType.PEDESTRIAN, MetaDriveType.CYCLIST
+                    ]
+                    if not is_replay or step >= len(valid):
+                        continue
+                    assert valid[step] == (scenario_id in manager._scenario_id_to_obj_id), \
+                        "Object {} doesn't follow its track at step {}".format(scenario_id, step)
+                for scenario_id in manager._replay_scenario_ids:
+                    obj_id = manager._scenario_id_to_obj_id[scenario_id]
+                    assert env.engine.has_policy(obj_id, ReplayTrafficParticipantPolicy)
+    finally:
+        env.close()
+
+
+if __name__ == '__main__':
+    test_scenario_traffic_schedule()
@@ -0,0 +1,53 @@
+import numpy as np
+
+from metadrive.engine.scene_cull import SceneCull
+from metadrive.envs.metadrive_env import MetaDriveEnv
+
+
+def test_get_state_changes():
+    distances = [10, 310, 330, 1000, 1000, 250]
+    attached = [False, True, True, True, True, False]
+    to_attach, to_detach = SceneCull.get_state_changes(distances, attached, 300)
+    # the second one is in the hysteresis band
+    assert list(to_attach) == [0, 5]
+    assert list(to_detach) == [2, 3, 4]
+
+    max_detach = SceneCull.MAX_DETACH_PER_STEP
+    distances = np.arange(max_detach * 2) + 1000
+    to_attach, to_detach = SceneCull.get_state_changes(distances, [True] * len(distances), 300)
+    assert len(to_attach) == 0
+    assert sorted(to_detach) == list(range(max_detach, max_detach * 2)), "the farthest ones should be detached first"
+
+
+def test_cull_distant_blocks():
+    env = MetaDriveEnv(dict(map="SSSSSSSSSSSSSSSS", num_scenarios=1))
+    try:
+        env.reset()
+        engine = env.engine
+        blocks = env.current_map.blocks
+        # blocks are not in the scene graph without rendering
+        for block in blocks:
+            block.origin.reparentTo(engine.worldNP)
+        poses = [env.vehicle.position]
+        distances = SceneCull.distances_to_bounding_boxes([b.bounding_box for b in blocks], poses)
+        far = distances > SceneCull.LOD_MAP_VIS_DIST + SceneCull.LOD_HYSTERESIS
+        assert far.sum() > 0
+
+        SceneCull.cull_distant_blocks(engine, blocks, poses)
+        assert all([b.origin.hasParent() for b, is_far in zip(blocks, far) if not is_far])
+        assert sum([not b.origin.hasParent() for b in blocks]) == min(far.sum(), SceneCull.MAX_DETACH_PER_STEP)
+        for _ in range(len(blocks)):
+            SceneCull.cull_distant_blocks(engine, blocks, poses)
+        assert [not b.origin.hasParent() for b in blocks] == list(far)
+
+        # all blocks come back when the agent is everywhere
+        poses = [np.mean(np.reshape(b.bounding_box, (2, 2)), axis=1) for b in blocks]
+        SceneCull.cull_distant_blocks(engine, blocks, poses)
+        assert all([b.origin.hasParent() for b in blocks])
+    finally:
+        env.close()
+
+
+if __name__ == '__main__':
+    test_get_state_changes()
+    test_cull_distant_blocks()
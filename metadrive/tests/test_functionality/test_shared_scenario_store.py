@@ -0,0 +1,132 @@
+import multiprocessing
+import os
+import pickle
+import shutil
+
+import numpy as np
+
+from metadrive.engine.asset_loader import AssetLoader
+from metadrive.envs.scenario_env import ScenarioEnv
+from metadrive.policy.replay_policy import ReplayEgoCarPolicy
+from metadrive.scenario.scenario_description import ScenarioDescription as SD
+from metadrive.scenario.shared_store import SharedScenarioStore
+from metadrive.scenario.utils import read_dataset_summary, read_scenario_data
+
+_dataset = AssetLoader.file_path("waymo", return_raw_style=False)
+
+
+def _checksum(scenario):
+    return sum(
+        float(np.sum(track[SD.STATE]["position"][track[SD.STATE]["valid"].astype(bool)]))
+        for track in scenario[SD.TRACKS].values()
+    )
+
+
+def _get_arrays(data):
+    if isinstance(data, np.ndarray):
+        return [data]
+    if isinstance(data, dict):
+        return [array for value in data.values() for array in _get_arrays(value)]
+    if isinstance(data, (list, tuple)):
+        return [array for value in data for array in _get_arrays(value)]
+    return []
+
+
+def _check_shared(scenario, store):
+    # arrays of scenarios are read-only views of the shared memory instead of copies
+    shared_buffer = np.frombuffer(store._shm.buf, dtype=np.uint8)
+    arrays = [array for array in _get_arrays(dict(scenario)) if array.dtype != object and array.size > 0]
+    assert len(arrays) > 0
+    for array in arrays:
+        assert not array.flags.writeable
+        assert np.shares_memory(array, shared_buffer)
+
+
+def _read_scenarios(store_name):
+    # read all scenarios from the store in another process, and return their checksums
+    store = SharedScenarioStore.attach(store_name)
+    checksums = []
+    for file in store.file_names:
+        scenario = store.get_scenario(file)
+        _check_shared(scenario, store)
+        checksums.append(_checksum(scenario))
+    return checksums
+
+
+def test_shared_scenario_store(tmp_path):
+    store = SharedScenarioStore.create(_dataset)
+    try:
+        _, files, mapping = read_dataset_summary(_dataset)
+        assert store.file_names == files
+        for file in files:
+            _check_shared(store.get_scenario(file), store)
+        expected = [_checksum(read_scenario_data(os.path.join(_dataset, mapping[f], f))) for f in files]
+
+        with multiprocessing.get_context("spawn").Pool(2) as pool:
+            results = pool.map(_read_scenarios, [store.name, store.name], chunksize=1)
+        for checksums in results:
+            assert np.allclose(checksums, expected)
+
+        # scenario files are not required when scenarios are in the store
+        data_directory = str(tmp_path)
+        shutil.copy(os.path.join(_dataset, SD.DATASET.SUMMARY_FILE), data_directory)
+        env = ScenarioEnv(
+            dict(data_directory=data_directory, scenario_store=store.name, agent_policy=ReplayEgoCarPolicy)
+        )
+        try:
+            for seed in range(len(files)):
+                env.reset(seed=seed)
+                assert env.engine.data_manager.current_scenario[SD.ID] == store.get_scenario(files[seed])[SD.ID]
+                for _ in range(10):
+                    env.step([0, 0])
+        finally:
+            env.close()
+    finally:
+        store.close()
+        store.unlink()
+
+
+def test_shared_scenario_store_curriculum(tmp_path):
+    # object summaries of the bundled scenarios don't have moving distances used to sort scenarios, so they are updated
+    dataset = str(tmp_path / "dataset")
+    os.makedirs(dataset)
+    _, files, mapping = read_dataset_summary(_dataset)
+    for file in files:
+        scenario = read_scenario_data(os.path.join(_dataset, mapping[file], file))
+        scenario[SD.METADATA][SD.SUMMARY.OBJECT_SUMMARY
+                              ] = {id: SD.get_object_summary(track, id)
+                                   for id, track in scenario[SD.TRACKS].items()}
+        with open(os.path.join(dataset, file), "wb") as f:
+            pickle.dump(dict(scenario), f)
+    shutil.copy(os.path.join(_dataset, SD.DATASET.SUMMARY_FILE), dataset)
+
+    store = SharedScenarioStore.create(dataset)
+    try:
+        # scenarios are read from the store to be sorted for curriculum training
+        data_directory = str(tmp_path / "summary")
+        os.makedirs(data_directory)
+        shutil.copy(os.path.join(dataset, SD.DATASET.SUMMARY_FILE), data_directory)
+        env = ScenarioEnv(
+            dict(
+                data_directory=data_directory,
+                scenario_store=store.name,
+                agent_policy=ReplayEgoCarPolicy,
+                curriculum_level=len(files),
+                sequential_seed=True
+            )
+        )
+        try:
+            env.reset()
+            assert sorted(env.engine.data_manager.scenario_difficulty.keys()) == sorted(files)
+        finally:
+            env.close()
+    finally:
+        store.close()
+        store.unlink()
+
+
+if __name__ == '__main__':
+    import pathlib
+    import tempfile
+    test_shared_scenario_store(pathlib.Path(tempfile.mkdtemp()))
+    test_shared_scenario_store_curriculum(pathlib.Path(tempfile.mkdtemp()))
@@ -1,9 +1,18 @@
-try:
-    from OpenGL.GL import *  # noqa F403
-    import cupy as cp
-    from cuda import cudart
-except ImportError:
-    pass
+import importlib.util
+
+from metadrive.utils.utils import LazyModule
+
+# These packages are only required when image_on_cuda is True, so they are imported at the first use
+cp = LazyModule("cupy")
+cudart = LazyModule("cuda.cudart")
+GL = LazyModule("OpenGL.GL")
+
+
+def cuda_available():
+    """
+    Check whether the packages for rendering on cuda are installed without importing them
+    """
+    return all(importlib.util.find_spec(name) is not None for name in ["cupy", "cuda", "OpenGL"])
 
 
 def format_cudart_err(err):
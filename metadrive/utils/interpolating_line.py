@@ -9,11 +9,27 @@ class InterpolatingLine:
     """
     This class provides point set with interpolating function
     """
-    def __init__(self, points):
-        points = np.asarray(points)[..., :2]
-        self.segment_property, self._start_points, self._end_points = self._get_properties(points)
+    def __init__(self, points, segments=None):
+        """
+        :param points: points of the line
+        :param segments: segment arrays returned by get_segments(). They are computed from points if None
+        """
+        if segments is None:
+            segments = self.get_segments(points)
+        self._set_segments(*segments)
+
+    def _set_segments(self, start_points, end_points, lengths, directions, lateral_directions, headings):
+        self._start_points = start_points
+        self._end_points = end_points
+        self._lengths = lengths
+        self._directions = directions
+        self._lateral_directions = lateral_directions
+        self._headings = headings
         self._distance_b_a = self._end_points - self._start_points
-        self.length = sum([seg["length"] for seg in self.segment_property])
+        self._accumulated_lengths = np.cumsum(self._lengths)
+        # a point belongs to the first segment whose end is beyond it by at most 0.1m
+        self._segment_search_ends = self._accumulated_lengths + 0.1
+        self.length = float(self._accumulated_lengths[-1])
 
     def position(self, longitudinal: float, lateral: float) -> np.ndarray:
         return self.get_point(longitudinal, lateral)
@@ -49,18 +65,17 @@ class InterpolatingLine:
         We will use Option 1.
         """
         min_dists = self.min_lineseg_dist(position, self._start_points, self._end_points, self._distance_b_a)
-        target_segment_idx = np.argmin(min_dists)
-
-        long = 0
-        for idx, seg in enumerate(self.segment_property):
-            if idx != target_segment_idx:
-                long += seg["length"]
-            else:
-                delta_x = position[0] - seg["start_point"][0]
-                delta_y = position[1] - seg["start_point"][1]
-                long += delta_x * seg["direction"][0] + delta_y * seg["direction"][1]
-                lateral = delta_x * seg["lateral_direction"][0] + delta_y * seg["lateral_direction"][1]
-                return long, lateral
+        idx = np.argmin(min_dists)
+
+        long = self._accumulated_lengths[idx - 1] if idx > 0 else 0
+        start_point = self._start_points[idx]
+        direction = self._directions[idx]
+        lateral_direction = self._lateral_directions[idx]
+        delta_x = position[0] - start_point[0]
+        delta_y = position[1] - start_point[1]
+        long += delta_x * direction[0] + delta_y * direction[1]
+        lateral = delta_x * lateral_direction[0] + delta_y * lateral_direction[1]
+        return long, lateral
 
         # deprecated content
         # Four elements:
@@ -101,51 +116,69 @@ class InterpolatingLine:
         # ret.sort(key=lambda seg: abs(seg[-1]))
         # return ret[0][0], ret[0][-1]
 
-    def _get_properties(self, points):
-        points = np.asarray(points)[..., :2]
-        ret = []
-        start_points = []
-        end_points = []
+    @staticmethod
+    def get_segment_indices(points):
+        """
+        Split points into segments longer than 1m. Return indices of start and end points of segments
+        """
+        xs, ys = np.asarray(points)[..., 0].tolist(), np.asarray(points)[..., 1].tolist()
+        start_indices = []
+        end_indices = []
         p_start_idx = 0
-        while p_start_idx < len(points) - 1:
-            for p_end_idx in range(p_start_idx + 1, len(points)):
-                _p = points[p_start_idx] - points[p_end_idx]
-                if norm(_p[0], _p[1]) > 1:
+        while p_start_idx < len(xs) - 1:
+            x, y = xs[p_start_idx], ys[p_start_idx]
+            for p_end_idx in range(p_start_idx + 1, len(xs)):
+                if math.sqrt((x - xs[p_end_idx])**2 + (y - ys[p_end_idx])**2) > 1:
                     break
-            p_start = points[p_start_idx]
-            p_end = points[p_end_idx]
-
-            _p = p_start - p_end
-            if norm(_p[0], _p[1]) < 1e-6:
-                p_start_idx = p_end_idx  # next
-                continue
-
-            seg_property = {
-                "length": self.points_distance(p_start, p_end),
-                "direction": np.asarray(self.points_direction(p_start, p_end)),
-                "lateral_direction": np.asarray(self.points_lateral_direction(p_start, p_end)),
-                "heading": self.points_heading(p_start, p_end),
-                "start_point": p_start,
-                "end_point": p_end
-            }
-            ret.append(seg_property)
-            start_points.append(seg_property["start_point"])
-            end_points.append(seg_property["end_point"])
+            if math.sqrt((x - xs[p_end_idx])**2 + (y - ys[p_end_idx])**2) >= 1e-6:
+                start_indices.append(p_start_idx)
+                end_indices.append(p_end_idx)
             p_start_idx = p_end_idx  # next
-        if len(ret) == 0:
+        return start_indices, end_indices
+
+    @staticmethod
+    def compute_segments(start_points, end_points):
+        """
+        Compute lengths, directions, lateral directions and headings of segments
+        """
+        vectors = end_points - start_points
+        lengths = np.sqrt(vectors[:, 0]**2 + vectors[:, 1]**2)
+        directions = vectors / lengths[:, None]
+        lateral_directions = np.stack([vectors[:, 1] / lengths, -vectors[:, 0] / lengths], axis=1)
+        headings = np.arctan2(vectors[:, 1], vectors[:, 0])
+        return start_points, end_points, lengths, directions, lateral_directions, headings
+
+    @staticmethod
+    def get_static_segments(point):
+        """
+        Segment arrays for points at the same position, whose length is 0.1
+        """
+        start_points = np.asarray([point[:2]], dtype=float)
+        end_points = np.asarray([[point[0] + 0.1, point[1]]])
+        return start_points, end_points, np.asarray([0.1]), np.asarray([[1., 0.]]), np.asarray([[0., 1.]]), np.zeros(1)
+
+    @classmethod
+    def get_segments(cls, points):
+        points = np.asarray(points, dtype=float)[..., :2]
+        start_indices, end_indices = cls.get_segment_indices(points)
+        if len(start_indices) == 0:
             # static, length=zero
-            seg_property = {
-                "length": 0.1,
-                "direction": np.asarray((1, 0)),
-                "lateral_direction": np.asarray((0, 1)),
-                "heading": 0,
-                "start_point": points[0],
-                "end_point": np.asarray([points[0][0] + 0.1, points[0][1]])
-            }
-            ret.append(seg_property)
-            start_points.append(seg_property["start_point"])
-            end_points.append(seg_property["end_point"])
-        return ret, np.asarray(start_points), np.asarray(end_points)
+            return cls.get_static_segments(points[0])
+        return cls.compute_segments(points[start_indices], points[end_indices])
+
+    @property
+    def segment_property(self):
+        return [self._get_segment_property(i) for i in range(len(self._lengths))]
+
+    def _get_segment_property(self, idx):
+        return {
+            "length": float(self._lengths[idx]),
+            "direction": self._directions[idx],
+            "lateral_direction": self._lateral_directions[idx],
+            "heading": float(self._headings[idx]),
+            "start_point": self._start_points[idx],
+            "end_point": self._end_points[idx]
+        }
 
     @staticmethod
     def points_distance(start_p, end_p):
@@ -164,55 +197,53 @@ class InterpolatingLine:
     def points_heading(start_p, end_p):
         return math.atan2(end_p[1] - start_p[1], end_p[0] - start_p[0])
 
+    def _segment_index(self, longitudinal):
+        return min(int(self._segment_search_ends.searchsorted(longitudinal)), len(self._lengths) - 1)
+
     def get_point(self, longitudinal, lateral=None):
         """
         Get point on this line by interpolating
         """
-        accumulate_len = 0
-        for seg in self.segment_property:
-            accumulate_len += seg["length"]
-            if accumulate_len + 0.1 >= longitudinal:
-                break
+        idx = self._segment_index(longitudinal)
+        ret = self._start_points[idx] + (longitudinal - self._accumulated_lengths[idx] +
+                                         self._lengths[idx]) * self._directions[idx]
         if lateral is not None:
-            return (seg["start_point"] + (longitudinal - accumulate_len + seg["length"]) *
-                    seg["direction"]) + lateral * seg["lateral_direction"]
-        else:
-            return seg["start_point"] + (longitudinal - accumulate_len + seg["length"]) * seg["direction"]
+            ret = ret + lateral * self._lateral_directions[idx]
+        return ret
+
+    def get_points(self, longitudinals, laterals=None):
+        """
+        Vectorized get_point(). Return an array of points at longitudinals
+        """
+        longitudinals = np.asarray(longitudinals, dtype=float)
+        idx = np.minimum(self._segment_search_ends.searchsorted(longitudinals), len(self._lengths) - 1)
+        ret = self._start_points[idx] + (longitudinals - self._accumulated_lengths[idx] +
+                                         self._lengths[idx])[:, None] * self._directions[idx]
+        if laterals is not None:
+            ret = ret + np.asarray(laterals, dtype=float)[:, None] * self._lateral_directions[idx]
+        return ret
 
     def get_heading_theta(self, longitudinal: float) -> float:
         """
         In rad
         """
-        accumulate_len = 0
-
-        assert len(self.segment_property) > 0
-
-        for seg in self.segment_property:
-            accumulate_len += seg["length"]
-            if accumulate_len > longitudinal:
-                return seg["heading"]
-
-        return seg["heading"]
+        assert len(self._lengths) > 0
+        idx = min(int(self._accumulated_lengths.searchsorted(longitudinal, side="right")), len(self._lengths) - 1)
+        return float(self._headings[idx])
 
     def segment(self, longitudinal: float):
         """
         Return the segment piece on this lane of current position
         """
-        accumulate_len = 0
-        for index, seg in enumerate(self.segment_property):
-            accumulate_len += seg["length"]
-            if accumulate_len + 0.1 >= longitudinal:
-                return self.segment_property[index]
-        return self.segment_property[index]
+        return self._get_segment_property(self._segment_index(longitudinal))
 
     def lateral_direction(self, longitude):
-        lane_segment = self.segment(longitude)
-        lateral = lane_segment["lateral_direction"]
-        return lateral
+        return self._lateral_directions[self._segment_index(longitude)]
 
     def destroy(self):
-        del self.segment_property
-        self.segment_property = []
+        self._start_points = self._end_points = self._distance_b_a = None
+        self._lengths = self._directions = self._lateral_directions = self._headings = np.zeros(0)
+        self._accumulated_lengths = self._segment_search_ends = None
         self.length = None
 
     @staticmethod
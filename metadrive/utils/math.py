@@ -2,7 +2,6 @@ import math
 from typing import Tuple
 
 import numpy as np
-from scipy.interpolate import interp1d
 
 number_pos_inf = float("inf")
 number_neg_inf = float("-inf")
@@ -105,6 +104,34 @@ def rotated_rectangles_intersect(rect1: Tuple, rect2: Tuple) -> bool:
     return has_corner_inside(rect1, rect2) or has_corner_inside(rect2, rect1)
 
 
+def rotated_rectangles_overlap(centers_1, headings_1, half_sizes_1, centers_2, headings_2, half_sizes_2):
+    """
+    Separating axis test between each rectangle in set 1 and each rectangle in set 2
+    :param centers_1: (N, 2) centers
+    :param headings_1: (N, ) headings [rad]
+    :param half_sizes_1: (N, 2) half lengths and half widths
+    :return: (N, M) bool array, True if two rectangles overlap
+    """
+    def _axes(headings):
+        cos, sin = np.cos(headings), np.sin(headings)
+        return np.stack([cos, sin], axis=-1), np.stack([-sin, cos], axis=-1)
+
+    length_axis_1, width_axis_1 = [axis[:, None, :] for axis in _axes(headings_1)]
+    length_axis_2, width_axis_2 = [axis[None, :, :] for axis in _axes(headings_2)]
+    half_sizes_1 = half_sizes_1[:, None, :]
+    half_sizes_2 = half_sizes_2[None, :, :]
+    offset = centers_2[None, :, :] - centers_1[:, None, :]
+
+    overlap = np.ones(offset.shape[:2], dtype=bool)
+    for axis in [length_axis_1, width_axis_1, length_axis_2, width_axis_2]:
+        radius_1 = half_sizes_1[..., 0] * np.abs(np.sum(length_axis_1 * axis, axis=-1)) + \
+                   half_sizes_1[..., 1] * np.abs(np.sum(width_axis_1 * axis, axis=-1))
+        radius_2 = half_sizes_2[..., 0] * np.abs(np.sum(length_axis_2 * axis, axis=-1)) + \
+                   half_sizes_2[..., 1] * np.abs(np.sum(width_axis_2 * axis, axis=-1))
+        overlap &= np.abs(np.sum(offset * axis, axis=-1)) < radius_1 + radius_2
+    return overlap
+
+
 def point_in_rectangle(point, rect_min, rect_max) -> bool:
     """
     Check if a point is inside a rectangle
@@ -260,6 +287,7 @@ def get_polyline_length(points_array):
 
 
 def resample_polyline(points, target_distance):
+    from scipy.interpolate import interp1d
     # Calculate the cumulative distance along the original polyline
     distances = np.cumsum(np.sqrt(np.sum(np.diff(points, axis=0)**2, axis=1)))
     distances = np.insert(distances, 0, 0., axis=0)
@@ -10,6 +10,7 @@ import shutil
 import tqdm
 
 from metadrive.engine.asset_loader import AssetLoader
+from metadrive.scenario.convert import convert_dataset
 from metadrive.scenario.scenario_description import ScenarioDescription
 from metadrive.utils.nuplan.utils import get_nuplan_scenarios, convert_one_scenario
 from metadrive.utils.utils import dict_recursive_remove_array
@@ -46,7 +47,7 @@ def convert_scenarios(output_path, dataset_params, worker_index=None, force_over
     summary_file = ScenarioDescription.DATASET.SUMMARY_FILE
     if worker_index is not None:
         desc += "Worker {} ".format(worker_index)
-        summary_file = "dataset_summary_worker{}.pkl".format(worker_index)
+        summary_file = ScenarioDescription.DATASET.WORKER_SUMMARY_FILE.format(worker_index)
 
     # Init.
     scenarios = get_nuplan_scenarios(dataset_params)
@@ -71,6 +72,39 @@ def convert_scenarios(output_path, dataset_params, worker_index=None, force_over
         assert delay_remove == save_path, delay_remove + " vs. " + save_path
 
 
+_scenario_cache = {}
+
+
+def convert_nuplan_scenario(scenario_token, dataset_params):
+    """
+    Yield the (export_file_name, scenario) pair converted from the scenario with scenario_token. Scenarios are loaded
+    once in each process
+    """
+    key = tuple(dataset_params)
+    if key not in _scenario_cache:
+        _scenario_cache[key] = {scenario.token: scenario for scenario in get_nuplan_scenarios(dataset_params)}
+    scenario = _scenario_cache[key][scenario_token]
+    sd_scenario = convert_one_scenario(scenario)
+    yield ScenarioDescription.get_export_file_name("nuplan", "v1.1", scenario.scenario_name), sd_scenario.to_dict()
+
+
+def convert_scenarios_parallel(output_path, dataset_params, num_workers=8, resume=True, force_overwrite=False):
+    """
+    Convert scenarios with a process pool. The conversion is resumed if output_path contains a partially converted
+    dataset
+    """
+    scenario_tokens = [scenario.token for scenario in get_nuplan_scenarios(dataset_params)]
+    return convert_dataset(
+        convert_nuplan_scenario,
+        scenario_tokens,
+        output_path,
+        num_workers=num_workers,
+        convert_kwargs=dict(dataset_params=dataset_params),
+        resume=resume,
+        force_overwrite=force_overwrite
+    )
+
+
 if __name__ == "__main__":
     # 14 types
     all_scenario_types = "[behind_pedestrian_on_pickup_dropoff,  \
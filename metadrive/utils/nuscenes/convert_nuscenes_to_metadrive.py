@@ -9,6 +9,7 @@ import pickle
 import tqdm
 
 from metadrive.engine.asset_loader import AssetLoader
+from metadrive.scenario.convert import convert_dataset
 from metadrive.scenario.scenario_description import ScenarioDescription
 from metadrive.utils.nuscenes.utils import convert_one_scenario
 from metadrive.utils.utils import dict_recursive_remove_array
@@ -50,7 +51,7 @@ def convert_scenarios(version, dataroot, output_path, worker_index=None, verbose
     summary_file = ScenarioDescription.DATASET.SUMMARY_FILE
     if worker_index is not None:
         desc += "Worker {} ".format(worker_index)
-        summary_file = "dataset_summary_worker{}.pkl".format(worker_index)
+        summary_file = ScenarioDescription.DATASET.WORKER_SUMMARY_FILE.format(worker_index)
 
     # Init.
     nusc = NuScenes(version=version, verbose=verbose, dataroot=dataroot)
@@ -75,6 +76,37 @@ def convert_scenarios(version, dataroot, output_path, worker_index=None, verbose
     assert delay_remove == save_path
 
 
+_nusc_cache = {}
+
+
+def convert_nuscenes_scene(scene_token, version, dataroot, verbose=False):
+    """
+    Yield the (export_file_name, scenario) pair converted from a scene. The dataset is loaded once in each process
+    """
+    if (version, dataroot) not in _nusc_cache:
+        _nusc_cache[(version, dataroot)] = NuScenes(version=version, verbose=verbose, dataroot=dataroot)
+    nusc = _nusc_cache[(version, dataroot)]
+    sd_scene = convert_one_scenario(scene_token, nusc)
+    yield ScenarioDescription.get_export_file_name("nuscenes", version, scene_token), sd_scene.to_dict()
+
+
+def convert_scenarios_parallel(version, dataroot, output_path, num_workers=8, resume=True, force_overwrite=False):
+    """
+    Convert scenes with a process pool. The conversion is resumed if output_path contains a partially converted dataset
+    """
+    nusc = NuScenes(version=version, verbose=False, dataroot=dataroot)
+    scene_tokens = [scene["token"] for scene in nusc.scene]
+    return convert_dataset(
+        convert_nuscenes_scene,
+        scene_tokens,
+        output_path,
+        num_workers=num_workers,
+        convert_kwargs=dict(version=version, dataroot=dataroot),
+        resume=resume,
+        force_overwrite=force_overwrite
+    )
+
+
 if __name__ == "__main__":
     output_path = AssetLoader.file_path("nuscenes", return_raw_style=False)
     version = 'v1.0-mini'
@@ -1,5 +1,11 @@
+import argparse
 import json
+import math
 import os.path as osp
+import pickle
+from multiprocessing import get_context
+
+from tqdm import tqdm
 
 from metadrive import MetaDriveEnv
 
@@ -20,12 +26,86 @@ def generate_maps(env_class, env_config, json_file_path):
     print('Finished! Saved at: ', json_file_path)
 
 
+_worker_env = None
+
+
+def _init_worker(env_class, env_config):
+    global _worker_env
+    _worker_env = env_class(env_config)
+    _worker_env.lazy_init()
+
+
+def _generate_map_data(seeds, with_map_features):
+    map_manager = _worker_env.engine.map_manager
+    ret = {}
+    for seed in seeds:
+        map = map_manager.generate_map(seed)
+        ret[seed] = map.get_meta_data() if with_map_features else map.get_block_sequence()
+        map.destroy()
+    return ret
+
+
+def generate_maps_in_parallel(
+    file_name, env_config=None, num_workers=4, chunk_size=None, with_map_features=True, env_class=MetaDriveEnv
+):
+    """
+    Generate the maps of seeds in [start_seed, start_seed + num_scenarios) with multiple processes. Each worker holds
+    its own headless engine. Results are merged into one file with the same format as PGMapManager.dump_all_maps(), so
+    it can be loaded by PGMapManager.load_all_maps(). If map_cache_dir is set in env_config, workers fill the map cache
+    as well
+    :param file_name: the file to save maps
+    :param env_config: config for creating envs in workers, which determines the seed range and map config
+    :param num_workers: number of processes
+    :param chunk_size: number of maps generated by a worker in one task. By default, each worker gets 4 tasks
+    :param with_map_features: whether to save map features. load_all_maps() only needs the block sequence
+    :param env_class: the env used to generate maps
+    :return: a dict mapping seed to map data
+    """
+    env_config = dict(env_config or {})
+    env_config.update(use_render=False, image_observation=False)
+    default_config = env_class.default_config()
+    start_seed = env_config.get("start_seed", default_config["start_seed"])
+    num_scenarios = env_config.get("num_scenarios", default_config["num_scenarios"])
+    seeds = list(range(start_seed, start_seed + num_scenarios))
+    chunk_size = chunk_size or max(math.ceil(num_scenarios / (num_workers * 4)), 1)
+    chunks = [seeds[i:i + chunk_size] for i in range(0, num_scenarios, chunk_size)]
+
+    ret = {}
+    # spawn, as the engine is a singleton that can not be shared by forked processes
+    ctx = get_context("spawn")
+    with ctx.Pool(num_workers, initializer=_init_worker, initargs=(env_class, env_config)) as pool:
+        tasks = [pool.apply_async(_generate_map_data, (chunk, with_map_features)) for chunk in chunks]
+        with tqdm(total=num_scenarios, desc="Generate maps") as progress:
+            for task in tasks:
+                data = task.get()
+                ret.update(data)
+                progress.update(len(data))
+    ret = {seed: ret[seed] for seed in seeds}
+    with open(file_name, "wb+") as file:
+        pickle.dump(ret, file)
+    return ret
+
+
 if __name__ == '__main__':
-    to_generate_map_config = {
-        "start_seed": 0,
-        "num_scenarios": 30000,
-    }
-    generate_maps(
-        MetaDriveEnv, to_generate_map_config,
-        osp.join(asset_path, "20210814_generated_maps_start_seed_0_num_scenarios_30000.json")
+    parser = argparse.ArgumentParser(description="Generate PG maps with multiple processes")
+    parser.add_argument("--output", required=True, help="The file to save maps, loadable by load_all_maps()")
+    parser.add_argument("--start_seed", type=int, default=0)
+    parser.add_argument("--num_scenarios", type=int, default=100)
+    parser.add_argument("--map", default="3", help="Block number or block sequence, same as the map in env config")
+    parser.add_argument("--num_workers", type=int, default=4)
+    parser.add_argument("--map_cache_dir", default=None, help="Also store maps into this map cache directory")
+    parser.add_argument("--no_map_features", action="store_true", help="Only save block sequences to save space")
+    args = parser.parse_args()
+
+    generate_maps_in_parallel(
+        args.output,
+        env_config=dict(
+            start_seed=args.start_seed,
+            num_scenarios=args.num_scenarios,
+            map=int(args.map) if args.map.isdigit() else args.map,
+            map_cache_dir=args.map_cache_dir
+        ),
+        num_workers=args.num_workers,
+        with_map_features=not args.no_map_features
     )
+    print("Finished! Saved at: ", args.output)
@@ -178,7 +178,7 @@ def ray_localization(
         for res in results.getHits():
             if res.getNode().getName() == MetaDriveType.LANE_SURFACE_STREET:
                 on_lane = True
-                lane = get_object_from_node(res.getNode())
+                lane = get_object_from_node(res.getNode(), res.getTriangleIndex())
                 long, _ = lane.local_coordinates(position)
                 lane_heading = lane.heading_theta_at(long)
 
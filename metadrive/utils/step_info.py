@@ -0,0 +1,105 @@
+from collections.abc import MutableMapping
+
+import numpy as np
+
+from metadrive.constants import TerminationState
+
+
+class InfoLevel:
+    # all info dicts from managers, vehicles and reward/cost/done functions
+    FULL = "full"
+    # termination flags, cost and episode stats only
+    MINIMAL = "minimal"
+    # termination flags only, which are used by the env itself
+    NONE = "none"
+
+
+class StepInfoRecords:
+    """
+    Preallocated per-agent info records used when info_level is not "full". Fields are stored in a numpy structured
+    array with one row for each agent, and each agent gets a dict-like StepInfoRecord which is a view of its row.
+    Records are reused in the next step, so call dict(record) to keep them
+    """
+    TERMINATION_FIELDS = (
+        TerminationState.SUCCESS, TerminationState.OUT_OF_ROAD, TerminationState.MAX_STEP, TerminationState.CRASH,
+        TerminationState.CRASH_VEHICLE, TerminationState.CRASH_HUMAN, TerminationState.CRASH_OBJECT,
+        TerminationState.CRASH_BUILDING
+    )
+    # fields of info_level "none"
+    TERMINATION_DTYPE = np.dtype([(field, bool) for field in TERMINATION_FIELDS])
+    # fields of info_level "minimal"
+    DTYPE = np.dtype(TERMINATION_DTYPE.descr + [("cost", float), ("episode_reward", float), ("episode_length", int)])
+
+    def __init__(self, capacity=1, dtype=DTYPE):
+        """
+        :param capacity: number of records preallocated
+        :param dtype: StepInfoRecords.DTYPE or StepInfoRecords.TERMINATION_DTYPE. Reading fields not in it raises
+        KeyError
+        """
+        self.dtype = dtype
+        self.data = np.zeros((capacity, ), dtype=self.dtype)
+        self._records = [StepInfoRecord(self, i) for i in range(capacity)]
+        self._num_used = 0
+
+    def reset(self):
+        """
+        Release all records. Call it once per step before new_record()
+        """
+        self._num_used = 0
+
+    def new_record(self):
+        """
+        Return a cleared record
+        """
+        if self._num_used == len(self._records):
+            capacity = len(self._records)
+            data = np.zeros((capacity * 2, ), dtype=self.dtype)
+            data[:capacity] = self.data
+            self.data = data
+            self._records += [StepInfoRecord(self, i) for i in range(capacity, capacity * 2)]
+        record = self._records[self._num_used]
+        self._num_used += 1
+        record.clear()
+        return record
+
+
+class StepInfoRecord(MutableMapping):
+    """
+    A dict-like view of one row in StepInfoRecords. Keys not in the dtype of records are kept in a small dict
+    """
+    __slots__ = ("_records", "_index", "_extra")
+
+    def __init__(self, records, index):
+        self._records = records
+        self._index = index
+        self._extra = {}
+
+    def __getitem__(self, key):
+        if key in self._records.dtype.fields:
+            return self._records.data[key][self._index].item()
+        return self._extra[key]
+
+    def __setitem__(self, key, value):
+        if key in self._records.dtype.fields:
+            self._records.data[key][self._index] = value
+        else:
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key in self._records.dtype.fields:
+            raise KeyError("Field {} of the step info record can not be deleted".format(key))
+        del self._extra[key]
+
+    def __iter__(self):
+        yield from self._records.dtype.names
+        yield from self._extra
+
+    def __len__(self):
+        return len(self._records.dtype.names) + len(self._extra)
+
+    def clear(self):
+        self._records.data[self._index] = 0
+        self._extra.clear()
+
+    def __repr__(self):
+        return "StepInfoRecord({})".format(dict(self))
@@ -1,5 +1,6 @@
 import copy
 import datetime
+import importlib
 import logging
 import os
 import sys
@@ -17,6 +18,25 @@ def import_pygame():
     return pygame
 
 
+class LazyModule:
+    """
+    A module proxy which imports the real module at the first attribute access. It is used for heavy and optional
+    dependencies, so that importing metadrive doesn't pay for them until they are actually used
+    """
+    def __init__(self, name, import_func=None):
+        self._name = name
+        self._import_func = import_func or (lambda: importlib.import_module(name))
+        self._module = None
+
+    def __getattr__(self, item):
+        if self._module is None:
+            self._module = self._import_func()
+        return getattr(self._module, item)
+
+    def __repr__(self):
+        return "<LazyModule {}, loaded: {}>".format(self._name, self._module is not None)
+
+
 def get_time_str():
     return datetime.datetime.now().strftime("%y%m%d-%H%M%S")
 
@@ -175,16 +195,22 @@ def deprecation_warning(old, new, error=False) -> None:
         logger.warning("DeprecationWarning: " + msg + " This will raise an error in the future!")
 
 
-def get_object_from_node(node: BulletBodyNode):
+def get_object_from_node(node: BulletBodyNode, shape_index=None):
     """
     Use this api to get the python object from bullet RayCast/SweepTest/CollisionCallback result
+    :param node: the bullet node
+    :param shape_index: index of the hit shape, required when the node merges shapes of several objects
     """
     if node.getPythonTag(node.getName()) is None:
         return None
     from metadrive.engine.engine_utils import get_object
     from metadrive.engine.engine_utils import get_engine
-    ret = node.getPythonTag(node.getName()).base_object_name
-    is_road = node.getPythonTag(node.getName()).type_name == MetaDriveType.LANE_SURFACE_STREET
+    from metadrive.engine.physics_node import BaseRigidBodyNode
+    tag = node.getPythonTag(node.getName())
+    ret = tag.get_object_name(shape_index) if isinstance(tag, BaseRigidBodyNode) else tag.base_object_name
+    if ret is None:
+        return None
+    is_road = tag.type_name == MetaDriveType.LANE_SURFACE_STREET
     if is_road:
         return get_engine().current_map.road_network.get_lane(ret)
     else:
@@ -1,4 +1,5 @@
 #!/usr/bin/env bash
-for i in 0 1 2 3 4 5 6 7 8 9; do
-    nohup python /home/qyli/metadrive/metadrive/utils/waymo/script/convert_waymo_to_metadrive.py ./scenario_${i} > ${i}.log 2>&1 &
-done
+# Usage: bash batch_convert.sh /path/to/tfrecord_folder [num_workers]
+# Converted scenarios are saved in processed_data next to the tfrecord folder. Run it again to resume the conversion.
+SCRIPT_DIR=$(dirname "$(realpath "$0")")
+nohup python "${SCRIPT_DIR}"/convert_waymo_to_metadrive.py --input "$1" --num_workers "${2:-10}" > convert.log 2>&1 &
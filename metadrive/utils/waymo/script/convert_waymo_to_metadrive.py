@@ -35,6 +35,7 @@ except ImportError:
         )
 
 from metadrive.scenario import ScenarioDescription as SD
+from metadrive.scenario.convert import convert_dataset
 from metadrive.type import MetaDriveType
 from metadrive.utils.waymo.utils import extract_tracks, extract_dynamic_map_states, extract_map_features, \
     compute_width
@@ -128,105 +129,108 @@ def _get_number_summary(scenario):
     return number_summary_dict
 
 
-def parse_data(file_list, input_path, output_path, worker_index=None):
+def convert_waymo_file(file, input_path):
+    """
+    Yield (export_file_name, scenario) pairs converted from a tfrecord file in input_path
+    """
+    file_path = os.path.join(input_path, file)
+    if ("tfrecord" not in file_path) or (not os.path.isfile(file_path)):
+        return
     scenario = scenario_pb2.Scenario()
+    dataset = tf.data.TFRecordDataset(file_path, compression_type="")
+    for data in dataset.as_numpy_iterator():
+        scenario.ParseFromString(data)
 
-    metadata_recorder = {}
+        md_scenario = SD()
 
-    total_scenarios = 0
-
-    desc = ""
-    summary_file = ScenarioDescription.DATASET.SUMMARY_FILE
-    if worker_index is not None:
-        desc += "Worker {} ".format(worker_index)
-        summary_file = "dataset_summary_worker{}.pkl".format(worker_index)
+        md_scenario[SD.ID] = scenario.scenario_id
 
-    for file_count, file in enumerate(file_list):
-        file_path = os.path.join(input_path, file)
-        if ("tfrecord" not in file_path) or (not os.path.isfile(file_path)):
-            continue
-        dataset = tf.data.TFRecordDataset(file_path, compression_type="")
+        md_scenario[SD.VERSION] = DATA_VERSION
 
-        total = sum(1 for _ in dataset.as_numpy_iterator())
+        # Please note that SDC track index is not identical to sdc_id.
+        # sdc_id is a unique indicator to a track, while sdc_track_index is only the index of the sdc track
+        # in the tracks datastructure.
 
-        for j, data in enumerate(dataset.as_numpy_iterator()):
-            scenario.ParseFromString(data)
+        track_length = len(list(scenario.timestamps_seconds))
 
-            md_scenario = SD()
+        tracks, sdc_id = extract_tracks(scenario.tracks, scenario.sdc_track_index, track_length)
 
-            md_scenario[SD.ID] = scenario.scenario_id
+        md_scenario[SD.LENGTH] = track_length
 
-            md_scenario[SD.VERSION] = DATA_VERSION
+        md_scenario[SD.TRACKS] = tracks
 
-            # Please note that SDC track index is not identical to sdc_id.
-            # sdc_id is a unique indicator to a track, while sdc_track_index is only the index of the sdc track
-            # in the tracks datastructure.
+        dynamic_states = extract_dynamic_map_states(scenario.dynamic_map_states, track_length)
 
-            track_length = len(list(scenario.timestamps_seconds))
+        md_scenario[SD.DYNAMIC_MAP_STATES] = dynamic_states
 
-            tracks, sdc_id = extract_tracks(scenario.tracks, scenario.sdc_track_index, track_length)
+        map_features = extract_map_features(scenario.map_features)
+        md_scenario[SD.MAP_FEATURES] = map_features
 
-            md_scenario[SD.LENGTH] = track_length
+        compute_width(md_scenario[SD.MAP_FEATURES])
 
-            md_scenario[SD.TRACKS] = tracks
+        md_scenario[SD.METADATA] = {}
+        md_scenario[SD.METADATA][SD.COORDINATE] = MetaDriveType.COORDINATE_WAYMO
+        md_scenario[SD.METADATA][SD.TIMESTEP] = np.asarray(list(scenario.timestamps_seconds), dtype=np.float32)
+        md_scenario[SD.METADATA][SD.METADRIVE_PROCESSED] = False
+        md_scenario[SD.METADATA][SD.SDC_ID] = str(sdc_id)
+        md_scenario[SD.METADATA]["dataset"] = "waymo"
+        md_scenario[SD.METADATA]["scenario_id"] = scenario.scenario_id
+        md_scenario[SD.METADATA]["source_file"] = str(file)
+        md_scenario[SD.METADATA]["track_length"] = track_length
 
-            dynamic_states = extract_dynamic_map_states(scenario.dynamic_map_states, track_length)
+        # === Waymo specific data. Storing them here ===
+        md_scenario[SD.METADATA]["current_time_index"] = scenario.current_time_index
+        md_scenario[SD.METADATA]["sdc_track_index"] = scenario.sdc_track_index
 
-            md_scenario[SD.DYNAMIC_MAP_STATES] = dynamic_states
+        # obj id
+        md_scenario[SD.METADATA]["objects_of_interest"] = [str(obj) for obj in scenario.objects_of_interest]
 
-            map_features = extract_map_features(scenario.map_features)
-            md_scenario[SD.MAP_FEATURES] = map_features
+        track_index = [obj.track_index for obj in scenario.tracks_to_predict]
+        track_id = [str(scenario.tracks[ind].id) for ind in track_index]
+        track_difficulty = [obj.difficulty for obj in scenario.tracks_to_predict]
+        track_obj_type = [tracks[id]["type"] for id in track_id]
+        md_scenario[SD.METADATA]["tracks_to_predict"] = {
+            id: {
+                "track_index": track_index[count],
+                "track_id": id,
+                "difficulty": track_difficulty[count],
+                "object_type": track_obj_type[count]
+            }
+            for count, id in enumerate(track_id)
+        }
 
-            compute_width(md_scenario[SD.MAP_FEATURES])
+        export_file_name = SD.get_export_file_name("waymo", "v1.2" + file, scenario.scenario_id)
 
-            md_scenario[SD.METADATA] = {}
-            md_scenario[SD.METADATA][SD.COORDINATE] = MetaDriveType.COORDINATE_WAYMO
-            md_scenario[SD.METADATA][SD.TIMESTEP] = np.asarray(list(scenario.timestamps_seconds), dtype=np.float32)
-            md_scenario[SD.METADATA][SD.METADRIVE_PROCESSED] = False
-            md_scenario[SD.METADATA][SD.SDC_ID] = str(sdc_id)
-            md_scenario[SD.METADATA]["dataset"] = "waymo"
-            md_scenario[SD.METADATA]["scenario_id"] = scenario.scenario_id
-            md_scenario[SD.METADATA]["source_file"] = str(file)
-            md_scenario[SD.METADATA]["track_length"] = track_length
+        summary_dict = {}
+        summary_dict["sdc"] = _get_agent_summary(
+            state_dict=md_scenario.get_sdc_track()["state"], id=sdc_id, type=md_scenario.get_sdc_track()["type"]
+        )
+        for track_id, track in md_scenario[SD.TRACKS].items():
+            summary_dict[track_id] = _get_agent_summary(state_dict=track["state"], id=track_id, type=track["type"])
+        md_scenario[SD.METADATA]["object_summary"] = summary_dict
 
-            # === Waymo specific data. Storing them here ===
-            md_scenario[SD.METADATA]["current_time_index"] = scenario.current_time_index
-            md_scenario[SD.METADATA]["sdc_track_index"] = scenario.sdc_track_index
+        # Count some objects occurrence
+        md_scenario[SD.METADATA]["number_summary"] = _get_number_summary(md_scenario)
 
-            # obj id
-            md_scenario[SD.METADATA]["objects_of_interest"] = [str(obj) for obj in scenario.objects_of_interest]
+        yield export_file_name, md_scenario.to_dict()
 
-            track_index = [obj.track_index for obj in scenario.tracks_to_predict]
-            track_id = [str(scenario.tracks[ind].id) for ind in track_index]
-            track_difficulty = [obj.difficulty for obj in scenario.tracks_to_predict]
-            track_obj_type = [tracks[id]["type"] for id in track_id]
-            md_scenario[SD.METADATA]["tracks_to_predict"] = {
-                id: {
-                    "track_index": track_index[count],
-                    "track_id": id,
-                    "difficulty": track_difficulty[count],
-                    "object_type": track_obj_type[count]
-                }
-                for count, id in enumerate(track_id)
-            }
 
-            export_file_name = SD.get_export_file_name("waymo", "v1.2" + file, scenario.scenario_id)
+def parse_data(file_list, input_path, output_path, worker_index=None):
+    metadata_recorder = {}
 
-            summary_dict = {}
-            summary_dict["sdc"] = _get_agent_summary(
-                state_dict=md_scenario.get_sdc_track()["state"], id=sdc_id, type=md_scenario.get_sdc_track()["type"]
-            )
-            for track_id, track in md_scenario[SD.TRACKS].items():
-                summary_dict[track_id] = _get_agent_summary(state_dict=track["state"], id=track_id, type=track["type"])
-            md_scenario[SD.METADATA]["object_summary"] = summary_dict
+    total_scenarios = 0
 
-            # Count some objects occurrence
-            md_scenario[SD.METADATA]["number_summary"] = _get_number_summary(md_scenario)
+    desc = ""
+    summary_file = ScenarioDescription.DATASET.SUMMARY_FILE
+    if worker_index is not None:
+        desc += "Worker {} ".format(worker_index)
+        summary_file = ScenarioDescription.DATASET.WORKER_SUMMARY_FILE.format(worker_index)
 
+    for file_count, file in enumerate(file_list):
+        p = None
+        for export_file_name, md_scenario in convert_waymo_file(file, input_path):
             metadata_recorder[export_file_name] = copy.deepcopy(md_scenario[SD.METADATA])
 
-            md_scenario = md_scenario.to_dict()
-
             SD.sanity_check(md_scenario, check_self_type=True)
 
             p = os.path.join(output_path, export_file_name)
@@ -234,11 +238,11 @@ def parse_data(file_list, input_path, output_path, worker_index=None):
                 pickle.dump(md_scenario, f)
 
             total_scenarios += 1
-            if j == total - 1:
-                print(
-                    f"{desc}Collected {total_scenarios} scenarios. File {file_count + 1}/{len(file_list)} has "
-                    f"{total} Scenarios. The last one is saved at: {p}"
-                )
+        if p is not None:
+            print(
+                f"{desc}Collected {total_scenarios} scenarios. File {file_count + 1}/{len(file_list)} is converted. "
+                f"The last one is saved at: {p}"
+            )
 
     summary_file = os.path.join(output_path, summary_file)
     with open(summary_file, "wb") as file:
@@ -252,20 +256,31 @@ if __name__ == "__main__":
     parser.add_argument(
         "--output", default="processed_data", type=str, help="The data folder storing raw tfrecord from Waymo dataset."
     )
+    parser.add_argument("--num_workers", default=8, type=int, help="Number of processes converting tfrecord files.")
+    parser.add_argument(
+        "--overwrite", action="store_true", help="Convert all files again instead of resuming the last conversion."
+    )
     args = parser.parse_args()
 
     scenario_data_path = args.input
 
     output_path: str = os.path.dirname(scenario_data_path)
     output_path = os.path.join(output_path, args.output)
-    os.makedirs(output_path, exist_ok=True)
 
     raw_data_path = scenario_data_path
 
     # parse raw data from input path to output path,
     # there is 1000 raw data in google cloud, each of them produce about 500 pkl file
-    file_list = os.listdir(raw_data_path)
-    parse_data(file_list, raw_data_path, output_path)
+    file_list = sorted(os.listdir(raw_data_path))
+    convert_dataset(
+        convert_waymo_file,
+        file_list,
+        output_path,
+        num_workers=args.num_workers,
+        convert_kwargs=dict(input_path=raw_data_path),
+        resume=not args.overwrite,
+        force_overwrite=args.overwrite
+    )
     sys.exit()
     # file_path = AssetLoader.file_path("waymo", "processed", "0.pkl", return_raw_style=False)
     # data = read_waymo_data(file_path)
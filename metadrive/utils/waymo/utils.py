@@ -1,6 +1,4 @@
-import matplotlib.pyplot as plt
 from metadrive.scenario.utils import read_scenario_data
-from matplotlib.pyplot import figure
 
 from metadrive.type import MetaDriveType
 from metadrive.utils.math import mph_to_kmh
@@ -319,7 +317,8 @@ def draw_waymo_map(data):
     """
     TODO: Need this function in future.
     """
-    figure(figsize=(8, 6), dpi=500)
+    import matplotlib.pyplot as plt
+    plt.figure(figsize=(8, 6), dpi=500)
     for key, value in data[ScenarioDescription.MAP_FEATURES].items():
         if value.get("type", None) == "center_lane":
             plt.scatter([x[0] for x in value["polyline"]], [y[1] for y in value["polyline"]], s=0.5)